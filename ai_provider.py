@@ -1,23 +1,476 @@
 import requests
-import os
-from typing import Dict, Any
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+import asyncio
+import threading
+import time
+import weakref
+import json
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Deque, Iterator, List, Optional, Tuple
+from settings import settings
+from cache import TieredCache, make_cache_key
+import telemetry
+from ai_scheduler import RateLimiter, SingleFlight, backoff_delay
+from prompt_builder import estimate_tokens
+import json_repair
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
+
+# Process-wide transports so every ResumeParser/JobAnalyzer reuses warm connections
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_response_cache: Optional[TieredCache] = None
+_rate_limiters: Dict[str, RateLimiter] = {}
+# Identical prompts already in flight share one upstream call
+_in_flight = SingleFlight()
+
+# 529 is Anthropic's "overloaded"
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504, 529}
+
+class AIProviderError(Exception):
+    """A failed model call; status_code is None for transport errors."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code in RETRYABLE_STATUSES
+
+def _pool_size() -> int:
+    return settings.get_int("AI_POOL_SIZE", 10)
+
+def _timeouts() -> tuple:
+    """Return the (connect, read) timeouts in seconds for model calls."""
+    return (
+        settings.get_float("AI_CONNECT_TIMEOUT", 5),
+        settings.get_float("AI_READ_TIMEOUT", 60),
+    )
+
+def get_http_session() -> requests.Session:
+    """Return the shared keep-alive session used for synchronous model calls."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = _pool_size()
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def get_async_http_client() -> "httpx.AsyncClient":
+    """Return the pooled async client bound to the running event loop."""
+    # httpx is only needed by the async path, so it is imported on first use
+    import httpx
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool_size = _pool_size()
+        connect_timeout, read_timeout = _timeouts()
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+        _async_clients[loop] = client
+    return client
+
+async def close_async_http_client():
+    """Close the running event loop's pooled async client, if it opened one; the next call opens a new one."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+def get_response_cache() -> TieredCache:
+    """Return the shared model response cache configured from the environment."""
+    global _response_cache
+    if _response_cache is None:
+        with _session_lock:
+            if _response_cache is None:
+                _response_cache = TieredCache(
+                    max_entries=settings.get_int("AI_CACHE_SIZE", 256),
+                    ttl=settings.get_float("AI_CACHE_TTL"),
+                    db_path=settings.get("AI_CACHE_PATH") or None,
+                )
+    return _response_cache
+
+def clean_response_text(text: str) -> str:
+    """Remove the markdown code fence the model sometimes wraps JSON in.
+
+    Only a fence around the whole response is stripped; backticks inside string values are kept.
+    """
+    return json_repair.strip_fences(text)
+
+def get_rate_limiter(quota_prefix: str = "AI") -> RateLimiter:
+    """Return the process-wide limiter for one API's quota ({prefix}_RPM/{prefix}_TPM, 0 = unlimited)."""
+    with _session_lock:
+        if quota_prefix not in _rate_limiters:
+            _rate_limiters[quota_prefix] = RateLimiter(
+                requests_per_minute=settings.get_float(f"{quota_prefix}_RPM", 0),
+                tokens_per_minute=settings.get_float(f"{quota_prefix}_TPM", 0),
+            )
+        return _rate_limiters[quota_prefix]
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse a retry hint like "7", "7s" or "1.5s" into seconds."""
+    try:
+        return max(0.0, float(value.strip().rstrip("s")))
+    except (AttributeError, ValueError):
+        return None
+
+def retry_hint(headers, body: Any) -> Optional[float]:
+    """Return the server's retry delay from a Retry-After header or a google.rpc.RetryInfo detail."""
+    if headers.get("Retry-After"):
+        hint = _parse_duration(headers["Retry-After"])
+        if hint is not None:
+            return hint
+    error = body.get("error") if isinstance(body, dict) else None
+    details = error.get("details") if isinstance(error, dict) else None
+    for detail in details or []:
+        if isinstance(detail, dict) and detail.get("@type", "").endswith("google.rpc.RetryInfo"):
+            return _parse_duration(detail.get("retryDelay", ""))
+    return None
+
+def _record_usage(usage: Dict[str, int], current):
+    """Count normalized token usage ({"prompt", "completion", "total"}) and attach it to the span."""
+    for kind in ("prompt", "completion"):
+        if kind in usage:
+            telemetry.inc("ai_tokens_total", usage[kind], kind=kind)
+            current.set(f"{kind}_tokens", usage[kind])
 
 class AIProvider:
-    def __init__(self):
-        self.api_key = os.getenv("GOOGLE_API_KEY")
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+    """Shared transport for one model API: response cache, client-side quota, retries and streaming.
+
+    Subclasses describe the API itself: the request body, where it is sent, and how text and
+    token usage are read back from responses and stream events.
+    """
+    name = ""
+    label = "model API"
+    # Settings prefix of this API's quota (AI_RPM/AI_TPM for Gemini)
+    quota_prefix = "AI"
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        self.cache = cache if cache is not None else get_response_cache()
+        self.api_url = ""
         self.headers = {
             'Content-Type': 'application/json'
         }
+        self.timeout = _timeouts()
+        self.limiter = get_rate_limiter(self.quota_prefix)
+        self.max_retries = settings.get_int("AI_MAX_RETRIES", 4)
+        self.backoff_base = settings.get_float("AI_BACKOFF_BASE", 0.5)
+        self.backoff_max = settings.get_float("AI_BACKOFF_MAX", 30)
+
+    def _build_payload(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _prompt_text(self, payload: Dict[str, Any]) -> str:
+        """The prompt text in a request body, for size accounting."""
+        raise NotImplementedError
+
+    def _request_url(self) -> str:
+        return self.api_url
+
+    def _stream_request(self, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """URL and body of the streaming variant of a request."""
+        return self.api_url, dict(payload, stream=True)
+
+    def _extract(self, result: Dict[str, Any]) -> str:
+        """The response text of a decoded response body."""
+        raise NotImplementedError
+
+    def _usage(self, result: Dict[str, Any]) -> Dict[str, int]:
+        """Token usage of a response body or stream event as {"prompt", "completion", "total"}."""
+        raise NotImplementedError
+
+    def _stream_event(self, line: str, usage: Dict[str, int]) -> str:
+        """Return the text in one SSE line, updating usage from it."""
+        raise NotImplementedError
+
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        """Key a request by endpoint and full request body."""
+        return make_cache_key(self.api_url, json.dumps(payload, sort_keys=True))
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the response cache."""
+        return self.cache.stats()
+
+    async def aclose(self):
+        """Close the async connection pool of the running event loop; call before the loop ends."""
+        await close_async_http_client()
+
+    def cached_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Optional[str]:
+        """Return the cached response to this prompt without calling the model, or None."""
+        return self.cache.get(self._cache_key(self._build_payload(prompt, system_prompt, max_output_tokens)))
+
+    def _lookup(self, cache_key: str, current) -> Optional[str]:
+        cached = self.cache.get(cache_key)
+        result = "hit" if cached is not None else "miss"
+        telemetry.inc("cache_requests_total", cache="ai_response", result=result)
+        current.set("cache", result)
+        return cached
 
-    def generate_response(self, prompt: str, system_prompt: str = None) -> str:
+    def _finish(self, response, cache_key: str, current) -> Tuple[str, int]:
+        """Check the status, record usage and cache the parsed text; returns it with the tokens used."""
+        status_code, body = response.status_code, response.text
+        telemetry.inc("ai_requests_total", status=status_code, provider=self.name)
+        current.set("status", status_code)
+        current.set("response_bytes", len(body))
+        telemetry.observe("ai_response_bytes", len(body), telemetry.BYTE_BUCKETS)
+        if status_code != 200:
+            print(f"API Error Response: {body}")
+            try:
+                error_body = response.json()
+            except ValueError:
+                error_body = None
+            raise AIProviderError(f"{self.label} error: {body}", status_code, retry_hint(response.headers, error_body))
+
+        result = response.json()
+        usage = self._usage(result)
+        _record_usage(usage, current)
+
+        response_text = self._parse_response(result)
+        self.cache.set(cache_key, response_text)
+        return response_text, usage.get("total") or usage.get("prompt", 0)
+
+    def _record_request(self, payload: Dict[str, Any], current) -> int:
+        """Record the prompt size and return its estimated token count."""
+        text = self._prompt_text(payload)
+        prompt_bytes = len(text.encode("utf-8"))
+        current.set("prompt_bytes", prompt_bytes)
+        telemetry.observe("ai_prompt_bytes", prompt_bytes, telemetry.BYTE_BUCKETS)
+        return estimate_tokens(text)
+
+    def _retry_delay(self, attempt: int, error: AIProviderError) -> Optional[float]:
+        """Return how long to wait before retrying, or None to give up."""
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        delay = backoff_delay(attempt, error.retry_after, self.backoff_base, self.backoff_max)
+        if error.status_code == 429:
+            # The quota is shared, so hold every caller back instead of letting each one hit the wall
+            self.limiter.pause(delay)
+        telemetry.inc("ai_retries_total", status=error.status_code or "transport")
+        print(f"Model call failed ({error.status_code or error}), retrying in {delay:.1f}s")
+        return delay
+
+    def _send(self, payload: Dict[str, Any], cache_key: str, estimate: int, current) -> str:
+        attempt = 0
+        while True:
+            self.limiter.acquire(estimate)
+            try:
+                print(f"Sending request to {self.label}...")
+                response = get_http_session().post(
+                    self._request_url(),
+                    headers=self.headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                response_text, used = self._finish(response, cache_key, current)
+                self.limiter.settle(estimate, used)
+                return response_text
+            except requests.RequestException as e:
+                error = AIProviderError(f"{self.label} request failed: {e}")
+            except AIProviderError as e:
+                error = e
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    async def _asend(self, payload: Dict[str, Any], cache_key: str, estimate: int, current) -> str:
+        import httpx
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(estimate)
+            try:
+                print(f"Sending request to {self.label}...")
+                response = await get_async_http_client().post(
+                    self._request_url(),
+                    headers=self.headers,
+                    json=payload
+                )
+                response_text, used = self._finish(response, cache_key, current)
+                self.limiter.settle(estimate, used)
+                return response_text
+            except httpx.TransportError as e:
+                error = AIProviderError(f"{self.label} request failed: {e}")
+            except AIProviderError as e:
+                error = e
+            delay = self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def generate_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> str:
+        payload = self._build_payload(prompt, system_prompt, max_output_tokens)
+        cache_key = self._cache_key(payload)
+        with telemetry.span("ai.generate") as current:
+            current.set("provider", self.name)
+            cached = self._lookup(cache_key, current)
+            if cached is not None:
+                return cached
+
+            estimate = self._record_request(payload, current)
+            return _in_flight.do(cache_key, lambda: self._send(payload, cache_key, estimate, current))
+
+    async def agenerate_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> str:
+        """Async variant of generate_response that does not block the event loop."""
+        payload = self._build_payload(prompt, system_prompt, max_output_tokens)
+        cache_key = self._cache_key(payload)
+        with telemetry.span("ai.generate") as current:
+            current.set("provider", self.name)
+            cached = self._lookup(cache_key, current)
+            if cached is not None:
+                return cached
+
+            estimate = self._record_request(payload, current)
+            return await _in_flight.ado(cache_key, lambda: self._asend(payload, cache_key, estimate, current))
+
+    def _stream_finished(self, chunks: List[str], usage: Dict[str, int], estimate: int, cache_key: str):
+        _record_usage(usage, telemetry.NOOP_SPAN)
+        self.limiter.settle(estimate, usage.get("total", 0))
+        self.cache.set(cache_key, clean_response_text("".join(chunks)))
+
+    def stream_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Iterator[str]:
+        """Yield the response text in chunks as the model generates it.
+
+        Failures before the first chunk are retried like generate_response; the full text is
+        cached once the stream ends, and a cached response is yielded as a single chunk.
+        """
+        payload = self._build_payload(prompt, system_prompt, max_output_tokens)
+        cache_key = self._cache_key(payload)
+        # Spans are scoped to a with block, which a generator cannot hold open across yields
+        current = telemetry.NOOP_SPAN
+        cached = self._lookup(cache_key, current)
+        if cached is not None:
+            yield cached
+            return
+
+        estimate = self._record_request(payload, current)
+        stream_url, stream_payload = self._stream_request(payload)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            self.limiter.acquire(estimate)
+            chunks: List[str] = []
+            usage: Dict[str, int] = {}
+            try:
+                print(f"Streaming request to {self.label}...")
+                with get_http_session().post(stream_url, headers=self.headers, json=stream_payload,
+                                             timeout=self.timeout, stream=True) as response:
+                    if response.status_code != 200:
+                        self._finish(response, cache_key, current)
+                    telemetry.inc("ai_requests_total", status=200, provider=self.name)
+                    for line in response.iter_lines(decode_unicode=True):
+                        text = self._stream_event(line, usage)
+                        if text:
+                            if not chunks:
+                                telemetry.observe("ai_first_chunk_seconds", time.perf_counter() - start)
+                            chunks.append(text)
+                            yield text
+                break
+            except requests.RequestException as e:
+                error = AIProviderError(f"{self.label} request failed: {e}")
+            except AIProviderError as e:
+                error = e
+            # Once text has been handed to the caller the stream cannot be restarted transparently
+            delay = None if chunks else self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+        self._stream_finished(chunks, usage, estimate, cache_key)
+
+    async def astream_response(self, prompt: str, system_prompt: str = None,
+                               max_output_tokens: int = 2048) -> AsyncIterator[str]:
+        """Async variant of stream_response."""
+        payload = self._build_payload(prompt, system_prompt, max_output_tokens)
+        cache_key = self._cache_key(payload)
+        current = telemetry.NOOP_SPAN
+        cached = self._lookup(cache_key, current)
+        if cached is not None:
+            yield cached
+            return
+
+        import httpx
+        estimate = self._record_request(payload, current)
+        stream_url, stream_payload = self._stream_request(payload)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(estimate)
+            chunks: List[str] = []
+            usage: Dict[str, int] = {}
+            try:
+                print(f"Streaming request to {self.label}...")
+                async with get_async_http_client().stream("POST", stream_url, headers=self.headers,
+                                                          json=stream_payload) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        self._finish(response, cache_key, current)
+                    telemetry.inc("ai_requests_total", status=200, provider=self.name)
+                    async for line in response.aiter_lines():
+                        text = self._stream_event(line, usage)
+                        if text:
+                            if not chunks:
+                                telemetry.observe("ai_first_chunk_seconds", time.perf_counter() - start)
+                            chunks.append(text)
+                            yield text
+                break
+            except httpx.TransportError as e:
+                error = AIProviderError(f"{self.label} request failed: {e}")
+            except AIProviderError as e:
+                error = e
+            delay = None if chunks else self._retry_delay(attempt, error)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+        self._stream_finished(chunks, usage, estimate, cache_key)
+
+    def _parse_response(self, result: Dict[str, Any]) -> str:
+        """Extract and clean the response text."""
+        print(f"Received response from {self.label}")
+        try:
+            response_text = clean_response_text(self._extract(result))
+        except (KeyError, IndexError, TypeError) as e:
+            print("Error parsing response:", str(e))
+            print("Full response:", result)
+            raise Exception(f"Failed to parse {self.label} response: {str(e)}")
+
+        print("Cleaned response text:", response_text[:100] + "..." if len(response_text) > 100 else response_text)
+
+        return response_text
+
+class GeminiProvider(AIProvider):
+    """Google Gemini generateContent / streamGenerateContent."""
+    name = "google"
+    label = "Gemini API"
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        super().__init__(cache)
+        self.api_key = settings.get("GOOGLE_API_KEY")
+        self.api_url = settings.get(
+            "GOOGLE_AI_API_URL",
+            "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        )
+
+    def _build_payload(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Dict[str, Any]:
+        """Build the generateContent request body."""
         # Combine system prompt and user prompt if system prompt exists
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        
-        payload = {
+
+        return {
             "contents": [
                 {
                     "parts": [
@@ -31,67 +484,473 @@ class AIProvider:
                 "temperature": 0.1,
                 "topK": 1,
                 "topP": 1,
-                "maxOutputTokens": 2048,
+                "maxOutputTokens": max_output_tokens,
             }
         }
 
-        print("Sending request to Gemini API...")
-        response = requests.post(
-            f"{self.api_url}?key={self.api_key}",
-            headers=self.headers,
-            json=payload
+    def _prompt_text(self, payload: Dict[str, Any]) -> str:
+        return payload["contents"][0]["parts"][0]["text"]
+
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        """Key a request by model URL, full prompt and generation config."""
+        return make_cache_key(
+            self.api_url,
+            payload["contents"][0]["parts"][0]["text"],
+            json.dumps(payload["generationConfig"], sort_keys=True)
         )
 
-        if response.status_code != 200:
-            print(f"API Error Response: {response.text}")
-            raise Exception(f"Google AI API error: {response.text}")
+    def _request_url(self) -> str:
+        return f"{self.api_url}?key={self.api_key}"
+
+    def _stream_request(self, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """The streamGenerateContent endpoint matching api_url, returning server-sent events."""
+        stream_url = self.api_url.replace(':generateContent', ':streamGenerateContent')
+        return f"{stream_url}?alt=sse&key={self.api_key}", payload
+
+    def _usage(self, result: Dict[str, Any]) -> Dict[str, int]:
+        metadata = result.get("usageMetadata") or {}
+        fields = (("prompt", "promptTokenCount"), ("completion", "candidatesTokenCount"), ("total", "totalTokenCount"))
+        return {kind: metadata[field] for kind, field in fields if field in metadata}
 
+    def _stream_event(self, line: str, usage: Dict[str, int]) -> str:
+        if not line.startswith("data:"):
+            return ""
+        event = json.loads(line[5:])
+        if "error" in event:
+            error = event["error"]
+            raise AIProviderError(f"{self.label} error: {error}", error.get("code"), retry_hint({}, event))
+        usage.update(self._usage(event))
+        candidates = event.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    def _extract(self, result: Dict[str, Any]) -> str:
+        """Text of the first candidate."""
+        # Debug print the response
+        print("Response structure:", result.keys())
+
+        if 'candidates' not in result:
+            print("No candidates in response:", result)
+            raise Exception("No candidates in response")
+
+        if not result['candidates']:
+            print("Empty candidates list:", result)
+            raise Exception("Empty candidates list")
+
+        if 'content' not in result['candidates'][0]:
+            print("No content in candidate:", result['candidates'][0])
+            raise Exception("No content in candidate")
+
+        if 'parts' not in result['candidates'][0]['content']:
+            print("No parts in content:", result['candidates'][0]['content'])
+            raise Exception("No parts in content")
+
+        if not result['candidates'][0]['content']['parts']:
+            print("Empty parts list:", result['candidates'][0]['content'])
+            raise Exception("Empty parts list")
+
+        if 'text' not in result['candidates'][0]['content']['parts'][0]:
+            print("No text in part:", result['candidates'][0]['content']['parts'][0])
+            raise Exception("No text in part")
+
+        return result['candidates'][0]['content']['parts'][0]['text']
+
+class OpenAIProvider(AIProvider):
+    """OpenAI chat completions, or any server exposing the same API at OPENAI_BASE_URL."""
+    name = "openai"
+    label = "OpenAI API"
+    quota_prefix = "OPENAI"
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        super().__init__(cache)
+        base_url = settings.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+        self.api_url = f"{base_url.rstrip('/')}/chat/completions"
+        self.model = settings.get("OPENAI_MODEL") or "gpt-4o-mini"
+        if settings.get("OPENAI_API_KEY"):
+            self.headers["Authorization"] = f"Bearer {settings.get('OPENAI_API_KEY')}"
+
+    def _build_payload(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Dict[str, Any]:
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        return {"model": self.model, "messages": messages, "temperature": 0.1, "max_tokens": max_output_tokens}
+
+    def _prompt_text(self, payload: Dict[str, Any]) -> str:
+        return "\n\n".join(message["content"] for message in payload["messages"])
+
+    def _stream_request(self, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        return self.api_url, dict(payload, stream=True, stream_options={"include_usage": True})
+
+    def _usage(self, result: Dict[str, Any]) -> Dict[str, int]:
+        usage = result.get("usage") or {}
+        fields = (("prompt", "prompt_tokens"), ("completion", "completion_tokens"), ("total", "total_tokens"))
+        return {kind: usage[field] for kind, field in fields if field in usage}
+
+    def _stream_event(self, line: str, usage: Dict[str, int]) -> str:
+        if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+            return ""
+        event = json.loads(line[5:])
+        if "error" in event:
+            raise AIProviderError(f"{self.label} error: {event['error']}")
+        usage.update(self._usage(event))
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    def _extract(self, result: Dict[str, Any]) -> str:
+        return result["choices"][0]["message"]["content"]
+
+class AnthropicProvider(AIProvider):
+    """Anthropic Messages API at ANTHROPIC_BASE_URL."""
+    name = "anthropic"
+    label = "Anthropic API"
+    quota_prefix = "ANTHROPIC"
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        super().__init__(cache)
+        base_url = settings.get("ANTHROPIC_BASE_URL") or "https://api.anthropic.com/v1"
+        self.api_url = f"{base_url.rstrip('/')}/messages"
+        self.model = settings.get("ANTHROPIC_MODEL") or "claude-3-5-haiku-latest"
+        self.headers["anthropic-version"] = "2023-06-01"
+        if settings.get("ANTHROPIC_API_KEY"):
+            self.headers["x-api-key"] = settings.get("ANTHROPIC_API_KEY")
+
+    def _build_payload(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Dict[str, Any]:
+        payload = {
+            "model": self.model,
+            "max_tokens": max_output_tokens,
+            "temperature": 0.1,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        return payload
+
+    def _prompt_text(self, payload: Dict[str, Any]) -> str:
+        return "\n\n".join(filter(None, [payload.get("system"), payload["messages"][0]["content"]]))
+
+    def _usage(self, result: Dict[str, Any]) -> Dict[str, int]:
+        usage = result.get("usage") or {}
+        counts = {kind: usage[field] for kind, field in (("prompt", "input_tokens"), ("completion", "output_tokens"))
+                  if field in usage}
+        if counts:
+            counts["total"] = sum(counts.values())
+        return counts
+
+    def _stream_event(self, line: str, usage: Dict[str, int]) -> str:
+        if not line.startswith("data:"):
+            return ""
+        event = json.loads(line[5:])
+        kind = event.get("type")
+        if kind == "error":
+            error = event.get("error") or {}
+            status = 529 if error.get("type") == "overloaded_error" else None
+            raise AIProviderError(f"{self.label} error: {error}", status)
+        if kind == "message_start":
+            usage.update(self._usage(event.get("message") or {}))
+        elif kind == "message_delta" and "output_tokens" in (event.get("usage") or {}):
+            usage["completion"] = event["usage"]["output_tokens"]
+            usage["total"] = usage.get("prompt", 0) + usage["completion"]
+        elif kind == "content_block_delta":
+            return (event.get("delta") or {}).get("text", "")
+        return ""
+
+    def _extract(self, result: Dict[str, Any]) -> str:
+        return "".join(block["text"] for block in result["content"] if block.get("type") == "text")
+
+PROVIDERS = {"google": GeminiProvider, "gemini": GeminiProvider, "openai": OpenAIProvider, "anthropic": AnthropicProvider}
+
+class BackendStats:
+    """Rolling outcomes of one backend's calls; only calls finished in the last `window` seconds count."""
+
+    def __init__(self, window: float, max_samples: int = 256):
+        self.window = window
+        # (finished at, seconds taken, or None for a failed call)
+        self._samples: Deque[Tuple[float, Optional[float]]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: Optional[float]):
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def snapshot(self) -> Dict[str, Any]:
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            recent = [seconds for finished, seconds in self._samples if finished >= cutoff]
+        latencies = sorted(seconds for seconds in recent if seconds is not None)
+        return {
+            "samples": len(recent),
+            "error_rate": (len(recent) - len(latencies)) / len(recent) if recent else 0.0,
+            "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else None,
+        }
+
+class ProviderRouter:
+    """Routes each call to the fastest healthy backend, failing over to the next on errors.
+
+    Backends are ranked by p95 latency over a rolling window, so a backend with a slow tail loses
+    to a steadier one with a similar median; one whose error rate exceeds
+    max_error_rate (over at least min_samples calls) is only tried after the healthy ones, until
+    its failures age out of the window. With hedge_after set, a call still unanswered after that
+    many seconds is duplicated to the next backend and whichever answers first wins. The async
+    variant cancels the losing call and records the time it had taken so far, so a slow backend
+    still drops in the ranking; a losing sync call cannot be interrupted and runs to completion.
+    """
+
+    def __init__(self, backends: List[AIProvider], hedge_after: Optional[float] = None, window: float = 60,
+                 max_error_rate: float = 0.5, min_samples: int = 5):
+        if not backends:
+            raise ValueError("ProviderRouter needs at least one backend")
+        self.backends = backends
+        self.hedge_after = hedge_after
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._stats = {backend: BackendStats(window) for backend in backends}
+        self._pool = ThreadPoolExecutor(max_workers=_pool_size() * 2, thread_name_prefix="ai-router")
+        # Cache keys derived from the provider (parsed resumes, tailored bullets) cover every backend
+        self.api_url = "|".join(backend.api_url for backend in backends)
+
+    def backend_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {backend.name: self._stats[backend].snapshot() for backend in self.backends}
+
+    def ranked(self) -> List[AIProvider]:
+        """Backends in the order to try: healthy ones fastest first (untried ones first of all), then the rest."""
+        healthy, unhealthy = [], []
+        for position, backend in enumerate(self.backends):
+            snapshot = self._stats[backend].snapshot()
+            if snapshot["samples"] >= self.min_samples and snapshot["error_rate"] > self.max_error_rate:
+                unhealthy.append((snapshot["error_rate"], position, backend))
+            elif snapshot["latency_p95"] is not None:
+                healthy.append((snapshot["latency_p95"], position, backend))
+            else:
+                healthy.append((0.0 if not snapshot["samples"] else float("inf"), position, backend))
+        return [backend for *_, backend in sorted(healthy)] + [backend for *_, backend in sorted(unhealthy)]
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.backends[0].cache_stats()
+
+    async def aclose(self):
+        # Backends share the per-loop client
+        await close_async_http_client()
+
+    def _cached(self, prompt: str, system_prompt: str, max_output_tokens: int) -> Optional[str]:
+        for backend in self.backends:
+            cached = backend.cached_response(prompt, system_prompt, max_output_tokens)
+            if cached is not None:
+                return cached
+        return None
+
+    def _record(self, backend: AIProvider, seconds: Optional[float]):
+        self._stats[backend].record(seconds)
+        telemetry.inc("ai_router_requests_total", backend=backend.name, outcome="error" if seconds is None else "ok")
+
+    def _timed(self, backend: AIProvider, *args) -> str:
+        start = time.perf_counter()
         try:
-            result = response.json()
-            print("Received response from Gemini API")
-            
-            # Debug print the response
-            print("Response structure:", result.keys())
-            
-            if 'candidates' not in result:
-                print("No candidates in response:", result)
-                raise Exception("No candidates in response")
-                
-            if not result['candidates']:
-                print("Empty candidates list:", result)
-                raise Exception("Empty candidates list")
-                
-            if 'content' not in result['candidates'][0]:
-                print("No content in candidate:", result['candidates'][0])
-                raise Exception("No content in candidate")
-                
-            if 'parts' not in result['candidates'][0]['content']:
-                print("No parts in content:", result['candidates'][0]['content'])
-                raise Exception("No parts in content")
-                
-            if not result['candidates'][0]['content']['parts']:
-                print("Empty parts list:", result['candidates'][0]['content'])
-                raise Exception("Empty parts list")
-                
-            if 'text' not in result['candidates'][0]['content']['parts'][0]:
-                print("No text in part:", result['candidates'][0]['content']['parts'][0])
-                raise Exception("No text in part")
-            
-            response_text = result['candidates'][0]['content']['parts'][0]['text']
-            
-            # Clean up the response text
-            # Remove markdown code block markers if present
-            response_text = response_text.replace('```json', '').replace('```', '').strip()
-            
-            print("Cleaned response text:", response_text[:100] + "..." if len(response_text) > 100 else response_text)
-            
-            return response_text
-            
-        except (KeyError, IndexError) as e:
-            print("Error parsing response:", str(e))
-            print("Full response:", result)
-            raise Exception(f"Failed to parse Google AI response: {str(e)}")
+            result = backend.generate_response(*args)
+        except Exception:
+            self._record(backend, None)
+            raise
+        self._record(backend, time.perf_counter() - start)
+        return result
+
+    async def _atimed(self, backend: AIProvider, *args) -> str:
+        start = time.perf_counter()
+        try:
+            result = await backend.agenerate_response(*args)
+        except asyncio.CancelledError:
+            # A hedged loser: it took at least this long
+            self._record(backend, time.perf_counter() - start)
+            raise
+        except Exception:
+            self._record(backend, None)
+            raise
+        self._record(backend, time.perf_counter() - start)
+        return result
+
+    def _hedge_timeout(self, remaining: List[AIProvider], running: int) -> Optional[float]:
+        # At most two calls race; failures start the next backend straight away instead
+        return self.hedge_after if self.hedge_after is not None and remaining and running < 2 else None
+
+    def _failed(self, backend: AIProvider, error: Exception, remaining: List[AIProvider]):
+        if remaining:
+            print(f"{backend.label} failed ({error}), trying {remaining[0].label}")
+
+    def generate_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> str:
+        args = (prompt, system_prompt, max_output_tokens)
+        cached = self._cached(*args)
+        if cached is not None:
+            return cached
+        remaining = self.ranked()
+        error: Optional[Exception] = None
+        if self.hedge_after is None:
+            while remaining:
+                backend = remaining.pop(0)
+                try:
+                    return self._timed(backend, *args)
+                except Exception as e:
+                    error = e
+                    self._failed(backend, e, remaining)
+            raise error
+
+        primary = remaining[0]
+        running = {}
+
+        def launch():
+            backend = remaining.pop(0)
+            running[self._pool.submit(contextvars.copy_context().run, self._timed, backend, *args)] = backend
+
+        launch()
+        while running:
+            done, _ = wait(running, timeout=self._hedge_timeout(remaining, len(running)), return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"{primary.label} slower than {self.hedge_after}s, hedging with {remaining[0].label}")
+                launch()
+                continue
+            for future in done:
+                backend = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    self._failed(backend, e, remaining)
+                    continue
+                if running:
+                    telemetry.inc("ai_hedges_total", winner="primary" if backend is primary else "hedge")
+                return result
+            if remaining and not running:
+                launch()
+        raise error
+
+    async def agenerate_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> str:
+        """Async variant of generate_response."""
+        args = (prompt, system_prompt, max_output_tokens)
+        cached = self._cached(*args)
+        if cached is not None:
+            return cached
+        remaining = self.ranked()
+        primary = remaining[0]
+        running = {}
+        error: Optional[Exception] = None
+
+        def launch():
+            backend = remaining.pop(0)
+            running[asyncio.ensure_future(self._atimed(backend, *args))] = backend
+
+        launch()
+        while running:
+            done, _ = await asyncio.wait(running, timeout=self._hedge_timeout(remaining, len(running)),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"{primary.label} slower than {self.hedge_after}s, hedging with {remaining[0].label}")
+                launch()
+                continue
+            for task in done:
+                backend = running.pop(task)
+                if task.exception() is not None:
+                    error = task.exception()
+                    self._failed(backend, error, remaining)
+                    continue
+                if running:
+                    telemetry.inc("ai_hedges_total", winner="primary" if backend is primary else "hedge")
+                    for loser in running:
+                        loser.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                return task.result()
+            if remaining and not running:
+                launch()
+        raise error
+
+    def stream_response(self, prompt: str, system_prompt: str = None, max_output_tokens: int = 2048) -> Iterator[str]:
+        """Stream from the best backend; failures before the first chunk fail over, later ones propagate."""
+        args = (prompt, system_prompt, max_output_tokens)
+        cached = self._cached(*args)
+        if cached is not None:
+            yield cached
+            return
+        remaining = self.ranked()
+        error: Optional[Exception] = None
+        while remaining:
+            backend = remaining.pop(0)
+            start, started = time.perf_counter(), False
+            try:
+                for chunk in backend.stream_response(*args):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(backend, None)
+                if started:
+                    raise
+                error = e
+                self._failed(backend, e, remaining)
+                continue
+            self._record(backend, time.perf_counter() - start)
+            return
+        raise error
+
+    async def astream_response(self, prompt: str, system_prompt: str = None,
+                               max_output_tokens: int = 2048) -> AsyncIterator[str]:
+        """Async variant of stream_response."""
+        args = (prompt, system_prompt, max_output_tokens)
+        cached = self._cached(*args)
+        if cached is not None:
+            yield cached
+            return
+        remaining = self.ranked()
+        error: Optional[Exception] = None
+        while remaining:
+            backend = remaining.pop(0)
+            start, started = time.perf_counter(), False
+            try:
+                async for chunk in backend.astream_response(*args):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(backend, None)
+                if started:
+                    raise
+                error = e
+                self._failed(backend, e, remaining)
+                continue
+            self._record(backend, time.perf_counter() - start)
+            return
+        raise error
+
+_providers: Dict[str, Any] = {}
+_providers_lock = threading.Lock()
+
+def _router_backends() -> List[str]:
+    configured = settings.get("AI_ROUTER_BACKENDS")
+    if configured:
+        return [name.strip() for name in configured.split(",") if name.strip()]
+    keys = {"google": "GOOGLE_API_KEY", "openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+    return [name for name, key in keys.items() if settings.get(key)] or ["google"]
+
+def _router_backend(provider_name: str) -> AIProvider:
+    # The router owns failover, so a failing backend gives up after AI_ROUTER_MAX_RETRIES instead of
+    # holding the call through its full backoff, and a call that needed retries counts as an error
+    backend = _create_provider(provider_name)
+    backend.max_retries = settings.get_int("AI_ROUTER_MAX_RETRIES", 0)
+    return backend
+
+def _create_provider(provider_name: str):
+    if provider_name == "router":
+        return ProviderRouter(
+            [_router_backend(name) for name in _router_backends()],
+            hedge_after=settings.get_float("AI_HEDGE_AFTER"),
+            window=settings.get_float("AI_ROUTER_WINDOW", 60),
+            max_error_rate=settings.get_float("AI_ROUTER_MAX_ERROR_RATE", 0.5),
+            min_samples=settings.get_int("AI_ROUTER_MIN_SAMPLES", 5),
+        )
+    if provider_name not in PROVIDERS:
+        raise ValueError(f"Unsupported AI provider: {provider_name}. Use one of: {', '.join(PROVIDERS)}, router")
+    return PROVIDERS[provider_name]()
+
+def get_ai_provider(provider_name: Optional[str] = None):
+    """Return the process-wide provider for provider_name (default AI_PROVIDER), creating it on first use.
 
-def get_ai_provider(provider_name: str = "google") -> AIProvider:
-    """Factory function to get the AI provider."""
-    return AIProvider() 
\ No newline at end of file
+    "router" returns a ProviderRouter over AI_ROUTER_BACKENDS.
+    """
+    provider_name = (provider_name or settings.get("AI_PROVIDER") or "google").lower()
+    with _providers_lock:
+        if provider_name not in _providers:
+            _providers[provider_name] = _create_provider(provider_name)
+        return _providers[provider_name]
@@ -0,0 +1,232 @@
+"""Client-side scheduling for model calls: quota limiting, priority lanes, retry backoff and coalescing.
+
+A RateLimiter admits calls against requests-per-minute and tokens-per-minute buckets in priority
+order, so interactive /apply traffic goes ahead of batch screening when the quota is tight.
+SingleFlight lets concurrent callers with an identical prompt share one upstream call.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import telemetry
+
+INTERACTIVE = 0
+BATCH = 1
+LANE_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+# How often an async waiter that is not at the head of the queue re-checks its turn
+_ASYNC_POLL_SECONDS = 0.01
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("ai_priority", default=INTERACTIVE)
+
+@contextmanager
+def priority(lane: int) -> Iterator[None]:
+    """Run model calls made inside the block (and stages it starts) in the given lane."""
+    token = _priority.set(lane)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> int:
+    return _priority.get()
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's retry hint."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        # Spread callers that got the same hint so they do not return in lockstep
+        delay = retry_after + random.uniform(0, min(base, retry_after * 0.1 + 0.05))
+    return delay
+
+class TokenBucket:
+    """Refills continuously at per_minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single call larger than the bucket waits for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def refund(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+class RateLimiter:
+    """Admits model calls within RPM/TPM quotas, highest-priority lane first, FIFO within a lane.
+
+    A limit of 0 disables that bucket; with both disabled acquire() returns immediately.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.enabled = self.requests is not None or self.tokens is not None
+        self._condition = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+
+    def _enqueue(self) -> Tuple[int, int]:
+        ticket = (current_priority(), next(self._sequence))
+        heapq.heappush(self._waiting, ticket)
+        self._condition.notify_all()
+        return ticket
+
+    def _withdraw(self, ticket: Tuple[int, int]):
+        if ticket in self._waiting:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._condition.notify_all()
+
+    def _admit(self, ticket: Tuple[int, int], tokens: int) -> Optional[float]:
+        """Admit ticket if it is next and the quota allows; returns 0, the wait in seconds, or None if not next."""
+        if self._waiting[0] != ticket:
+            return None
+        now = time.monotonic()
+        delay = self._paused_until - now
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(tokens, now))
+        if delay > 0:
+            return delay
+        heapq.heappop(self._waiting)
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+        self._condition.notify_all()
+        return 0.0
+
+    def _observe(self, ticket: Tuple[int, int], start: float):
+        telemetry.observe("ai_rate_limit_wait_seconds", time.perf_counter() - start,
+                          lane=LANE_NAMES.get(ticket[0], str(ticket[0])))
+
+    def acquire(self, tokens: int):
+        """Block until a call estimated at tokens may be sent."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        with self._condition:
+            ticket = self._enqueue()
+            try:
+                while True:
+                    delay = self._admit(ticket, tokens)
+                    if delay == 0:
+                        break
+                    self._condition.wait(delay)
+            except BaseException:
+                self._withdraw(ticket)
+                raise
+        self._observe(ticket, start)
+
+    async def aacquire(self, tokens: int):
+        """Async variant of acquire that sleeps on the event loop instead of blocking it."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        with self._condition:
+            ticket = self._enqueue()
+        try:
+            while True:
+                with self._condition:
+                    delay = self._admit(ticket, tokens)
+                if delay == 0:
+                    break
+                await asyncio.sleep(_ASYNC_POLL_SECONDS if delay is None else delay)
+        except BaseException:
+            with self._condition:
+                self._withdraw(ticket)
+            raise
+        self._observe(ticket, start)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the API reports what a call really used."""
+        if self.tokens is None or not actual:
+            return
+        with self._condition:
+            self.tokens.refund(estimated - actual)
+
+    def pause(self, seconds: float):
+        """Hold every lane back, e.g. after a 429 told us the upstream quota is exhausted."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = \
+            weakref.WeakKeyDictionary()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            telemetry.inc("ai_coalesced_total")
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        calls = self._async_calls.setdefault(loop, {})
+        future = calls.get(key)
+        if future is not None:
+            telemetry.inc("ai_coalesced_total")
+            # Shielded so a cancelled follower does not cancel the leader's call
+            return await asyncio.shield(future)
+
+        future = calls[key] = loop.create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case no follower was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            calls.pop(key, None)
@@ -0,0 +1,159 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from resume_parser import ResumeSource, get_resume_parser
+from job_analyzer import apply_tailored_bullets, get_job_analyzer
+from browser_pool import get_browser_pool
+from stage_graph import StageGraph, check_cancelled
+import json_repair
+import models
+import telemetry
+from settings import settings
+
+# Stage names in the order they are reported; which ones run depends on the pipeline mode
+STAGES = (
+    "parse_resume",
+    "tailor_bullets",
+    "analyze_job",
+    "generate_responses",
+    "submit",
+)
+
+FUSED_STAGES = (
+    "parse_resume",
+    "analyze_application",
+    "submit",
+)
+
+# Keys of the state dict that are bookkeeping rather than stage inputs or outputs
+_BOOKKEEPING = ("timings", "stage_names")
+
+StageCallback = Callable[[str, Dict[str, Any]], None]
+
+class ApplicationPipeline:
+    """The apply flow as a dependency graph over ResumeParser, JobAnalyzer and WorkdayAutomator.
+
+    All inputs and stage outputs live in one JSON-serializable state dict, so a run can be
+    persisted after every stage and resumed later without redoing finished stages. Stages that
+    only depend on the parsed resume (tailoring and job analysis) run concurrently.
+    """
+
+    def __init__(self, ai_provider_name: Optional[str] = None, fused: Optional[bool] = None):
+        self.parser = get_resume_parser(ai_provider_name)
+        self.analyzer = get_job_analyzer(ai_provider_name)
+        if fused is None:
+            fused = settings.get_bool("FUSED_ANALYSIS", True)
+        self.fused = fused
+        self.graphs = {True: self._build_graph(True), False: self._build_graph(False)}
+        self.graph = self.graphs[fused]
+
+    def _build_graph(self, fused: bool) -> StageGraph:
+        graph = StageGraph().add("parse_resume", self.parse_resume, ["resume"], executor="parse")
+        if fused:
+            graph.add("analyze_application", self.analyze_application, ["job_description", "parse_resume"])
+            graph.add("submit", self.submit_fused, ["job_url", "analyze_application"], executor="browser")
+        else:
+            graph.add("tailor_bullets", self.tailor_bullets, ["job_description", "parse_resume"])
+            graph.add("analyze_job", self.analyze_job, ["job_description", "parse_resume"])
+            graph.add("generate_responses", self.generate_responses, ["analyze_job"])
+            graph.add("submit", self.submit, ["job_url", "generate_responses"], executor="browser")
+        return graph
+
+    def layout(self, state: Dict[str, Any]) -> bool:
+        """Whether state runs fused: a resumed run keeps the layout it started with, whatever FUSED_ANALYSIS says now."""
+        stage_names = state.get("stage_names") or ()
+        if any(name in stage_names for name in FUSED_STAGES if name not in STAGES):
+            return True
+        if any(name in stage_names for name in STAGES if name not in FUSED_STAGES):
+            return False
+        return self.fused
+
+    def parse_resume(self, resume: ResumeSource) -> Dict[str, Any]:
+        # Validated against the schema, then kept as plain JSON types so the job queue can persist it
+        return models.Resume.from_json(self.parser.parse_resume(resume)).to_dict()
+
+    def tailor_bullets(self, job_description: str, parse_resume: Dict[str, Any]) -> Dict[str, Any]:
+        return json_repair.loads(self.analyzer.tailor_bullet_points(job_description, parse_resume))
+
+    def analyze_job(self, job_description: str, parse_resume: Dict[str, Any]) -> Dict[str, Any]:
+        return models.Analysis.from_json(self.analyzer.analyze_job_description(job_description, parse_resume)).to_dict()
+
+    def generate_responses(self, analyze_job: Dict[str, Any]) -> Dict[str, Any]:
+        return json_repair.loads(self.analyzer.generate_application_responses(analyze_job))
+
+    def analyze_application(self, job_description: str, parse_resume: Dict[str, Any]) -> Dict[str, Any]:
+        return self.analyzer.analyze_application(job_description, parse_resume)
+
+    def submit_fused(self, job_url: str, analyze_application: Dict[str, Any]) -> bool:
+        return self.submit(job_url, analyze_application["application_responses"])
+
+    def submit(self, job_url: str, generate_responses: Dict[str, Any]) -> bool:
+        check_cancelled()
+        # Selenium is only loaded once an application is actually submitted
+        from workday_automator import WorkdayAutomator
+        pool = get_browser_pool()
+        if pool is not None:
+            # Lease a warm session; the pool keeps it (and its login cookies) for the next application
+            with pool.lease(job_url) as driver:
+                self._drive(WorkdayAutomator(driver=driver), job_url, generate_responses)
+            return True
+
+        automator = WorkdayAutomator()
+        with telemetry.span("browser.start"):
+            automator.initialize_driver()
+
+        try:
+            self._drive(automator, job_url, generate_responses)
+        finally:
+            automator.close()
+        return True
+
+    @staticmethod
+    def _drive(automator, job_url: str, application_data: Dict[str, Any]):
+        """Login, fill and submit, one span per step; stops before the next step once the run has failed."""
+        with telemetry.span("browser.login"):
+            automator.login(job_url)
+        check_cancelled()
+        with telemetry.span("browser.fill"):
+            automator.fill_application_form(application_data)
+        check_cancelled()
+        with telemetry.span("browser.submit"):
+            automator.submit_application()
+
+    def _prepare(self, state: Dict[str, Any], targets: Optional[Iterable[str]]) -> Tuple[Dict[str, Any], StageGraph, bool]:
+        fused = self.layout(state)
+        graph = self.graphs[fused]
+        state.setdefault("timings", {})
+        available = {key: value for key, value in state.items() if key not in _BOOKKEEPING}
+        state.setdefault("stage_names", graph.plan(available, targets))
+        return available, graph, fused
+
+    def _record(self, state: Dict[str, Any], on_stage: Optional[StageCallback]):
+        def on_complete(name: str, output: Any, duration: float):
+            state[name] = output
+            state["timings"][name] = duration
+            if name == "tailor_bullets":
+                state["tailored_resume"] = apply_tailored_bullets(state["parse_resume"], output)
+            elif name == "analyze_application":
+                # Expose the fused sections under the per-step keys callers already read
+                state["tailor_bullets"] = output["tailored_bullets"]
+                state["tailored_resume"] = output["tailored_resume"]
+                state["analyze_job"] = output["analysis"]
+                state["generate_responses"] = output["application_responses"]
+            if on_stage:
+                on_stage(name, state)
+        return on_complete
+
+    def run(self, state: Dict[str, Any], on_stage: Optional[StageCallback] = None,
+            targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Run every unfinished stage needed for targets (default: all) on a local thread pool."""
+        available, graph, fused = self._prepare(state, targets)
+        with telemetry.span("pipeline", fused=fused):
+            graph.run(available, targets, on_complete=self._record(state, on_stage))
+        return state
+
+    async def arun(self, state: Dict[str, Any], on_stage: Optional[StageCallback] = None,
+                   targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Run every unfinished stage needed for targets on the bounded stage executors."""
+        available, graph, fused = self._prepare(state, targets)
+        with telemetry.span("pipeline", fused=fused):
+            await graph.arun(available, targets, on_complete=self._record(state, on_stage))
+        return state
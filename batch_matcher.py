@@ -0,0 +1,89 @@
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from ai_scheduler import BATCH, priority
+from checkpoint import Checkpoint
+from job_analyzer import JobAnalyzer, get_job_analyzer
+from skill_index import ResumeIndex
+import json_repair
+
+JobPosting = Union[str, Dict[str, Any]]
+
+def _posting_id(posting: Dict[str, Any]) -> str:
+    return posting.get("id") or hashlib.sha256(posting["description"].encode("utf-8")).hexdigest()[:16]
+
+def _normalize(posting: JobPosting) -> Dict[str, Any]:
+    if isinstance(posting, str):
+        posting = {"description": posting}
+    return dict(posting, id=_posting_id(posting))
+
+def match_jobs(resume_data: Dict[str, Any], job_descriptions: Iterable[JobPosting],
+               analyzer: Optional[JobAnalyzer] = None, concurrency: int = 8,
+               min_overlap: float = 0.0, top_k: Optional[int] = None,
+               checkpoint_path: Optional[str] = None, local_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """Analyze one resume against many job postings, yielding each result as it completes.
+
+    Postings are ranked by local skill overlap first; those below min_overlap, or outside the
+    top_k, are yielded as skipped without spending a model call. At most `concurrency` model
+    calls are in flight at once. With local_only, the remaining postings are matched by the
+    local ResumeIndex instead of the model. With a checkpoint path, finished postings are
+    appended as they complete and replayed instead of re-analyzed when the run is restarted.
+    """
+    index = ResumeIndex(resume_data)
+    checkpoint = Checkpoint(checkpoint_path)
+
+    ranked: List[Dict[str, Any]] = []
+    for posting in map(_normalize, job_descriptions):
+        if posting["id"] in checkpoint:
+            yield dict(checkpoint.load(posting["id"]), resumed=True)
+            continue
+        posting["score"] = index.skill_overlap(posting["description"])
+        ranked.append(posting)
+    ranked.sort(key=lambda posting: posting["score"], reverse=True)
+
+    selected = []
+    for rank, posting in enumerate(ranked):
+        if posting["score"] < min_overlap or (top_k is not None and rank >= top_k):
+            result = {"id": posting["id"], "score": posting["score"], "skipped": True, "analysis": None, "error": None}
+            checkpoint.record(result)
+            yield result
+        else:
+            selected.append(posting)
+
+    if local_only:
+        analyses = index.match_many([posting["description"] for posting in selected])
+        for posting, analysis in zip(selected, analyses):
+            result = {"id": posting["id"], "score": posting["score"], "skipped": False, "analysis": analysis, "error": None}
+            checkpoint.record(result)
+            yield result
+        return
+
+    analyzer = analyzer or get_job_analyzer()
+
+    def analyze(posting: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"id": posting["id"], "score": posting["score"], "skipped": False, "analysis": None, "error": None}
+        try:
+            # Screening yields to interactive /apply calls when the model quota is tight
+            with priority(BATCH):
+                result["analysis"] = json_repair.loads(analyzer.analyze_job_description(posting["description"], resume_data))
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+    postings = iter(selected)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        running = set()
+        while True:
+            # Keep a bounded window in flight instead of queueing every posting up front
+            while len(running) < concurrency:
+                posting = next(postings, None)
+                if posting is None:
+                    break
+                running.add(pool.submit(analyze, posting))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                checkpoint.record(result)
+                yield result
@@ -0,0 +1,73 @@
+"""Compare keystroke and batched form filling against mock_workday_form.html.
+
+Requires Chrome; runs headless. Usage: python benchmark_form_fill.py --repeat 3
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+from workday_automator import WorkdayAutomator, create_driver
+
+APPLICATION_DATA = {
+    "personal_info": {
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": "jane@example.com",
+        "phone": "(555) 010-0000",
+        "city": "Austin",
+        "state": "TX",
+        "postal_code": "78701",
+    },
+    "work_experience": [
+        {
+            "company": f"Company {index}",
+            "title": "Software Engineer",
+            "dates": f"Jan {2012 + index * 2} - Dec {2013 + index * 2}",
+            "responsibilities": ["Built a data pipeline using Python", "Scaled an internal API on AWS"],
+        }
+        for index in range(4)
+    ],
+    "education": [
+        {"institution": "University of Texas at Austin", "degree": "B.S. Computer Science", "dates": "2008 - 2012"},
+    ],
+    "skills": ["Python", "AWS", "SQL", "Docker"],
+    "additional_info": {
+        "summary": "Backend engineer focused on data-heavy services. " * 5,
+        "linkedin": "linkedin.com/in/janedoe",
+        "website": "janedoe.dev",
+    },
+}
+
+def run_once(driver, url, fast_fill):
+    automator = WorkdayAutomator(driver=driver)
+    automator.fast_fill = fast_fill
+    driver.get(url)
+    start = time.perf_counter()
+    automator.fill_application_form(APPLICATION_DATA)
+    elapsed = time.perf_counter() - start
+    automator.submit_application()
+    submitted = driver.execute_script("return window.submittedApplication")
+    assert submitted["fields"]["email"] == "jane@example.com", submitted
+    assert len(submitted["experience"]) == len(APPLICATION_DATA["work_experience"]), submitted
+    return elapsed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--save-delay", type=int, default=300, help="simulated save round trip in ms")
+    args = arg_parser.parse_args()
+
+    form_path = Path(__file__).resolve().parent / "mock_workday_form.html"
+    url = f"{form_path.as_uri()}?logged_in=1&save_delay={args.save_delay}"
+
+    os.environ.setdefault("FAST_FORM_FILL", "1")
+    driver = create_driver(headless=True)
+    try:
+        for label, fast_fill in (("keystrokes per field", False), ("batched script fill", True)):
+            timings = [run_once(driver, url, fast_fill) for _ in range(args.repeat)]
+            print(f"{label:<22} best {min(timings):6.2f}s  mean {sum(timings) / len(timings):6.2f}s")
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Shared pieces for driving the FastAPI app offline: stub services, an in-process server and a client."""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, List
+from stub_gemini import StubGeminiServer
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+class StubAutomator:
+    """Stands in for WorkdayAutomator by sleeping the way a real browser flow blocks."""
+    latency = 0.5
+
+    def __init__(self, driver=None):
+        self.driver = driver
+
+    def initialize_driver(self):
+        time.sleep(self.latency / 2)
+
+    def login(self, url):
+        pass
+
+    def fill_application_form(self, application_data):
+        time.sleep(self.latency / 2)
+
+    def submit_application(self):
+        pass
+
+    def close(self):
+        pass
+
+def configure_offline(stub: StubGeminiServer, real_browser: bool = False, browser_latency: float = 0.5):
+    """Point the app at the stub server and disable caches so every request pays full cost.
+
+    Must run before the app handles its first request: the model provider, the caches and the
+    browser pool read these variables when they are first created.
+    """
+    os.environ["GOOGLE_AI_API_URL"] = stub.url
+    os.environ["AI_CACHE_SIZE"] = "0"
+    os.environ["RESUME_CACHE_SIZE"] = "0"
+    if not real_browser:
+        os.environ["BROWSER_POOL_SIZE"] = "0"
+        # The pipeline imports WorkdayAutomator from here when it submits
+        import workday_automator
+        StubAutomator.latency = browser_latency
+        workday_automator.WorkdayAutomator = StubAutomator
+
+def start_app_server(port: int):
+    """Run the FastAPI app on a background uvicorn server and wait until it accepts requests."""
+    import uvicorn
+    import main as app_module
+
+    server = uvicorn.Server(uvicorn.Config(app_module.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+async def drive_apply(url: str, resume_bytes: bytes, total: int, concurrency: int,
+                      job_url: str = "https://example.myworkdayjobs.com/job/1") -> Dict[str, Any]:
+    """POST total applications to url with at most concurrency in flight."""
+    import httpx
+
+    latencies: List[float] = []
+    stage_timings: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=600) as client:
+        async def one(index: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(url, files={"resume": (f"resume_{index}.pdf", resume_bytes)}, data={
+                    "job_url": job_url,
+                    "job_description": f"Python engineer posting {index}",
+                })
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    # A crash can answer with a plain-text 500, so only trust a JSON error message
+                    try:
+                        message = response.json().get("message")
+                    except ValueError:
+                        message = None
+                    errors.append(message or f"HTTP {response.status_code}")
+                    return
+                body = response.json()
+                for stage, duration in body.get("timings", {}).items():
+                    stage_timings.setdefault(stage, []).append(duration)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "failures": len(errors),
+        "errors": sorted(set(errors))[:10],
+        "duration_s": elapsed,
+        "throughput_rps": total / elapsed,
+        "latency_s": summarize(latencies),
+        "stages_s": {stage: summarize(values) for stage, values in stage_timings.items()},
+    }
@@ -0,0 +1,37 @@
+import argparse
+import time
+from skill_index import ResumeIndex
+from synthetic_documents import synthetic_job_description, synthetic_resume_data
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark local job matching throughput")
+    arg_parser.add_argument("--postings", type=int, default=5000)
+    args = arg_parser.parse_args()
+
+    resume_data = synthetic_resume_data(seed=1, experiences=6)
+    postings = [synthetic_job_description(seed) for seed in range(args.postings)]
+
+    start = time.perf_counter()
+    index = ResumeIndex(resume_data)
+    print(f"index build:            {(time.perf_counter() - start) * 1000:8.2f} ms "
+          f"({len(index.documents)} bullets, {len(index.terms)} terms)")
+
+    start = time.perf_counter()
+    for posting in postings[:500]:
+        index.match_job(posting)
+    elapsed = time.perf_counter() - start
+    print(f"match_job (one by one): {500 / elapsed:8.0f} matches/sec")
+
+    start = time.perf_counter()
+    results = index.match_many(postings)
+    elapsed = time.perf_counter() - start
+    print(f"match_many (batched):   {len(results) / elapsed:8.0f} matches/sec over {len(results)} postings")
+
+    start = time.perf_counter()
+    for posting in postings:
+        index.skill_overlap(posting)
+    elapsed = time.perf_counter() - start
+    print(f"skill_overlap prefilter:{len(postings) / elapsed:8.0f} postings/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compare decoding model output into dicts with json against json_repair + typed records.
+
+For a corpus of synthetic parsed resumes, written the way the model returns them, reports:
+decode time per resume for json.loads, json_repair.loads (orjson when installed) and
+models.Resume.from_json (decode plus schema validation); memory held per parsed resume as
+nested dicts versus slotted records; and, for copies damaged the ways model output breaks
+(fenced, trailing commas, raw newlines in strings, truncated), how many each path recovers
+and what the local repair costs.
+
+Usage: python benchmark_models.py --corpus 200 --repeat 5
+"""
+import argparse
+import gc
+import json
+import random
+import statistics
+import time
+import tracemalloc
+import json_repair
+import models
+from synthetic_documents import synthetic_resume_data
+
+def legacy_loads(text):
+    """The decode path before json_repair: strip every fence marker, then json.loads."""
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+def damage(text, kind, rng):
+    if kind == "fenced":
+        return f"Here is the parsed resume:\n```json\n{text}\n```"
+    if kind == "trailing_comma":
+        return text.replace("\n  ]", ",\n  ]").replace("\n}", ",\n}")
+    if kind == "raw_newline":
+        return text.replace(". ", ".\n", 3)
+    return text[:int(len(text) * rng.uniform(0.5, 0.95))]
+
+def per_doc_ms(decode, texts, repeat):
+    runs = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        for text in texts:
+            decode(text)
+        runs.append((time.perf_counter() - began) * 1000 / len(texts))
+    return statistics.median(runs)
+
+def held_bytes(decode, texts):
+    """Bytes still allocated while every decoded resume is kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    kept = [decode(text) for text in texts]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / len(texts)
+
+def recovered(decode, texts):
+    count = 0
+    for text in texts:
+        try:
+            decode(text)
+            count += 1
+        except ValueError:
+            pass
+    return count
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--corpus", type=int, default=200, help="synthetic resumes")
+    arg_parser.add_argument("--experiences", type=int, default=6, help="work experiences per resume")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    texts = [json.dumps(synthetic_resume_data(seed=seed, experiences=args.experiences), indent=2)
+             for seed in range(args.corpus)]
+    size_kb = statistics.mean(len(text) for text in texts) / 1024
+    print(f"{args.corpus} resumes, {size_kb:.1f} KB each, orjson {'on' if json_repair.orjson else 'not installed'}")
+
+    print("\nDecode time per resume:")
+    for label, decode in (("json.loads -> dict", legacy_loads),
+                          ("json_repair.loads -> dict", json_repair.loads),
+                          ("Resume.from_json -> record", models.Resume.from_json)):
+        print(f"  {label:<28} {per_doc_ms(decode, texts, args.repeat):7.3f} ms")
+
+    print("\nMemory held per parsed resume:")
+    dict_bytes = held_bytes(json.loads, texts)
+    record_bytes = held_bytes(models.Resume.from_json, texts)
+    print(f"  {'nested dicts':<28} {dict_bytes / 1024:7.1f} KB")
+    print(f"  {'slotted records':<28} {record_bytes / 1024:7.1f} KB  ({1 - record_bytes / dict_bytes:.0%} less)")
+
+    print("\nDamaged responses recovered without another model call:")
+    rng = random.Random(0)
+    for kind in ("fenced", "trailing_comma", "raw_newline", "truncated"):
+        damaged = [damage(text, kind, rng) for text in texts]
+        legacy, repaired = recovered(legacy_loads, damaged), recovered(json_repair.loads, damaged)
+        repair_ms = per_doc_ms(json_repair.repair_json, damaged, 1)
+        print(f"  {kind:<16} legacy {legacy:4}/{len(damaged)}  repair {repaired:4}/{len(damaged)}  "
+              f"repair cost {repair_ms:6.3f} ms")
+
+if __name__ == "__main__":
+    main()
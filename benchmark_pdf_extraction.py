@@ -0,0 +1,53 @@
+import os
+import tempfile
+import time
+import pdfplumber
+from pdf_extractor import extract_pdf_text, iter_pdf_pages, open_mapped
+from synthetic_documents import synthetic_resume_pdf
+
+def legacy_extract(file_path):
+    # The original ResumeParser loop, kept here as the baseline
+    text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            text += (page.extract_text() or "") + "\n"
+    return text
+
+def time_it(label, func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:9.1f} ms  ({len(result)} chars)")
+    return result
+
+def benchmark(file_path, workers):
+    print(f"\n{file_path}")
+    print("-" * 70)
+    baseline = time_it("legacy loop", lambda: legacy_extract(file_path))
+    time_it("streaming generator", lambda: "".join(page + "\n" for page in iter_pdf_pages(file_path)))
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    time_it("in-memory buffer", lambda: extract_pdf_text(data))
+
+    def mapped():
+        with open_mapped(file_path) as buffer:
+            return extract_pdf_text(buffer)
+    time_it("memory-mapped file", mapped)
+    parallel = time_it(f"process pool ({workers} workers)", lambda: extract_pdf_text(file_path, workers=workers))
+    assert parallel == baseline, "parallel extraction changed the output"
+
+def main():
+    workers = os.cpu_count() or 1
+    if os.path.exists("resume.pdf"):
+        benchmark("resume.pdf", workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic_path = os.path.join(tmp, "synthetic_50_pages.pdf")
+        with open(synthetic_path, 'wb') as f:
+            f.write(synthetic_resume_pdf(page_count=50))
+        benchmark(synthetic_path, workers)
+
+if __name__ == "__main__":
+    main()
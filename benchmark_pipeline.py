@@ -0,0 +1,97 @@
+"""End-to-end throughput benchmark for /apply, fully offline.
+
+Runs the FastAPI app in-process against a stub generateContent server (with configurable
+latency, jitter and failure rate) and either a stub browser or headless Chrome driving
+mock_workday_form.html. Writes throughput, latency and per-stage percentiles and peak RSS
+to a JSON file; with --baseline, exits non-zero when throughput or p95 latency regress.
+
+Usage: python benchmark_pipeline.py --requests 50 --concurrency 10 --output bench_results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+from stub_gemini import StubGeminiServer
+from benchmark_harness import configure_offline, drive_apply, start_app_server
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def regressions(result, baseline, tolerance):
+    found = []
+    if result["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        found.append(f"throughput {result['throughput_rps']:.2f} < baseline {baseline['throughput_rps']:.2f}")
+    if result["latency_s"]["p95"] > baseline["latency_s"]["p95"] * (1 + tolerance):
+        found.append(f"p95 {result['latency_s']['p95']:.2f}s > baseline {baseline['latency_s']['p95']:.2f}s")
+    return found
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--requests", type=int, default=50)
+    arg_parser.add_argument("--concurrency", type=int, default=10)
+    arg_parser.add_argument("--llm-latency", type=float, default=0.2, help="mean stub model latency in seconds")
+    arg_parser.add_argument("--llm-jitter", type=float, default=0.05)
+    arg_parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of model calls that fail")
+    arg_parser.add_argument("--failure-status", type=int, default=503)
+    arg_parser.add_argument("--retry-delay", type=float, default=0.0, help="RetryInfo hint sent with failures")
+    arg_parser.add_argument("--browser", choices=["stub", "chrome"], default="stub")
+    arg_parser.add_argument("--browser-latency", type=float, default=0.5, help="stub browser flow duration")
+    arg_parser.add_argument("--pages", type=int, default=1, help="pages in the synthetic resume PDF")
+    arg_parser.add_argument("--port", type=int, default=8766)
+    arg_parser.add_argument("--output", default="bench_results.json")
+    arg_parser.add_argument("--baseline", help="previous results file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    stub = StubGeminiServer(latency=args.llm_latency, jitter=args.llm_jitter,
+                            failure_rate=args.failure_rate, failure_status=args.failure_status,
+                            retry_delay=args.retry_delay).start()
+    configure_offline(stub, real_browser=args.browser == "chrome", browser_latency=args.browser_latency)
+
+    from synthetic_documents import synthetic_resume_pdf
+
+    server = start_app_server(args.port)
+    try:
+        result = asyncio.run(drive_apply(
+            f"http://127.0.0.1:{args.port}/apply",
+            synthetic_resume_pdf(page_count=args.pages),
+            args.requests,
+            args.concurrency,
+            job_url=stub.form_url,
+        ))
+    finally:
+        server.should_exit = True
+        stub.stop()
+
+    result.update({
+        "config": vars(args),
+        "model_calls": stub.requests,
+        "model_failures": stub.failures,
+        "peak_rss_mb": peak_rss_mb(),
+        "python": platform.python_version(),
+    })
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    latency = result["latency_s"]
+    print(f"{result['throughput_rps']:.2f} req/s  p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  "
+          f"p99 {latency['p99']:.2f}s  failures {result['failures']}/{result['requests']}  "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB")
+    for stage, stats in result["stages_s"].items():
+        print(f"  {stage:<22} p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  p99 {stats['p99']:.3f}s")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(result, json.load(f), args.tolerance)
+        for message in found:
+            print(f"REGRESSION: {message}")
+        if found:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
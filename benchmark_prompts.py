@@ -0,0 +1,62 @@
+"""Report per-stage prompt sizes before and after compaction.
+
+"raw" is the data as the prompts used to interpolate it: the dict's Python repr, or the
+pretty-printed JSON text parse_resume returns. "compact" is prompt_builder's projected
+canonical JSON. Token counts use the same 4-bytes-per-token estimate as the rate limiter.
+
+Usage: python benchmark_prompts.py --experiences 6
+"""
+import argparse
+import json
+import prompt_builder
+from prompt_builder import estimate_tokens
+from skill_index import key_requirements
+from stub_gemini import CANNED_RESPONSE
+from synthetic_documents import synthetic_job_description, synthetic_resume_data
+
+def row(stage, raw, compacted, prefix, prompt, system_prompt):
+    raw_tokens = estimate_tokens(str(raw))
+    compact_tokens = estimate_tokens(compacted)
+    saved = 100 * (1 - compact_tokens / raw_tokens)
+    print(f"{stage:<22} raw {raw_tokens:6d}  compact {compact_tokens:6d}  saved {saved:5.1f}%  "
+          f"static prefix {estimate_tokens(system_prompt + prefix):5d}  "
+          f"full prompt {estimate_tokens(system_prompt + prompt):6d}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--experiences", type=int, default=6)
+    args = arg_parser.parse_args()
+
+    resume_data = synthetic_resume_data(seed=1, experiences=args.experiences)
+    job_description = synthetic_job_description(seed=1)
+    analysis = {key: CANNED_RESPONSE[key] for key in CANNED_RESPONSE["analysis"]}
+    analysis["experience_matches"] = [
+        {"job_requirement": bullet, "matching_experience": bullet, "tailored_response": bullet}
+        for experience in resume_data["work_experience"] for bullet in experience["responsibilities"][:2]
+    ]
+
+    for label, resume in (("dict input", resume_data), ("JSON text input", json.dumps(resume_data, indent=4))):
+        print(label)
+        for stage, fields, prefix, build in (
+            ("analyze_job", prompt_builder.ANALYSIS_FIELDS, prompt_builder.ANALYSIS_PREFIX, prompt_builder.analysis_prompt),
+            ("analyze_application", prompt_builder.FUSED_FIELDS, prompt_builder.FUSED_PREFIX, prompt_builder.fused_prompt),
+        ):
+            compacted = prompt_builder.compact_json(prompt_builder.project_resume(resume, fields))
+            row(stage, resume, compacted, prefix, *build(job_description, resume))
+        print()
+
+    # Per-experience tailoring sends the key requirements instead of the whole posting
+    requirements = key_requirements(job_description)
+    experience = resume_data["work_experience"][0]
+    print("first work experience")
+    row("tailor_experience", experience,
+        prompt_builder.compact_json({key: experience[key] for key in prompt_builder.EXPERIENCE_FIELDS}),
+        prompt_builder.EXPERIENCE_PREFIX, *prompt_builder.experience_prompt(requirements, experience))
+    print()
+
+    print("analysis input")
+    row("generate_responses", analysis, prompt_builder.compact_json(analysis), prompt_builder.RESPONSES_PREFIX,
+        *prompt_builder.responses_prompt(analysis))
+
+if __name__ == "__main__":
+    main()
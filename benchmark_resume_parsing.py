@@ -0,0 +1,73 @@
+"""Compare whole-text and pre-extracted resume parsing: prompt size and parse latency.
+
+Runs resume.pdf and a synthetic corpus through ResumeParser against the stub server, once with
+RESUME_PREEXTRACT off (one call with the full text) and once on (contact details, skills and
+certifications parsed locally, the other sections sent as parallel calls). The stub's latency
+grows with the request size, as generation does for extraction prompts whose output restates
+their input.
+
+Usage: python benchmark_resume_parsing.py --corpus 20 --latency 0.3 --latency-per-kb 0.5
+"""
+import argparse
+import os
+import time
+import telemetry
+from prompt_builder import estimate_tokens
+from stub_gemini import StubGeminiServer
+from synthetic_documents import resume_lines
+
+def prompt_tokens(parser, text):
+    """Tokens sent for one resume: (total, largest single call)."""
+    from resume_parser import (RESUME_PROMPT_TEMPLATE, RESUME_SYSTEM_PROMPT, SECTION_PROMPT_TEMPLATES,
+                               SECTION_SYSTEM_PROMPT)
+    extracted = parser._preextract(text)
+    if extracted is None:
+        sizes = [estimate_tokens(RESUME_SYSTEM_PROMPT + RESUME_PROMPT_TEMPLATE.format(text=text))]
+    else:
+        sizes = [estimate_tokens(SECTION_SYSTEM_PROMPT + SECTION_PROMPT_TEMPLATES[section].format(text=section_text))
+                 for section, section_text in extracted["sections"].items()]
+    return sum(sizes), max(sizes)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--corpus", type=int, default=20, help="synthetic resumes")
+    arg_parser.add_argument("--latency", type=float, default=0.3, help="fixed seconds per call")
+    arg_parser.add_argument("--latency-per-kb", type=float, default=0.5, help="extra seconds per KB of prompt")
+    args = arg_parser.parse_args()
+
+    stub = StubGeminiServer(latency=args.latency, latency_per_kb=args.latency_per_kb).start()
+    os.environ["GOOGLE_AI_API_URL"] = stub.url
+    os.environ["AI_CACHE_SIZE"] = "0"
+    telemetry.configure(enabled=False)
+
+    from resume_parser import ResumeParser, extract_resume_text
+    documents = [("resume.pdf", extract_resume_text("resume.pdf"))]
+    documents += [(f"synthetic corpus ({args.corpus})", "\n".join(resume_lines(seed=seed, experiences=3 + seed % 5)))
+                  for seed in range(args.corpus)]
+    parser = ResumeParser()
+
+    try:
+        for label, texts in (("resume.pdf", documents[:1]), (f"synthetic corpus ({args.corpus})", documents[1:])):
+            print(label)
+            for mode in (False, True):
+                parser.preextract = mode
+                total = largest = 0
+                start = time.perf_counter()
+                local = 0.0
+                for _, text in texts:
+                    sent, biggest = prompt_tokens(parser, text)
+                    total += sent
+                    largest = max(largest, biggest)
+                    began = time.perf_counter()
+                    parser._preextract(text)
+                    local += time.perf_counter() - began
+                    parser._analyze_resume(text)
+                elapsed = (time.perf_counter() - start) / len(texts)
+                print(f"  {'pre-extracted' if mode else 'whole text':<14} prompt tokens/resume {total / len(texts):7.0f}  "
+                      f"largest call {largest:5d}  parse latency {elapsed:5.2f}s"
+                      + (f"  local pass {1000 * local / len(texts):5.2f}ms" if mode else ""))
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare single backends, the latency-aware router and hedged routing against stub model APIs.
+
+Starts one stub server per backend, each speaking its own API shape: Gemini with a slow tail
+(a fraction of calls take --tail seconds longer), OpenAI slightly slower but steady, and
+Anthropic fast but failing a fraction of calls. Every configuration answers the same number
+of distinct prompts from a few concurrent callers; the report shows latency percentiles,
+failed calls and how many upstream requests were made (hedging trades extra requests for a
+shorter tail). Retries are off so failover, not backoff, handles errors.
+
+Usage: python benchmark_router.py --requests 200 --concurrency 8 --hedge-after 0.5
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from stub_gemini import StubGeminiServer
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(provider, label, requests, concurrency, stubs):
+    before = sum(stub.requests for stub in stubs)
+
+    def call(index):
+        start = time.perf_counter()
+        try:
+            provider.generate_response(f"{label} prompt {index}")
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(call, range(requests)))
+    succeeded = [latency for latency in latencies if latency is not None]
+    upstream = sum(stub.requests for stub in stubs) - before
+    print(f"{label:<22} p50 {statistics.median(succeeded):5.2f}s  p95 {percentile(succeeded, 0.95):5.2f}s  "
+          f"p99 {percentile(succeeded, 0.99):5.2f}s  failed {len(latencies) - len(succeeded):3}/{requests}  "
+          f"upstream requests {upstream}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--requests", type=int, default=200)
+    arg_parser.add_argument("--concurrency", type=int, default=8)
+    arg_parser.add_argument("--latency", type=float, default=0.3, help="Gemini stub base latency in seconds")
+    arg_parser.add_argument("--tail", type=float, default=2.0, help="extra seconds for Gemini's slow calls")
+    arg_parser.add_argument("--tail-rate", type=float, default=0.1)
+    arg_parser.add_argument("--failure-rate", type=float, default=0.3, help="Anthropic stub failure rate")
+    arg_parser.add_argument("--hedge-after", type=float, default=0.5)
+    args = arg_parser.parse_args()
+
+    gemini = StubGeminiServer(latency=args.latency, jitter=0.05, tail_rate=args.tail_rate, tail_latency=args.tail,
+                              response={"ok": True}, seed=1).start()
+    openai = StubGeminiServer(latency=args.latency * 1.5, jitter=0.05, response={"ok": True}, seed=2).start()
+    anthropic = StubGeminiServer(latency=args.latency * 0.7, jitter=0.05, failure_rate=args.failure_rate,
+                                 response={"ok": True}, seed=3).start()
+    stubs = [gemini, openai, anthropic]
+    os.environ.update(GOOGLE_AI_API_URL=gemini.url, OPENAI_BASE_URL=openai.api_base_url,
+                      ANTHROPIC_BASE_URL=anthropic.api_base_url, AI_CACHE_SIZE="0", AI_MAX_RETRIES="0",
+                      AI_POOL_SIZE=str(args.concurrency * 2))
+
+    from ai_provider import AnthropicProvider, GeminiProvider, OpenAIProvider, ProviderRouter
+    from cache import TieredCache
+
+    def backends():
+        return [backend(cache=TieredCache(max_entries=0)) for backend in (GeminiProvider, OpenAIProvider, AnthropicProvider)]
+
+    try:
+        for backend in backends():
+            run(backend, backend.name, args.requests, args.concurrency, stubs)
+        run(ProviderRouter(backends()), "router", args.requests, args.concurrency, stubs)
+        router = ProviderRouter(backends(), hedge_after=args.hedge_after)
+        run(router, f"router, hedge {args.hedge_after}s", args.requests, args.concurrency, stubs)
+        for name, stats in router.backend_stats().items():
+            p50 = f"{stats['latency_p50']:.2f}s" if stats["latency_p50"] is not None else "-"
+            print(f"    {name:<10} calls {stats['samples']:4}  p50 {p50}  error rate {stats['error_rate']:.0%}")
+    finally:
+        for stub in stubs:
+            stub.stop()
+
+if __name__ == "__main__":
+    main()
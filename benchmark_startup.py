@@ -0,0 +1,113 @@
+"""Cold-start benchmark: import time and baseline RSS of the service modules.
+
+Imports each module in a fresh interpreter under `python -X importtime`, several times, and
+reports the median cumulative import time, the slowest direct imports, the RSS right after
+import (next to a bare interpreter's) and which heavy dependencies were loaded eagerly.
+Writes the results to a JSON file; with --baseline, exits non-zero when import time or RSS
+regress.
+
+Usage: python benchmark_startup.py --runs 5 --output startup_results.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+HEAVY_MODULES = ("selenium", "pdfplumber", "docx", "numpy", "httpx", "uvicorn")
+
+PROBE = """
+import resource, sys
+{import_line}
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """(depth, cumulative microseconds, module) for every line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports carry one space of padding, then two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+    return entries
+
+def probe(module: str) -> Dict[str, Any]:
+    import_line = f"import {module}" if module else "pass"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(import_line=import_line, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True,
+    )
+    rss, heavy = completed.stdout.split("\n")[-3:-1]
+    entries = parse_importtime(completed.stderr)
+    # importtime prints a module's direct imports (one level deeper) right before the module itself
+    import_ms, children, pending = 0.0, [], []
+    for depth, cumulative, name in entries:
+        if depth == 1:
+            pending.append((cumulative, name))
+        elif depth == 0:
+            if name == module:
+                import_ms, children = cumulative / 1000, sorted(pending, reverse=True)
+            pending = []
+    return {
+        "import_ms": import_ms,
+        "rss_mb": float(rss),
+        "heavy_modules": [name for name in heavy.split(",") if name],
+        "slowest_imports_ms": {name: cumulative / 1000 for cumulative, name in children[:5]},
+    }
+
+def regressions(result, baseline, tolerance):
+    found = []
+    for module, stats in result["modules"].items():
+        previous = baseline.get("modules", {}).get(module)
+        if previous is None:
+            continue
+        if stats["import_ms"] > previous["import_ms"] * (1 + tolerance):
+            found.append(f"{module} import {stats['import_ms']:.0f}ms > baseline {previous['import_ms']:.0f}ms")
+        if stats["rss_mb"] > previous["rss_mb"] * (1 + tolerance):
+            found.append(f"{module} RSS {stats['rss_mb']:.0f}MB > baseline {previous['rss_mb']:.0f}MB")
+    return found
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--modules", nargs="+",
+                            default=["main", "application_pipeline", "resume_parser", "job_analyzer", "ai_provider"])
+    arg_parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    arg_parser.add_argument("--output", default="startup_results.json")
+    arg_parser.add_argument("--baseline", help="previous results file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2)
+    args = arg_parser.parse_args()
+
+    interpreter_rss = statistics.median(probe("")["rss_mb"] for _ in range(args.runs))
+    result = {"interpreter_rss_mb": interpreter_rss, "modules": {}, "python": platform.python_version()}
+    print(f"bare interpreter: RSS {interpreter_rss:.1f} MB")
+    for module in args.modules:
+        runs = [probe(module) for _ in range(args.runs)]
+        stats = dict(runs[-1], import_ms=statistics.median(run["import_ms"] for run in runs),
+                     rss_mb=statistics.median(run["rss_mb"] for run in runs))
+        result["modules"][module] = stats
+        print(f"{module:<22} import {stats['import_ms']:7.1f}ms  RSS {stats['rss_mb']:6.1f} MB  "
+              f"heavy: {', '.join(stats['heavy_modules']) or 'none'}")
+        for name, elapsed in stats["slowest_imports_ms"].items():
+            print(f"    {name:<30} {elapsed:7.1f}ms")
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(result, json.load(f), args.tolerance)
+        for message in found:
+            print(f"REGRESSION: {message}")
+        if found:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
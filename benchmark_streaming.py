@@ -0,0 +1,47 @@
+"""Compare time-to-first-entry for buffered and streamed bullet tailoring against the stub server.
+
+Each work experience is its own call, so with per-call jitter the streamed entries arrive as
+their calls finish while the buffered result waits for the slowest one. Memoization is off so
+both runs make every call.
+
+Usage: python benchmark_streaming.py --latency 4 --jitter 2 --experiences 6
+"""
+import argparse
+import json
+import os
+import time
+from stub_gemini import CANNED_RESPONSE, StubGeminiServer
+from synthetic_documents import synthetic_job_description, synthetic_resume_data
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--latency", type=float, default=4.0, help="simulated generation time in seconds")
+    arg_parser.add_argument("--experiences", type=int, default=6)
+    arg_parser.add_argument("--jitter", type=float, default=2.0, help="+/- seconds of latency per call")
+    args = arg_parser.parse_args()
+
+    resume_data = synthetic_resume_data(seed=1, experiences=args.experiences)
+    stub = StubGeminiServer(latency=args.latency, jitter=args.jitter,
+                            response={"tailored_bullets": CANNED_RESPONSE["tailored_bullets"]}).start()
+    os.environ["GOOGLE_AI_API_URL"] = stub.url
+    os.environ["AI_CACHE_SIZE"] = "0"
+
+    from cache import TieredCache
+    from job_analyzer import JobAnalyzer
+    analyzer = JobAnalyzer(tailor_cache=TieredCache(max_entries=0))
+    job_description = synthetic_job_description(seed=1)
+    try:
+        start = time.perf_counter()
+        entries = json.loads(analyzer.tailor_bullet_points(job_description, resume_data))["tailored_experience"]
+        buffered = time.perf_counter() - start
+        print(f"buffered:  first entry {buffered:6.2f}s  all {len(entries)} entries {buffered:6.2f}s")
+
+        start = time.perf_counter()
+        arrivals = [time.perf_counter() - start
+                    for _ in analyzer.stream_tailored_experience(job_description, resume_data)]
+        print(f"streamed:  first entry {arrivals[0]:6.2f}s  all {len(arrivals)} entries {arrivals[-1]:6.2f}s")
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure what memoized per-experience tailoring saves when re-applying to similar postings.
+
+Runs three scenarios against the stub server: a cold posting, a near-identical repost (new
+company blurb, reordered and recased requirements, a benefits line) and the repost again after
+one work experience was edited. Each scenario reports model calls, prompt tokens and latency.
+
+Usage: python benchmark_tailoring.py --latency 1 --experiences 6
+"""
+import argparse
+import copy
+import os
+import time
+import telemetry
+from stub_gemini import CANNED_RESPONSE, StubGeminiServer
+from synthetic_documents import synthetic_job_description, synthetic_resume_data
+
+def repost(job_description):
+    """Reword the boilerplate and shuffle the requirement bullets of a posting."""
+    lines = job_description.splitlines()
+    requirements = [line for line in lines if line.startswith("- ")]
+    return "\n".join(
+        ["Join a fast-growing team on a mission to simplify hiring.", "What you'll bring:"]
+        + [line.upper() if index % 2 else line for index, line in enumerate(reversed(requirements))]
+        + ["We offer flexible hours, health insurance and a generous learning budget."]
+    )
+
+def prompt_tokens():
+    series = telemetry.snapshot()["counters"].get("prompt_tokens_total", {})
+    return sum(value for labels, value in series.items() if "tailor_experience" in labels)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--latency", type=float, default=1.0, help="simulated generation time in seconds")
+    arg_parser.add_argument("--experiences", type=int, default=6)
+    args = arg_parser.parse_args()
+
+    stub = StubGeminiServer(latency=args.latency, response={"tailored_bullets": CANNED_RESPONSE["tailored_bullets"]}).start()
+    os.environ["GOOGLE_AI_API_URL"] = stub.url
+    os.environ["AI_CACHE_SIZE"] = "0"
+    telemetry.configure(enabled=True)
+
+    from cache import TieredCache
+    from job_analyzer import JobAnalyzer
+    analyzer = JobAnalyzer(tailor_cache=TieredCache(max_entries=1024))
+    resume_data = synthetic_resume_data(seed=1, experiences=args.experiences)
+    job_description = synthetic_job_description(seed=1)
+    edited = copy.deepcopy(resume_data)
+    edited["work_experience"][0]["responsibilities"][0] += " across three regions"
+
+    try:
+        for label, posting, resume in (
+            ("cold posting", job_description, resume_data),
+            ("near-identical repost", repost(job_description), resume_data),
+            ("repost, one role edited", repost(job_description), edited),
+        ):
+            requests, tokens = stub.requests, prompt_tokens()
+            start = time.perf_counter()
+            analyzer.tailor_bullet_points(posting, resume)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<24} calls {stub.requests - requests:3d}  prompt tokens {prompt_tokens() - tokens:6d}  "
+                  f"latency {elapsed:6.2f}s")
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
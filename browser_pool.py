@@ -0,0 +1,190 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+import telemetry
+from settings import settings
+
+class BrowserSession:
+    __slots__ = ("driver", "uses", "created", "tenant")
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.uses = 0
+        self.created = time.time()
+        self.tenant: Optional[str] = None
+
+def tenant_of(url: str) -> str:
+    """Workday tenants are separate hosts, so the origin identifies the tenant."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+class BrowserPool:
+    """Bounded pool of warm WebDriver sessions leased out one application at a time.
+
+    Sessions are health-checked on lease and recycled after max_uses leases or once the page's
+    JS heap grows past max_memory_mb. Cookies are saved per tenant on release and restored on
+    the next lease for that tenant, so a warm session skips the Workday login.
+    """
+
+    def __init__(self, size: int = 2, driver_factory: Optional[Callable[[], Any]] = None,
+                 max_uses: int = 20, max_memory_mb: Optional[float] = 512, lease_timeout: float = 120):
+        if driver_factory is None:
+            from workday_automator import create_driver
+            driver_factory = lambda: create_driver(headless=True)
+        self.size = size
+        self.driver_factory = driver_factory
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.lease_timeout = lease_timeout
+        self._idle: List[BrowserSession] = []
+        self._count = 0
+        self._cookies: Dict[str, List[Dict[str, Any]]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @contextmanager
+    def lease(self, url: str, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Lease a healthy driver prepared for url's tenant; raises TimeoutError if none frees up."""
+        tenant = tenant_of(url)
+        start = time.perf_counter()
+        session = self._acquire(tenant, self.lease_timeout if timeout is None else timeout)
+        telemetry.observe("browser_lease_wait_seconds", time.perf_counter() - start)
+        healthy = False
+        try:
+            self._prepare(session, tenant)
+            yield session.driver
+            healthy = True
+        finally:
+            self._release(session, healthy)
+
+    def _acquire(self, tenant: str, timeout: float) -> BrowserSession:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    # Prefer a session that last served this tenant so its cookies are still live
+                    session = next((s for s in self._idle if s.tenant == tenant), self._idle[-1])
+                    self._idle.remove(session)
+                    break
+                if self._count < self.size:
+                    self._count += 1
+                    session = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser session became free within {timeout}s")
+                self._condition.wait(remaining)
+
+        if session is not None and self._healthy(session):
+            return session
+        if session is not None:
+            self._quit(session)
+        try:
+            # Browser startup happens outside the lock so other leases are not serialized on it
+            return BrowserSession(self.driver_factory())
+        except Exception:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            raise
+
+    def _prepare(self, session: BrowserSession, tenant: str):
+        session.uses += 1
+        if session.tenant == tenant:
+            return
+        driver = session.driver
+        driver.delete_all_cookies()
+        cookies = self._cookies.get(tenant)
+        if cookies:
+            # Cookies can only be set while on the tenant's domain
+            driver.get(tenant)
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    pass
+        session.tenant = tenant
+
+    def _release(self, session: BrowserSession, healthy: bool):
+        if healthy and session.tenant:
+            try:
+                self._cookies[session.tenant] = session.driver.get_cookies()
+            except Exception:
+                healthy = False
+
+        if not healthy or self._closed or self._worn_out(session):
+            self._quit(session)
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    def _healthy(self, session: BrowserSession) -> bool:
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _worn_out(self, session: BrowserSession) -> bool:
+        if session.uses >= self.max_uses:
+            return True
+        if self.max_memory_mb is None:
+            return False
+        try:
+            used = session.driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0"
+            )
+        except Exception:
+            return True
+        return (used or 0) / (1024 * 1024) > self.max_memory_mb
+
+    def _quit(self, session: BrowserSession):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every idle session; leased sessions are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._condition.notify_all()
+        for session in idle:
+            self._quit(session)
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Return the shared browser pool, or None when BROWSER_POOL_SIZE is 0."""
+    global _pool
+    size = settings.get_int("BROWSER_POOL_SIZE", 2)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            memory = settings.get("BROWSER_MAX_MEMORY_MB", "512")
+            _pool = BrowserPool(
+                size=size,
+                max_uses=settings.get_int("BROWSER_MAX_USES", 20),
+                max_memory_mb=float(memory) if memory else None,
+                lease_timeout=settings.get_float("BROWSER_LEASE_TIMEOUT", 120),
+            )
+        return _pool
+
+def close_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+def make_cache_key(*parts: str) -> str:
+    """Hash the given parts into a stable content-addressed key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+class TieredCache:
+    """In-memory LRU cache with TTL expiry and an optional SQLite tier that survives restarts."""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None, db_path: Optional[str] = None,
+                 table: str = "cache"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.table = table
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created):
+                        self._store(key, value, created)
+                        self._counters["hits"] += 1
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """Store value under key in every enabled tier."""
+        created = time.time()
+        with self._lock:
+            self._store(key, value, created)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, created)
+                )
+                self._db.commit()
+
+    def _store(self, key: str, value: str, created: float):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def delete(self, key: str):
+        """Remove key from every tier."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        """Drop all entries from every tier."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table}")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current in-memory size."""
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
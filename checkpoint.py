@@ -0,0 +1,54 @@
+"""Append-only JSONL checkpoints shared by the batch jobs (job matching and resume ingestion)."""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set
+
+class Checkpoint:
+    """Append-only JSONL log of finished items so an interrupted run can pick up where it left off.
+
+    Records are keyed by their "id"; failed ones (a non-null "error") are not treated as done.
+    Only the ids and file offsets of finished records are held in memory, and a record is read
+    back from the file when it is replayed, so a large backfill's checkpoint stays cheap to load.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A crash mid-write can leave a truncated last line
+                        continue
+                    if isinstance(record, dict) and record.get("error") is None and record.get("id"):
+                        self._offsets[record["id"]] = offset
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._offsets
+
+    def done(self) -> Set[str]:
+        return set(self._offsets)
+
+    def load(self, record_id: str) -> Dict[str, Any]:
+        """Read a finished record back from the file."""
+        with self._lock:
+            with open(self.path, "rb") as f:
+                f.seek(self._offsets[record_id])
+                return json.loads(f.readline())
+
+    def record(self, result: Dict[str, Any]):
+        if not self.path:
+            return
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(result, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,59 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from settings import settings
+
+# Default worker counts per pipeline stage, overridable with <STAGE>_STAGE_WORKERS
+DEFAULT_STAGE_WORKERS = {
+    "parse": 4,
+    "llm": 16,
+    "browser": 2,
+}
+
+class StageExecutor:
+    """Bounded thread pool that runs one blocking pipeline stage off the event loop."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        # A stage with no workers runs inline on the event loop (the old blocking behaviour)
+        self.inline = max_workers <= 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not self.inline:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-stage")
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func on this stage's pool and await its result, carrying the caller's context (trace spans)."""
+        if self.inline:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(context.run, func, *args, **kwargs))
+
+    def shutdown(self):
+        """Stop accepting work and wait for running calls to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+_stages: Dict[str, StageExecutor] = {}
+_stages_lock = threading.Lock()
+
+def get_stage(name: str) -> StageExecutor:
+    """Return the shared executor for a pipeline stage."""
+    with _stages_lock:
+        if name not in _stages:
+            workers = settings.get_int(f"{name.upper()}_STAGE_WORKERS", DEFAULT_STAGE_WORKERS.get(name, 4))
+            _stages[name] = StageExecutor(name, workers)
+        return _stages[name]
+
+def configure_stage(name: str, max_workers: int) -> StageExecutor:
+    """Replace a stage's executor, e.g. to resize it or run it inline."""
+    with _stages_lock:
+        previous = _stages.get(name)
+        _stages[name] = StageExecutor(name, max_workers)
+    if previous is not None:
+        previous.shutdown()
+    return _stages[name]
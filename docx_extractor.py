@@ -0,0 +1,141 @@
+"""Streaming text extraction from DOCX resumes.
+
+The main document part and its headers are read straight out of the zip and parsed with
+iterparse, clearing each block once its text is out, so memory stays bounded by the largest
+paragraph or table rather than the whole document object model. Unlike joining python-docx's
+Document.paragraphs, this keeps tables (in reading order), text boxes and headers, where many
+resume templates put skills and contact details. Text box content is read from the DrawingML
+choice only; its VML mc:Fallback copy is skipped.
+"""
+import io
+import posixpath
+import re
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree import ElementTree
+
+DocxSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+OFFICE_DOCUMENT = "/officeDocument"
+HEADER = "/header"
+
+W_P, W_T, W_TAB, W_TABS, W_BR, W_CR = W + "p", W + "t", W + "tab", W + "tabs", W + "br", W + "cr"
+W_TBL, W_TR, W_TC, W_BODY, W_HDR = W + "tbl", W + "tr", W + "tc", W + "body", W + "hdr"
+
+# First cell of a two-column "Languages & tools | Python, Go" row
+ROW_LABEL = re.compile(r"[A-Za-z][A-Za-z/&]*(?: [A-Za-z/&]+){0,2}:?")
+
+def _relationships(archive: zipfile.ZipFile, part: str) -> List[tuple]:
+    """(type, target part name) for each relationship of part ("" for the package)."""
+    folder, name = posixpath.split(part)
+    rels_name = posixpath.join(folder, "_rels", f"{name}.rels")
+    try:
+        with archive.open(rels_name) as f:
+            root = ElementTree.parse(f).getroot()
+    except KeyError:
+        return []
+    return [(rel.get("Type", ""), posixpath.normpath(posixpath.join(folder, rel.get("Target", "").lstrip("/"))))
+            for rel in root.iter(RELATIONSHIP) if rel.get("TargetMode") != "External"]
+
+def _row_lines(cells: List[List[str]]) -> List[str]:
+    # Short cells read as one line; layout tables read cell by cell
+    if all(len(cell) <= 1 for cell in cells):
+        texts = [cell[0].strip() if cell else "" for cell in cells]
+        if len(texts) == 2 and ROW_LABEL.fullmatch(texts[0]) and any(sep in texts[1] for sep in ",;"):
+            # A label and its list read as "Languages & tools: Python, Go", as they would in a paragraph
+            return [f"{texts[0].rstrip(':')}: {texts[1]}"]
+        return [" | ".join(texts)]
+    return [line for cell in cells for line in cell]
+
+def iter_part_lines(stream: BinaryIO) -> Iterator[str]:
+    """Yield the text of one WordprocessingML part a paragraph or table row at a time, in reading order."""
+    paragraphs: List[List[str]] = []
+    rows: List[List[List[str]]] = []
+    cells: List[List[str]] = []
+    container = None
+    skipping = in_tabs = 0
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if tag == MC_FALLBACK:
+            skipping += 1 if event == "start" else -1
+            continue
+        if skipping:
+            continue
+        if event == "start":
+            if tag == W_P:
+                paragraphs.append([])
+            elif tag == W_TC:
+                cells.append([])
+            elif tag == W_TR:
+                rows.append([])
+            elif tag == W_TABS:
+                in_tabs += 1
+            elif tag in (W_BODY, W_HDR):
+                container = element
+            continue
+
+        lines = None
+        if tag == W_T:
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag == W_TAB:
+            # Tab stops in paragraph properties are w:tab too
+            if paragraphs and not in_tabs:
+                paragraphs[-1].append("\t")
+        elif tag in (W_BR, W_CR):
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == W_TABS:
+            in_tabs -= 1
+        elif tag == W_P:
+            lines = ["".join(paragraphs.pop())]
+        elif tag == W_TC:
+            rows[-1].append(cells.pop())
+        elif tag == W_TR:
+            lines = _row_lines(rows.pop())
+        if lines is None:
+            continue
+        # Its text is out, so drop the subtree now; the enclosing table or body may stay open much longer
+        element.clear()
+        if cells:
+            cells[-1].extend(lines)
+            continue
+        # A text box anchored in a paragraph is read just before that paragraph
+        yield from lines
+        if not paragraphs and container is not None:
+            # Also drop the emptied top-level elements themselves
+            container.clear()
+
+def _open_archive(source: DocxSource) -> zipfile.ZipFile:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    try:
+        return zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a valid DOCX file: {e}")
+
+def iter_docx_lines(source: DocxSource) -> Iterator[str]:
+    """Yield the lines of a DOCX: header text first (each distinct header once), then the body."""
+    with _open_archive(source) as archive:
+        document = next((target for kind, target in _relationships(archive, "")
+                         if kind.endswith(OFFICE_DOCUMENT)), "word/document.xml")
+        if document not in archive.NameToInfo:
+            raise ValueError("Not a Word document: the archive has no main document part")
+        seen = set()
+        for kind, target in _relationships(archive, document):
+            if not kind.endswith(HEADER) or target not in archive.NameToInfo:
+                continue
+            with archive.open(target) as f:
+                lines = [line for line in iter_part_lines(f) if line.strip()]
+            if lines and tuple(lines) not in seen:
+                seen.add(tuple(lines))
+                yield from lines
+        with archive.open(document) as f:
+            yield from iter_part_lines(f)
+
+def extract_docx_text(source: DocxSource) -> str:
+    """Extract the text of a DOCX resume, one line per paragraph or table row."""
+    return "\n".join(iter_docx_lines(source))
@@ -1,115 +1,288 @@
-from typing import Dict, Any
-import os
-from dotenv import load_dotenv
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
+import contextvars
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from settings import settings
 from ai_provider import get_ai_provider
+from cache import TieredCache, make_cache_key
+from skill_index import ResumeIndex, SkillVocabulary, key_requirements
+from json_stream import iter_json_items
+import json_repair
+import models
+import telemetry
+import prompt_builder
+from prompt_builder import APPLICATION_RESPONSE_FIELDS
 
-load_dotenv()
+# Any edit to the per-experience prompt changes this and so invalidates memoized bullets
+EXPERIENCE_PROMPT_FINGERPRINT = make_cache_key(prompt_builder.EXPERIENCE_PREFIX, prompt_builder.TAILOR_SYSTEM_PROMPT)
+
+_tailor_cache: Optional[TieredCache] = None
+_tailor_cache_lock = threading.Lock()
+_vocabulary: Optional[SkillVocabulary] = None
+
+def get_tailor_cache() -> TieredCache:
+    """Return the shared memo of tailored bullets, keyed by experience and job requirements."""
+    global _tailor_cache
+    if _tailor_cache is None:
+        with _tailor_cache_lock:
+            if _tailor_cache is None:
+                _tailor_cache = TieredCache(
+                    max_entries=settings.get_int("TAILOR_CACHE_SIZE", 1024),
+                    ttl=settings.get_float("TAILOR_CACHE_TTL"),
+                    db_path=settings.get("TAILOR_CACHE_PATH") or None,
+                    table="tailored_experience",
+                )
+    return _tailor_cache
+
+def _get_vocabulary() -> SkillVocabulary:
+    # Case-folded: recased reposts must select the same requirements and fingerprint the same
+    global _vocabulary
+    if _vocabulary is None:
+        _vocabulary = SkillVocabulary(fold_case=True)
+    return _vocabulary
+
+def requirements_fingerprint(requirements: List[str]) -> str:
+    """Hash requirement lines after folding case, skill aliases, stopwords and order.
+
+    Reposts that only reword boilerplate, recase or shuffle bullets get the same fingerprint; the
+    vocabulary folds case even for aliases such as "Go" that BM25 matching keeps case-sensitive.
+    """
+    vocabulary = _get_vocabulary()
+    normalized = sorted({" ".join(vocabulary.tokenize(requirement)) for requirement in requirements})
+    return make_cache_key(*normalized)
+
+def experience_fingerprint(experience: Dict[str, Any]) -> str:
+    return make_cache_key(prompt_builder.compact_json(
+        {key: experience[key] for key in prompt_builder.EXPERIENCE_FIELDS if key in experience}
+    ))
+
+def apply_tailored_bullets(resume_data: Dict[str, Any], tailored_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of resume_data with each matching experience's bullets replaced by the tailored ones."""
+    tailored_resume = json.loads(json.dumps(resume_data))
+    tailored = {(exp["company"], exp["title"]): exp["tailored_bullets"] for exp in tailored_data["tailored_experience"]}
+    for resume_exp in tailored_resume["work_experience"]:
+        bullets = tailored.get((resume_exp.get("company"), resume_exp.get("title")))
+        if bullets is not None:
+            resume_exp["responsibilities"] = bullets
+    return tailored_resume
+
+def normalize_tailored_experience(section: Any) -> Optional[List[Dict[str, Any]]]:
+    """Return a tailored_experience section coerced to the TailoredExperience schema, or None if it does not fit."""
+    if not isinstance(section, list):
+        return None
+    try:
+        return [entry.to_dict() for entry in models.parse_list(models.TailoredExperience, section, "tailored_experience")]
+    except models.SchemaError as e:
+        print(f"Schema error: {e}")
+        return None
+
+def normalize_analysis(section: Any) -> Optional[Dict[str, Any]]:
+    """Return an analysis section coerced to the Analysis schema, or None if it does not fit."""
+    try:
+        return models.Analysis.from_dict(section, "analysis").to_dict()
+    except models.SchemaError as e:
+        print(f"Schema error: {e}")
+        return None
+
+def validate_tailored_experience(section: Any) -> bool:
+    """Check a tailored_experience section against the tailor_bullet_points schema."""
+    return normalize_tailored_experience(section) is not None
+
+def validate_analysis(section: Any) -> bool:
+    """Check an analysis section against the analyze_job_description schema."""
+    return normalize_analysis(section) is not None
+
+def validate_application_responses(section: Any) -> bool:
+    """Check that every application field got a response."""
+    return isinstance(section, dict) and all(field in section for field in APPLICATION_RESPONSE_FIELDS)
+
+_analyzers: Dict[str, "JobAnalyzer"] = {}
+_analyzers_lock = threading.Lock()
+
+def get_job_analyzer(ai_provider_name: Optional[str] = None) -> "JobAnalyzer":
+    """Return the process-wide JobAnalyzer for ai_provider_name, creating it on first use."""
+    with _analyzers_lock:
+        if ai_provider_name not in _analyzers:
+            _analyzers[ai_provider_name] = JobAnalyzer(ai_provider_name)
+        return _analyzers[ai_provider_name]
 
 class JobAnalyzer:
-    def __init__(self, ai_provider_name: str = "openai"):
+    def __init__(self, ai_provider_name: Optional[str] = None, tailor_cache: Optional[TieredCache] = None):
         self.ai_provider = get_ai_provider(ai_provider_name)
+        self.tailor_cache = tailor_cache if tailor_cache is not None else get_tailor_cache()
+        self.tailor_concurrency = settings.get_int("TAILOR_CONCURRENCY", 8)
 
     def analyze_job_description(self, job_description: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze job description and match it with resume data to create tailored responses."""
-        prompt = f"""
-        Analyze the following job description and resume data to create tailored responses for a Workday powered job application.
-        Focus on matching skills, experiences, and qualifications.
-
-        Job Description:
-        {job_description}
-
-        Resume Data:
-        {resume_data}
-
-        Provide responses in JSON format with the following structure:
-        {{
-            "experience_matches": [
-                {{
-                    "job_requirement": "requirement from job description",
-                    "matching_experience": "relevant experience from resume",
-                    "tailored_response": "tailored response highlighting the match"
-                }}
-            ],
-            "skill_matches": [
-                {{
-                    "required_skill": "skill from job description",
-                    "matching_skill": "skill from resume",
-                    "evidence": "example of skill usage from experience"
-                }}
-            ],
-            "education_matches": [
-                {{
-                    "requirement": "education requirement from job description",
-                    "qualification": "matching education from resume",
-                    "relevance": "explanation of relevance"
-                }}
-            ],
-            "additional_qualifications": [
-                "list of additional qualifications from resume that could be relevant"
-            ]
-        }}
-        """
+        return self.ai_provider.generate_response(*prompt_builder.analysis_prompt(job_description, resume_data))
 
-        system_prompt = "You are an expert job application analyzer that matches resumes to job descriptions. Return the response in valid JSON format."
+    def stream_experience_matches(self, job_description: str, resume_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield each experience_matches item of analyze_job_description as soon as the model closes it."""
+        chunks = self.ai_provider.stream_response(*prompt_builder.analysis_prompt(job_description, resume_data))
+        for _, item in iter_json_items(chunks, ["experience_matches"]):
+            yield item
 
-        return self.ai_provider.generate_response(prompt, system_prompt)
+    def match_job_locally(self, job_description: str, resume_data: Dict[str, Any]) -> str:
+        """Match a job description against the resume with the local skill index instead of the model.
+
+        Returns JSON in the same shape as analyze_job_description.
+        """
+        return json.dumps(ResumeIndex(resume_data).match_job(job_description))
 
     def generate_application_responses(self, analysis: Dict[str, Any]) -> Dict[str, str]:
         """Generate specific responses for Workday application fields based on the analysis."""
-        prompt = f"""
-        Based on the following analysis, generate specific responses for a Workday application form.
-        Focus on creating concise, professional responses that highlight the best matches.
+        return self.ai_provider.generate_response(*prompt_builder.responses_prompt(analysis))
 
-        Analysis:
-        {analysis}
-
-        Generate responses for the following fields:
-        1. Summary of Qualifications
-        2. Work Experience
-        3. Education
-        4. Skills
-        5. Additional Information
+    def tailor_bullet_points(self, job_description: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Tailor bullet points to match job description while preserving core content.
 
-        Format the response as a JSON object with these fields as keys.
+        Each work experience is tailored on its own, in parallel, and memoized by its content and the
+        posting's normalized requirements; only entries not already tailored for them reach the model.
         """
+        entries = dict(self._tailor_entries(job_description, resume_data))
+        return json.dumps({"tailored_experience": [entries[index] for index in sorted(entries)]})
 
-        system_prompt = "You are an expert at crafting professional job application responses. Return the response in valid JSON format."
+    def stream_tailored_experience(self, job_description: str, resume_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield each tailored_experience entry as soon as it is ready, memoized entries first."""
+        for _, entry in self._tailor_entries(job_description, resume_data):
+            yield entry
 
-        return self.ai_provider.generate_response(prompt, system_prompt)
+    async def astream_tailored_experience(self, job_description: str,
+                                          resume_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Async variant of stream_tailored_experience."""
+        requirements, plan = self._plan_tailoring(job_description, resume_data)
+        # Same bound on in-flight model calls as the sync path's thread pool
+        semaphore = asyncio.Semaphore(max(1, self.tailor_concurrency))
 
-    def tailor_bullet_points(self, job_description: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Tailor bullet points to match job description while preserving core content."""
-        prompt = f"""
-        Analyze the following job description and resume data to tailor the bullet points for each work experience.
-        Focus on making minor adjustments to emphasize relevant skills and experiences while preserving the core content and achievements.
-
-        Job Description:
-        {job_description}
-
-        Resume Data:
-        {resume_data}
-
-        For each work experience, provide tailored bullet points that:
-        1. Maintain the original achievements and metrics
-        2. Slightly rephrase to emphasize skills mentioned in the job description
-        3. Keep the same level of detail and specificity
-        4. Don't add or remove any major responsibilities
-        5. Don't change any dates, company names, or job titles
-
-        Return the response in JSON format with the following structure:
-        {{
-            "tailored_experience": [
-                {{
-                    "company": "Company Name",
-                    "title": "Job Title",
-                    "dates": "Start Date - End Date",
-                    "original_bullets": ["Original bullet 1", "Original bullet 2"],
-                    "tailored_bullets": ["Tailored bullet 1", "Tailored bullet 2"]
-                }}
-            ]
-        }}
+        async def tailor(experience: Dict[str, Any], key: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._atailor_one(experience, key, *prompt_builder.experience_prompt(requirements, experience))
+
+        tasks = []
+        for _, experience, key, cached in plan:
+            if cached is not None:
+                yield self._tailored_entry(experience, cached)
+                continue
+            tasks.append(asyncio.ensure_future(tailor(experience, key)))
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _plan_tailoring(self, job_description: str, resume_data: Any) -> Tuple[List[str], List[Tuple[int, Dict[str, Any], str, Optional[List[str]]]]]:
+        """Return the posting's key requirements and (index, experience, cache key, cached bullets) per role."""
+        if isinstance(resume_data, str):
+            resume_data = json.loads(resume_data)
+        requirements = key_requirements(job_description, _get_vocabulary())
+        requirements_key = requirements_fingerprint(requirements)
+        plan = []
+        for index, experience in enumerate(resume_data.get("work_experience", [])):
+            key = make_cache_key(experience_fingerprint(experience), requirements_key,
+                                 EXPERIENCE_PROMPT_FINGERPRINT, self.ai_provider.api_url)
+            cached = self.tailor_cache.get(key)
+            telemetry.inc("cache_requests_total", cache="tailored_experience",
+                          result="miss" if cached is None else "hit")
+            plan.append((index, experience, key, None if cached is None else json.loads(cached)))
+        return requirements, plan
+
+    @staticmethod
+    def _tailored_entry(experience: Dict[str, Any], bullets: List[str]) -> Dict[str, Any]:
+        # Company, title and dates come from the resume, so the model cannot alter them
+        return {
+            "company": experience.get("company", ""),
+            "title": experience.get("title", ""),
+            "dates": experience.get("dates", ""),
+            "original_bullets": experience.get("responsibilities", []),
+            "tailored_bullets": bullets,
+        }
+
+    def _finish_tailoring(self, experience: Dict[str, Any], key: str, response: str) -> Dict[str, Any]:
+        try:
+            bullets = json_repair.loads(response).get("tailored_bullets")
+        except (ValueError, AttributeError):
+            bullets = None
+        if not isinstance(bullets, list) or not all(isinstance(bullet, str) for bullet in bullets):
+            print(f"Tailoring for {experience.get('company', 'Unknown')} returned an invalid response, keeping original bullets")
+            return self._tailored_entry(experience, experience.get("responsibilities", []))
+        self.tailor_cache.set(key, json.dumps(bullets))
+        return self._tailored_entry(experience, bullets)
+
+    def _tailor_one(self, experience: Dict[str, Any], key: str, prompt: str, system_prompt: str) -> Dict[str, Any]:
+        return self._finish_tailoring(experience, key, self.ai_provider.generate_response(prompt, system_prompt))
+
+    async def _atailor_one(self, experience: Dict[str, Any], key: str, prompt: str, system_prompt: str) -> Dict[str, Any]:
+        return self._finish_tailoring(experience, key, await self.ai_provider.agenerate_response(prompt, system_prompt))
+
+    def _tailor_entries(self, job_description: str, resume_data: Any) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index, entry) per work experience: memoized ones at once, the rest as their calls finish."""
+        requirements, plan = self._plan_tailoring(job_description, resume_data)
+        pending = []
+        for index, experience, key, cached in plan:
+            if cached is not None:
+                yield index, self._tailored_entry(experience, cached)
+            else:
+                pending.append((index, experience, key))
+        if not pending:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.tailor_concurrency, len(pending))))
+        try:
+            futures = {
+                pool.submit(contextvars.copy_context().run, self._tailor_one, experience, key,
+                            *prompt_builder.experience_prompt(requirements, experience)): index
+                for index, experience, key in pending
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # A consumer that stops early does not wait for the calls it no longer wants; ones
+            # already in flight still finish in the background and memoize their bullets
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def analyze_application(self, job_description: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Tailor bullets, match the job and draft form responses in one model call.
+
+        Each section of the fused output is validated on its own; any section that is missing
+        or malformed is regenerated with the matching per-step method.
         """
+        prompt, system_prompt = prompt_builder.fused_prompt(job_description, resume_data)
+
+        try:
+            fused = json_repair.loads(self.ai_provider.generate_response(prompt, system_prompt, max_output_tokens=8192))
+        except ValueError:
+            print("Fused analysis returned invalid JSON, falling back to per-step calls")
+            fused = {}
+        if not isinstance(fused, dict):
+            fused = {}
+
+        tailored_experience = normalize_tailored_experience(fused.get("tailored_experience"))
+        if tailored_experience is not None:
+            tailored_data = {"tailored_experience": tailored_experience}
+        else:
+            telemetry.inc("fused_fallbacks_total", section="tailored_experience")
+            print("Fused tailored_experience failed validation, re-running tailor_bullet_points")
+            tailored_data = json_repair.loads(self.tailor_bullet_points(job_description, resume_data))
+        tailored_resume = apply_tailored_bullets(resume_data, tailored_data)
+
+        analysis = normalize_analysis(fused.get("analysis"))
+        if analysis is None:
+            telemetry.inc("fused_fallbacks_total", section="analysis")
+            print("Fused analysis failed validation, re-running analyze_job_description")
+            analysis = models.Analysis.from_json(self.analyze_job_description(job_description, tailored_resume)).to_dict()
 
-        system_prompt = "You are an expert at tailoring resume bullet points to match job descriptions while preserving the core content and achievements. Return the response in valid JSON format."
+        application_responses = fused.get("application_responses")
+        if not validate_application_responses(application_responses):
+            telemetry.inc("fused_fallbacks_total", section="application_responses")
+            print("Fused application_responses failed validation, re-running generate_application_responses")
+            application_responses = json_repair.loads(self.generate_application_responses(analysis))
 
-        return self.ai_provider.generate_response(prompt, system_prompt) 
\ No newline at end of file
+        return {
+            "tailored_bullets": tailored_data,
+            "tailored_resume": tailored_resume,
+            "analysis": analysis,
+            "application_responses": application_responses,
+        }
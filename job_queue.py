@@ -0,0 +1,252 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Dict, List, Optional
+from ai_scheduler import BATCH, priority
+from application_pipeline import ApplicationPipeline, STAGES
+import telemetry
+
+def _serialize(state: Dict[str, Any]) -> str:
+    # The resume bytes already live in their own column
+    return json.dumps({key: value for key, value in state.items() if key != "resume"})
+
+class JobQueue:
+    """Persistent SQLite-backed queue of application jobs with per-stage progress."""
+
+    def __init__(self, db_path: str, max_attempts: int = 3, lease_seconds: float = 300):
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                request TEXT NOT NULL,
+                resume BLOB NOT NULL,
+                state TEXT NOT NULL DEFAULT '{}',
+                error TEXT,
+                lease_expires REAL,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    def enqueue(self, resume: bytes, filename: str, job_url: str, job_description: str,
+                ai_provider: Optional[str] = None) -> str:
+        """Add a job and return its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        request = json.dumps({
+            "filename": filename,
+            "job_url": job_url,
+            "job_description": job_description,
+            "ai_provider": ai_provider,
+        })
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, resume, created, updated) VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, request, resume, now, now)
+            )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Lease the oldest queued job, or return None if the queue is empty."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_expires = ?, updated = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, row["id"])
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+        job = dict(row)
+        job["attempts"] += 1
+        job["request"] = json.loads(job["request"])
+        job["state"] = json.loads(job["state"])
+        return job
+
+    def save_progress(self, job_id: str, stage: str, state: Dict[str, Any]):
+        """Persist the state after a finished stage and extend the job's lease."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET stage = ?, state = ?, lease_expires = ?, updated = ? WHERE id = ?",
+                (stage, _serialize(state), now + self.lease_seconds, now, job_id)
+            )
+
+    def renew(self, job_id: str):
+        """Extend the lease of a job that is still running."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id)
+            )
+
+    def complete(self, job_id: str, state: Dict[str, Any]):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'succeeded', state = ?, error = NULL, lease_expires = NULL, updated = ? WHERE id = ?",
+                (_serialize(state), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str):
+        """Record a failed attempt, re-queueing the job until it runs out of attempts."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, lease_expires = NULL, updated = ? WHERE id = ?",
+                (self.max_attempts, error, time.time(), job_id)
+            )
+
+    def recover(self, all_running: bool = False) -> int:
+        """Re-queue jobs left running by a crashed worker; returns how many were recovered.
+
+        A job that has used up its attempts is marked failed instead, so one that keeps killing
+        the process is not retried forever.
+        """
+        update = (
+            "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+            "error = CASE WHEN attempts < ? THEN error ELSE 'Worker stopped before the job finished' END, "
+            "lease_expires = NULL, updated = ? WHERE status = 'running'"
+        )
+        now = time.time()
+        with self._lock:
+            if all_running:
+                cursor = self._db.execute(update, (self.max_attempts, self.max_attempts, now))
+            else:
+                cursor = self._db.execute(
+                    update + " AND lease_expires < ?",
+                    (self.max_attempts, self.max_attempts, now, now)
+                )
+            return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the public view of a job: status, per-stage progress and results."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, stage, attempts, state, error, created, updated FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        state = json.loads(row["state"])
+        timings = state.get("timings", {})
+        stages: List[Dict[str, Any]] = []
+        for name in state.get("stage_names", STAGES):
+            if name in timings:
+                stages.append({"name": name, "status": "done", "duration": timings[name]})
+            elif row["status"] == "running" and not any(stage["status"] == "running" for stage in stages):
+                stages.append({"name": name, "status": "running"})
+            else:
+                stages.append({"name": name, "status": "pending"})
+
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "attempts": row["attempts"],
+            "stages": stages,
+            "error": row["error"],
+            "tailored_bullets": state.get("tailor_bullets"),
+            "application_responses": state.get("generate_responses"),
+            "created": row["created"],
+            "updated": row["updated"],
+        }
+
+class ApplicationWorkerPool:
+    """Background threads that drain a JobQueue through the ApplicationPipeline."""
+
+    def __init__(self, queue: JobQueue, workers: int = 2, poll_interval: float = 0.5):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        # Jobs whose lease lapsed belong to a worker that is gone
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"Recovered {recovered} interrupted application job(s)")
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"application-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self):
+        while not self._stop.is_set():
+            self.queue.recover()
+            job = self.queue.claim()
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]):
+        request = job["request"]
+        state = job["state"]
+        state.update({
+            "job_url": request["job_url"],
+            "job_description": request["job_description"],
+        })
+        # Parsed straight from the stored bytes; the format is detected from the content
+        state["resume"] = job["resume"]
+        # Stages can outlast the lease, so keep renewing it until the run is over
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job["id"], finished), name=f"lease-{job['id']}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            pipeline = ApplicationPipeline(ai_provider_name=request["ai_provider"])
+            # Queued applications are not waited on by a client, so they take the batch lane
+            # run() returns only after every stage thread is done, even when one fails, so leftover
+            # work never overlaps a retry of this job while the heartbeat still holds its lease
+            with priority(BATCH):
+                pipeline.run(state, on_stage=lambda stage, current: self.queue.save_progress(job["id"], stage, current))
+            self.queue.complete(job["id"], state)
+            telemetry.inc("application_jobs_total", result="completed")
+        except Exception as e:
+            telemetry.inc("application_jobs_total", result="failed")
+            print(f"Application job {job['id']} failed on attempt {job['attempts']}: {e}")
+            print(traceback.format_exc())
+            self.queue.fail(job["id"], str(e))
+        finally:
+            finished.set()
+            heartbeat.join()
+
+    def _heartbeat(self, job_id: str, finished: threading.Event):
+        interval = self.queue.lease_seconds / 3
+        while not finished.wait(interval):
+            self.queue.renew(job_id)
@@ -0,0 +1,144 @@
+"""Fast decoding and local repair of JSON written by a model.
+
+loads() decodes with orjson when it is installed (falling back to the json module) and only
+when that fails runs repair_json(), which fixes the faults model output actually has: prose or
+markdown fences around the document, trailing commas, raw newlines inside strings, mismatched
+closing brackets and documents cut off mid-way by the output token limit. Everything happens
+locally, so a malformed response no longer costs a second model round trip.
+"""
+import json
+import re
+from typing import Any, List, Tuple, Union
+import telemetry
+
+try:
+    import orjson
+except ImportError:  # optional: the json module is used instead
+    orjson = None
+
+FENCE = re.compile(r"^\s*```[A-Za-z]*[ \t]*\n?|\n?[ \t]*```\s*$")
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+CLOSERS = {"{": "}", "[": "]"}
+
+def decode(text: Union[str, bytes]) -> Any:
+    """Strict decode with the fastest available parser; raises ValueError on invalid JSON."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def strip_fences(text: str) -> str:
+    """Remove a markdown code fence wrapped around the whole response."""
+    return FENCE.sub("", text).strip()
+
+def _drop_trailing_comma(out: List[str]):
+    index = len(out) - 1
+    while index >= 0 and out[index] in " \t\r\n":
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+def _scan(text: str) -> Tuple[str, bool, List[Tuple[int, str, Tuple[str, ...]]], Tuple[str, ...]]:
+    """Copy the first JSON document out of text, fixing faults that do not need context.
+
+    Returns the copied text, whether it ended inside a string, the structural cut points
+    (output position, character, open brackets) and the brackets still open at the end.
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        return text.strip(), False, [], ()
+    out: List[str] = []
+    stack: List[str] = []
+    cuts: List[Tuple[int, str, Tuple[str, ...]]] = []
+    in_string = escaped = False
+    index = min(starts)
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(char)
+            elif char == "\\":
+                escaped = True
+                out.append(char)
+            elif char == '"':
+                in_string = False
+                out.append(char)
+            elif char < " ":
+                out.append(CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}"))
+            else:
+                out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            stack.append(char)
+            out.append(char)
+            cuts.append((len(out), char, tuple(stack)))
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if not stack:
+                break
+            opener = stack.pop()
+            out.append(CLOSERS[opener])
+            if CLOSERS[opener] != char:
+                # Close the inner container and let this bracket close its own
+                continue
+            if not stack:
+                break
+        elif char == ",":
+            cuts.append((len(out), char, tuple(stack)))
+            out.append(char)
+        else:
+            out.append(char)
+        index += 1
+    return "".join(out), in_string, cuts, tuple(stack)
+
+def _close(text: str, stack: Tuple[str, ...]) -> str:
+    return text + "".join(CLOSERS[opener] for opener in reversed(stack))
+
+def _keeps_whole_elements(open_brackets: Tuple[str, ...]) -> bool:
+    # Closing a container that sits inside a list would pass half an element on as a whole one
+    return "[" not in open_brackets or open_brackets.index("[") == len(open_brackets) - 1
+
+def repair_json(text: str) -> str:
+    """Return text as a valid JSON document where that can be done locally, else text stripped.
+
+    Truncated documents are closed at the last point where everything before it is complete,
+    dropping the partial element (half a string, a key without a value, a number or literal that
+    may have been cut short, an unfinished object or list inside a list) rather than passing it on as if it
+    were whole.
+    """
+    repaired, in_string, cuts, stack = _scan(text)
+    if not stack and not in_string:
+        return repaired
+    # Cutting at a comma drops the element after it; cutting after an opener empties the container
+    candidates = [(repaired[:position], open_brackets) for position, _, open_brackets in reversed(cuts)]
+    candidate = repaired.rstrip()
+    if not in_string and candidate.endswith((",", '"', "}", "]")):
+        candidates.insert(0, (candidate[:-1] if candidate.endswith(",") else candidate, stack))
+    for candidate, open_brackets in candidates:
+        if not _keeps_whole_elements(open_brackets):
+            continue
+        closed = _close(candidate, open_brackets)
+        try:
+            decode(closed)
+        except ValueError:
+            continue
+        return closed
+    return text.strip()
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Decode model output, repairing it locally when it is not valid JSON as given."""
+    try:
+        return decode(text)
+    except ValueError:
+        pass
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    try:
+        value = decode(repair_json(text))
+    except ValueError:
+        telemetry.inc("json_repairs_total", result="failed")
+        raise
+    telemetry.inc("json_repairs_total", result="repaired")
+    return value
@@ -0,0 +1,110 @@
+"""Incremental parsing of JSON that arrives in chunks, such as a streamed model response.
+
+JsonItemParser hands back each element of a watched array (e.g. every entry of
+"tailored_experience") as soon as its closing bracket arrives, without waiting for the
+rest of the document. Text before the first "{" or "[" and after the document closes,
+such as markdown code fences, is ignored.
+"""
+import json
+from typing import Any, AsyncIterable, Iterable, List, Optional, Tuple
+
+class _Container:
+    __slots__ = ("kind", "key", "start", "item_key", "pending_key")
+
+    def __init__(self, kind: str, key: Optional[str], start: int, item_key: Optional[str]):
+        self.kind = kind
+        # Name of the object member this container is the value of
+        self.key = key
+        self.start = start
+        # Set when this container is an element of a watched array
+        self.item_key = item_key
+        self.pending_key: Optional[str] = None
+
+class JsonItemParser:
+    """Scan streamed JSON text and return completed elements of arrays stored under watched keys.
+
+    Keys match at any depth, so "experience_matches" is found both at the top level and
+    nested under "analysis". Only object and array elements are reported.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = set(keys)
+        self._text = ""
+        self._position = 0
+        self._stack: List[_Container] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._root: Optional[Tuple[int, int]] = None
+
+    @property
+    def complete(self) -> bool:
+        return self._root is not None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume the next chunk and return (key, item) for every element that closed in it."""
+        self._text += chunk
+        text = self._text
+        items: List[Tuple[str, Any]] = []
+        stack = self._stack
+
+        for index in range(self._position, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = json.loads(text[self._string_start:index + 1])
+                continue
+            if self._root is not None or (not stack and char not in "{["):
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                parent = stack[-1] if stack else None
+                key = parent.pending_key if parent is not None and parent.kind == "{" else None
+                item_key = parent.key if parent is not None and parent.kind == "[" and parent.key in self.keys else None
+                stack.append(_Container(char, key, index, item_key))
+            elif char in "}]":
+                closed = stack.pop()
+                if closed.item_key is not None:
+                    items.append((closed.item_key, json.loads(text[closed.start:index + 1])))
+                if not stack:
+                    self._root = (closed.start, index + 1)
+            elif char == ":" and stack[-1].kind == "{":
+                stack[-1].pending_key = self._last_string
+            elif char == "," and stack[-1].kind == "{":
+                stack[-1].pending_key = None
+
+        self._position = len(text)
+        return items
+
+    def result(self) -> Any:
+        """Parse the whole document once the stream has finished."""
+        if self._root is None:
+            raise ValueError("JSON document is incomplete")
+        start, end = self._root
+        return json.loads(self._text[start:end])
+
+def iter_json_items(chunks: Iterable[str], keys: Iterable[str]):
+    """Yield (key, item) pairs from a stream of text chunks as each watched element completes."""
+    parser = JsonItemParser(keys)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+async def aiter_json_items(chunks: AsyncIterable[str], keys: Iterable[str]):
+    """Async variant of iter_json_items."""
+    parser = JsonItemParser(keys)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
@@ -0,0 +1,43 @@
+"""Load test /apply against a stub Gemini server and a stub browser, blocking vs off-loop stages.
+
+Usage: python load_test_apply.py --requests 40 --concurrency 10
+"""
+import argparse
+import asyncio
+import os
+from stub_gemini import StubGeminiServer
+from benchmark_harness import configure_offline, drive_apply, start_app_server
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--requests", type=int, default=40)
+    arg_parser.add_argument("--concurrency", type=int, default=10)
+    arg_parser.add_argument("--llm-latency", type=float, default=0.2)
+    arg_parser.add_argument("--browser-latency", type=float, default=0.5)
+    arg_parser.add_argument("--port", type=int, default=8765)
+    args = arg_parser.parse_args()
+
+    stub = StubGeminiServer(latency=args.llm_latency).start()
+    configure_offline(stub, browser_latency=args.browser_latency)
+
+    from concurrency import configure_stage, DEFAULT_STAGE_WORKERS
+    from synthetic_documents import synthetic_resume_pdf
+
+    server = start_app_server(args.port)
+    url = f"http://127.0.0.1:{args.port}/apply"
+    resume_bytes = synthetic_resume_pdf()
+    try:
+        for label, inline in (("blocking (inline stages)", True), ("off-loop stages", False)):
+            for name, workers in DEFAULT_STAGE_WORKERS.items():
+                configure_stage(name, 0 if inline else int(os.getenv(f"{name.upper()}_STAGE_WORKERS", workers)))
+            result = asyncio.run(drive_apply(url, resume_bytes, args.requests, args.concurrency))
+            latency = result["latency_s"]
+            print(f"{label:<26} {result['throughput_rps']:6.2f} req/s  "
+                  f"p50 {latency['p50']:.2f}s  p95 {latency['p95']:.2f}s  p99 {latency['p99']:.2f}s  "
+                  f"failures {result['failures']}")
+    finally:
+        server.should_exit = True
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,81 @@
-import os
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from resume_parser import ResumeParser
-from job_analyzer import JobAnalyzer
-from workday_automator import WorkdayAutomator
 import json
+import tempfile
+from fastapi import FastAPI, UploadFile, File, Form
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from application_pipeline import ApplicationPipeline
+from job_analyzer import get_job_analyzer
+from job_queue import JobQueue, ApplicationWorkerPool
+from ai_provider import close_async_http_client
+from browser_pool import close_browser_pool
+import telemetry
+from settings import settings
 from typing import Optional
-import uvicorn
 
 app = FastAPI(title="Workday AI Application Assistant")
 
+job_queue: Optional[JobQueue] = None
+worker_pool: Optional[ApplicationWorkerPool] = None
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def spool_upload(upload: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """Copy an upload in chunks into a private in-memory buffer.
+
+    Only uploads larger than UPLOAD_SPOOL_MAX_BYTES roll over to an anonymous temp file, so
+    concurrent uploads never share a path on disk.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.get_int("UPLOAD_SPOOL_MAX_BYTES", 8 * 1024 * 1024))
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+@app.on_event("startup")
+def start_workers():
+    global job_queue, worker_pool
+    job_queue = JobQueue(
+        settings.get("APPLICATION_QUEUE_PATH", ".cache/applications.sqlite3"),
+        max_attempts=settings.get_int("APPLICATION_MAX_ATTEMPTS", 3),
+    )
+    worker_pool = ApplicationWorkerPool(job_queue, workers=settings.get_int("APPLICATION_WORKERS", 2))
+    worker_pool.start()
+
+@app.on_event("shutdown")
+def stop_workers():
+    if worker_pool:
+        worker_pool.stop(timeout=5)
+    close_browser_pool()
+
+@app.on_event("shutdown")
+async def close_model_clients():
+    await close_async_http_client()
+
 @app.post("/apply")
 async def apply_for_job(
     resume: UploadFile = File(...),
     job_url: str = Form(...),
     job_description: str = Form(...),
-    ai_provider: str = Form("openai")  # Default to OpenAI
+    ai_provider: Optional[str] = Form(None)  # Defaults to AI_PROVIDER
 ):
     try:
-        # Save uploaded resume
-        resume_path = f"temp_{resume.filename}"
-        with open(resume_path, "wb") as f:
-            f.write(await resume.read())
-
-        # Parse resume
-        parser = ResumeParser(ai_provider_name=ai_provider)
-        resume_data = parser.parse_resume(resume_path)
-
-        # Analyze job and generate responses
-        analyzer = JobAnalyzer(ai_provider_name=ai_provider)
-        
-        # First, get tailored bullet points
-        tailored_bullets = analyzer.tailor_bullet_points(job_description, resume_data)
-        
-        # Update resume data with tailored bullets
-        tailored_data = json.loads(tailored_bullets)
-        for exp in tailored_data["tailored_experience"]:
-            for resume_exp in resume_data["work_experience"]:
-                if exp["company"] == resume_exp["company"] and exp["title"] == resume_exp["title"]:
-                    resume_exp["responsibilities"] = exp["tailored_bullets"]
-        
-        # Now analyze the job with the tailored resume
-        analysis = analyzer.analyze_job_description(job_description, resume_data)
-        application_responses = analyzer.generate_application_responses(analysis)
-
-        # Initialize Workday automation
-        automator = WorkdayAutomator()
-        automator.initialize_driver()
-
-        try:
-            # Login and fill application
-            automator.login(job_url)
-            automator.fill_application_form(json.loads(application_responses))
-            automator.submit_application()
-
-            return JSONResponse({
-                "status": "success",
-                "message": "Application submitted successfully",
-                "tailored_bullets": tailored_data
+        # Parse, tailor, analyze and submit, each stage on its own bounded executor
+        pipeline = ApplicationPipeline(ai_provider_name=ai_provider)
+        with await spool_upload(resume) as resume_file:
+            state = await pipeline.arun({
+                "resume": resume_file,
+                "job_url": job_url,
+                "job_description": job_description,
             })
 
-        finally:
-            # Clean up
-            automator.close()
-            os.remove(resume_path)
+        return JSONResponse({
+            "status": "success",
+            "message": "Application submitted successfully",
+            "tailored_bullets": state["tailor_bullets"],
+            "timings": state["timings"]
+        })
 
     except Exception as e:
         return JSONResponse({
@@ -71,5 +83,55 @@ async def apply_for_job(
             "message": str(e)
         }, status_code=500)
 
+@app.post("/tailor/stream")
+async def stream_tailored_experience(
+    resume: UploadFile = File(...),
+    job_description: str = Form(...),
+    ai_provider: Optional[str] = Form(None)
+):
+    """Stream tailored work experience as newline-delimited JSON, one entry as soon as the model finishes it."""
+    try:
+        with await spool_upload(resume) as resume_file:
+            state = await ApplicationPipeline(ai_provider_name=ai_provider).arun(
+                {"resume": resume_file}, targets=["parse_resume"]
+            )
+    except Exception as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+    async def entries():
+        try:
+            async for entry in get_job_analyzer(ai_provider).astream_tailored_experience(job_description, state["parse_resume"]):
+                yield json.dumps(entry) + "\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band as the last line
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(entries(), media_type="application/x-ndjson")
+
+@app.post("/applications", status_code=202)
+async def submit_application(
+    resume: UploadFile = File(...),
+    job_url: str = Form(...),
+    job_description: str = Form(...),
+    ai_provider: Optional[str] = Form(None)
+):
+    """Queue an application and return its id immediately."""
+    job_id = job_queue.enqueue(await resume.read(), resume.filename, job_url, job_description, ai_provider)
+    return {"id": job_id, "status": "queued"}
+
+@app.get("/applications/{job_id}")
+async def get_application(job_id: str):
+    """Report a queued application's status, per-stage progress and results."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse({"status": "error", "message": "Application not found"}, status_code=404)
+    return job
+
+@app.get("/metrics")
+async def metrics():
+    """Expose pipeline counters and histograms in the Prometheus text format."""
+    return PlainTextResponse(telemetry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
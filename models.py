@@ -0,0 +1,141 @@
+"""Typed records for parsed resumes and match results.
+
+Each record class lists its fields in FIELDS (name -> kind) and stores them in __slots__, so a
+parsed resume carries no per-object __dict__. A kind is str, [str], another record class or a
+list of one. from_dict() validates model output against the schema while coercing the harmless
+faults models produce (null for a missing value, a number where a string belongs, a bare string
+where a list of strings belongs) and raises SchemaError naming the offending path otherwise.
+to_dict() turns a record back into plain JSON types for prompts, the job queue and API responses.
+"""
+from typing import Any, Dict, List, Tuple, Type, TypeVar, Union
+import json_repair
+
+R = TypeVar("R", bound="Record")
+
+class SchemaError(ValueError):
+    """Decoded JSON that does not fit a record's schema."""
+
+def _default(kind: Any) -> Any:
+    return [] if isinstance(kind, list) else "" if kind is str else kind()
+
+def _coerce(kind: Any, value: Any, path: str) -> Any:
+    if value is None:
+        return _default(kind)
+    if isinstance(kind, list):
+        if isinstance(value, str) and kind[0] is str:
+            return [value]
+        if not isinstance(value, list):
+            raise SchemaError(f"{path}: expected a list, got {type(value).__name__}")
+        return [_coerce(kind[0], item, f"{path}[{index}]") for index, item in enumerate(value) if item is not None]
+    if kind is str:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            return str(value)
+        raise SchemaError(f"{path}: expected a string, got {type(value).__name__}")
+    return kind.from_dict(value, path)
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+class Record:
+    """Base class; subclasses set FIELDS, REQUIRED and __slots__ = tuple(FIELDS)."""
+    __slots__ = ()
+    FIELDS: Dict[str, Any] = {}
+    REQUIRED: Tuple[str, ...] = ()
+
+    def __init__(self, **values: Any):
+        for name, kind in self.FIELDS.items():
+            setattr(self, name, values[name] if name in values else _default(kind))
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Any, path: str = "") -> R:
+        path = path or cls.__name__
+        if not isinstance(data, dict):
+            raise SchemaError(f"{path}: expected an object, got {type(data).__name__}")
+        missing = [name for name in cls.REQUIRED if name not in data]
+        if missing:
+            raise SchemaError(f"{path}: missing {', '.join(missing)}")
+        record = cls.__new__(cls)
+        for name, kind in cls.FIELDS.items():
+            setattr(record, name, _coerce(kind, data.get(name), f"{path}.{name}"))
+        return record
+
+    @classmethod
+    def from_json(cls: Type[R], text: Union[str, bytes]) -> R:
+        """Decode (repairing locally if needed) and validate model output."""
+        return cls.from_dict(json_repair.loads(text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _dump(getattr(self, name)) for name in self.FIELDS}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+def parse_list(record: Type[R], value: Any, path: str = "") -> List[R]:
+    """Validate a JSON array of objects against record."""
+    return _coerce([record], value, path or f"[{record.__name__}]")
+
+class PersonalInformation(Record):
+    FIELDS = {"name": str, "email": str, "phone": str, "location": str, "links": [str]}
+    __slots__ = tuple(FIELDS)
+
+class Experience(Record):
+    FIELDS = {"company": str, "title": str, "dates": str, "responsibilities": [str]}
+    __slots__ = tuple(FIELDS)
+
+class Education(Record):
+    FIELDS = {"institution": str, "degree": str, "dates": str}
+    __slots__ = tuple(FIELDS)
+
+class Project(Record):
+    FIELDS = {"name": str, "description": str}
+    __slots__ = tuple(FIELDS)
+
+class Resume(Record):
+    FIELDS = {
+        "personal_information": PersonalInformation,
+        "work_experience": [Experience],
+        "education": [Education],
+        "skills": [str],
+        "projects": [Project],
+        "certifications": [str],
+    }
+    __slots__ = tuple(FIELDS)
+
+class TailoredExperience(Record):
+    FIELDS = {"company": str, "title": str, "dates": str, "original_bullets": [str], "tailored_bullets": [str]}
+    REQUIRED = ("company", "title", "tailored_bullets")
+    __slots__ = tuple(FIELDS)
+
+class ExperienceMatch(Record):
+    FIELDS = {"job_requirement": str, "matching_experience": str, "tailored_response": str}
+    REQUIRED = ("job_requirement", "matching_experience")
+    __slots__ = tuple(FIELDS)
+
+class SkillMatch(Record):
+    FIELDS = {"required_skill": str, "matching_skill": str, "evidence": str}
+    REQUIRED = ("required_skill", "matching_skill")
+    __slots__ = tuple(FIELDS)
+
+class EducationMatch(Record):
+    FIELDS = {"requirement": str, "qualification": str, "relevance": str}
+    __slots__ = tuple(FIELDS)
+
+class Analysis(Record):
+    FIELDS = {
+        "experience_matches": [ExperienceMatch],
+        "skill_matches": [SkillMatch],
+        "education_matches": [EducationMatch],
+        "additional_qualifications": [str],
+    }
+    REQUIRED = ("experience_matches", "skill_matches")
+    __slots__ = tuple(FIELDS)
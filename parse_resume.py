@@ -1,13 +1,14 @@
+import argparse
+import asyncio
 import os
+from ai_provider import close_async_http_client
 from resume_parser import ResumeParser
+from resume_batch import ingest_resumes, iter_resume_paths
+import json_repair
 import json
-from dotenv import load_dotenv
 import urllib.parse
 
 def parse_resume_file(file_path):
-    # Load environment variables
-    load_dotenv()
-    
     # Initialize parser with Gemini
     parser = ResumeParser(ai_provider_name="google")
     
@@ -43,7 +44,7 @@ def parse_resume_file(file_path):
         print("=" * 50)
         
         # Parse the JSON string into a dictionary
-        parsed_data = json.loads(result)
+        parsed_data = json_repair.loads(result)
         
         # Print each section
         for section, data in parsed_data.items():
@@ -67,7 +68,7 @@ def parse_resume_file(file_path):
         print("Full error traceback:")
         print(traceback.format_exc())
 
-if __name__ == "__main__":
+def choose_resume_file():
     # Get the resume file path from user input
     print("Please enter the path to your resume file (PDF, DOC, or DOCX)")
     print("Example: ~/Downloads/My Resume.pdf")
@@ -83,4 +84,39 @@ if __name__ == "__main__":
     # Construct the full path
     file_path = os.path.join(downloads_dir, file_name)
     
-    parse_resume_file(file_path) 
\ No newline at end of file
+    parse_resume_file(file_path)
+
+async def backfill(args):
+    try:
+        return await ingest_resumes(
+            iter_resume_paths(args.paths, args.manifest),
+            args.output,
+            workers=args.workers,
+            concurrency=args.concurrency,
+        )
+    finally:
+        # The loop ends with this run, so its pooled connections go too
+        await close_async_http_client()
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Parse one resume interactively, or backfill many into a JSONL file."
+    )
+    arg_parser.add_argument("paths", nargs="*", help="resume files or directories to parse in batch mode")
+    arg_parser.add_argument("--manifest", help="file listing one resume path per line")
+    arg_parser.add_argument("--output", default="parsed_resumes.jsonl",
+                            help="JSONL output; rerunning skips resumes already parsed into it")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="text extraction processes")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="model calls in flight")
+    args = arg_parser.parse_args()
+
+    if not args.paths and not args.manifest:
+        choose_resume_file()
+        return
+
+    stats = asyncio.run(backfill(args))
+    print(f"Done: {stats['processed']} parsed, {stats['failed']} failed, {stats['skipped']} skipped "
+          f"in {stats['seconds']:.1f}s ({stats['files_per_second']:.2f} files/sec). Results in {args.output}")
+
+if __name__ == "__main__":
+    main()
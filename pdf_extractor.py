@@ -0,0 +1,95 @@
+import io
+import mmap
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+PdfSource = Union[str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+# Below this many pages the process pool costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+def _open_pdf(source: PdfSource):
+    """Open a PDF from a path, a byte buffer, a memory map or a file-like object."""
+    import pdfplumber
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+@contextmanager
+def open_mapped(file_path: str):
+    """Memory-map a file read-only so extraction reads it without copying into the heap."""
+    with open(file_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+def count_pages(source: PdfSource) -> int:
+    """Return the number of pages in the PDF."""
+    with _open_pdf(source) as pdf:
+        return len(pdf.pages)
+
+def iter_pdf_pages(source: PdfSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page as it is extracted; pages without a text layer yield ''."""
+    with _open_pdf(source) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+            # Drop cached layout objects so long documents stay in bounded memory
+            page.flush_cache()
+
+def _extract_page_range(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    return list(iter_pdf_pages(source, start, stop))
+
+def _picklable(source: PdfSource) -> Union[str, bytes]:
+    """Reduce a source to something that can be shipped to a worker process."""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+def extract_pdf_text(source: PdfSource, workers: int = 1, executor: Optional[Executor] = None) -> str:
+    """Extract the full text of a PDF, fanning page ranges across processes when workers > 1."""
+    if workers <= 1 and executor is None:
+        return "".join(page + "\n" for page in iter_pdf_pages(source))
+
+    page_count = count_pages(source)
+    if page_count < PARALLEL_MIN_PAGES:
+        return "".join(page + "\n" for page in iter_pdf_pages(source))
+
+    payload = _picklable(source)
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+    own_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_extract_page_range, payload, start, stop) for start, stop in ranges]
+        return "".join(page + "\n" for future in futures for page in future.result())
+    finally:
+        if own_executor:
+            pool.shutdown()
+
+def _extract_file(file_path: str) -> str:
+    return "".join(page + "\n" for page in iter_pdf_pages(file_path))
+
+def extract_many(file_paths: Iterable[str], workers: int = os.cpu_count() or 1,
+                 executor: Optional[Executor] = None) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Extract many PDFs across processes, yielding (path, text, error) as each one finishes."""
+    own_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(_extract_file, path): path for path in file_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                yield path, future.result(), None
+            except Exception as e:
+                yield path, None, str(e)
+    finally:
+        if own_executor:
+            pool.shutdown()
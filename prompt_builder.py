@@ -0,0 +1,153 @@
+"""Prompt construction for the job analysis calls.
+
+Resume and analysis data are sent as compact canonical JSON (sorted keys, no whitespace, empty
+fields dropped) and projected down to the fields each stage actually uses, instead of the
+Python repr an f-string produces. Every prompt starts with a static prefix (instructions and
+output schema) that is byte-identical across calls, so provider-side prefix caching can reuse
+it; the per-request job description and resume come last.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import telemetry
+
+APPLICATION_RESPONSE_FIELDS = [
+    "Summary of Qualifications",
+    "Work Experience",
+    "Education",
+    "Skills",
+    "Additional Information",
+]
+
+# Resume fields each stage needs; anything else (contact details, unused sections) is dropped
+EXPERIENCE_FIELDS = ("company", "title", "dates", "responsibilities")
+ANALYSIS_FIELDS = {
+    "work_experience": ("company", "title", "responsibilities"),
+    "education": ("institution", "degree"),
+    "skills": None,
+    "projects": ("name", "description"),
+    "certifications": None,
+}
+FUSED_FIELDS = dict(ANALYSIS_FIELDS, work_experience=EXPERIENCE_FIELDS)
+
+TAILORED_EXPERIENCE_SCHEMA = (
+    '[{"company":"Company Name","title":"Job Title","dates":"Start Date - End Date",'
+    '"original_bullets":["Original bullet"],"tailored_bullets":["Tailored bullet"]}]'
+)
+ANALYSIS_SCHEMA = (
+    '{"experience_matches":[{"job_requirement":"requirement from job description",'
+    '"matching_experience":"relevant experience from resume","tailored_response":"tailored response highlighting the match"}],'
+    '"skill_matches":[{"required_skill":"skill from job description","matching_skill":"skill from resume",'
+    '"evidence":"example of skill usage from experience"}],'
+    '"education_matches":[{"requirement":"education requirement from job description",'
+    '"qualification":"matching education from resume","relevance":"explanation of relevance"}],'
+    '"additional_qualifications":["additional qualification from resume that could be relevant"]}'
+)
+RESPONSES_SCHEMA = "{" + ",".join(f'"{field}":"response"' for field in APPLICATION_RESPONSE_FIELDS) + "}"
+
+TAILOR_RULES = (
+    "For each work experience, tailor the bullet points to the job description: maintain the original "
+    "achievements and metrics, slightly rephrase to emphasize skills mentioned in the job description, keep "
+    "the same level of detail and specificity, don't add or remove any major responsibilities, and don't "
+    "change any dates, company names, or job titles."
+)
+
+TAILOR_SYSTEM_PROMPT = "You are an expert at tailoring resume bullet points to match job descriptions while preserving the core content and achievements. Return the response in valid JSON format."
+EXPERIENCE_PREFIX = """Tailor the bullet points of the work experience below to the job requirements. Maintain the original achievements and metrics, slightly rephrase to emphasize skills mentioned in the requirements, keep the same level of detail and specificity, and don't add or remove any major responsibilities.
+Return JSON with this structure:
+{"tailored_bullets":["Tailored bullet"]}
+"""
+
+ANALYSIS_SYSTEM_PROMPT = "You are an expert job application analyzer that matches resumes to job descriptions. Return the response in valid JSON format."
+ANALYSIS_PREFIX = f"""Match the resume below to the job description for a Workday application, focusing on skills, experiences, and qualifications.
+Return JSON with this structure:
+{ANALYSIS_SCHEMA}
+"""
+
+RESPONSES_SYSTEM_PROMPT = "You are an expert at crafting professional job application responses. Return the response in valid JSON format."
+RESPONSES_PREFIX = f"""Based on the analysis below, write concise, professional responses for a Workday application form that highlight the best matches.
+Return a JSON object with these fields as keys:
+{RESPONSES_SCHEMA}
+"""
+
+FUSED_SYSTEM_PROMPT = "You are an expert job application assistant that tailors resumes, matches them to job descriptions and writes application responses. Return the response in valid JSON format."
+FUSED_PREFIX = f"""Complete three tasks in a single JSON response.
+Task 1 - tailored_experience: {TAILOR_RULES}
+Task 2 - analysis: match skills, experiences, and qualifications from the tailored resume to the job.
+Task 3 - application_responses: using the analysis, write concise, professional responses for a Workday application form, one per field.
+Return ONLY a JSON object with this structure:
+{{"tailored_experience":{TAILORED_EXPERIENCE_SCHEMA},"analysis":{ANALYSIS_SCHEMA},"application_responses":{RESPONSES_SCHEMA}}}
+"""
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 bytes per token), good enough for quotas and savings reports."""
+    return len(text.encode("utf-8")) // 4 + 1
+
+def _load(value: Any) -> Any:
+    # parse_resume and the model calls hand back JSON text rather than dicts
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+def prune(value: Any) -> Any:
+    """Drop None, empty strings and empty containers, recursively."""
+    if isinstance(value, dict):
+        pruned = {key: prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        pruned = [prune(item) for item in value]
+        return [item for item in pruned if item not in (None, "", [], {})]
+    return value
+
+def compact_json(value: Any) -> str:
+    """Serialize to canonical minimal JSON: sorted keys, no whitespace, no empty fields."""
+    return json.dumps(prune(_load(value)), separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+def project_resume(resume_data: Any, fields: Dict[str, Optional[Tuple[str, ...]]]) -> Dict[str, Any]:
+    """Keep only the resume sections in fields, and within list sections only the named keys."""
+    resume = _load(resume_data)
+    if not isinstance(resume, dict):
+        return resume
+    projected = {}
+    for section, keys in fields.items():
+        value = resume.get(section)
+        if keys is not None and isinstance(value, list):
+            value = [{key: item[key] for key in keys if key in item} if isinstance(item, dict) else item
+                     for item in value]
+        projected[section] = value
+    return projected
+
+def _report(stage: str, raw: Any, compacted: str, prompt: str):
+    """Record the prompt size and the tokens saved against interpolating the raw value."""
+    if not telemetry.enabled():
+        return
+    telemetry.inc("prompt_tokens_total", estimate_tokens(prompt), stage=stage)
+    telemetry.inc("prompt_tokens_saved_total", max(0, estimate_tokens(str(raw)) - estimate_tokens(compacted)), stage=stage)
+
+def experience_prompt(requirements: List[str], experience: Dict[str, Any]) -> Tuple[str, str]:
+    """Prompt to tailor one work experience; the requirements precede it so entries for one posting share a prefix."""
+    compacted = compact_json({key: experience[key] for key in EXPERIENCE_FIELDS if key in experience})
+    listed = "\n".join(f"- {requirement}" for requirement in requirements)
+    prompt = f"{EXPERIENCE_PREFIX}\nJob Requirements:\n{listed}\n\nExperience:\n{compacted}\n"
+    _report("tailor_experience", experience, compacted, prompt)
+    return prompt, TAILOR_SYSTEM_PROMPT
+
+def analysis_prompt(job_description: str, resume_data: Any) -> Tuple[str, str]:
+    resume = compact_json(project_resume(resume_data, ANALYSIS_FIELDS))
+    prompt = f"{ANALYSIS_PREFIX}\nJob Description:\n{job_description.strip()}\n\nResume:\n{resume}\n"
+    _report("analyze_job", resume_data, resume, prompt)
+    return prompt, ANALYSIS_SYSTEM_PROMPT
+
+def responses_prompt(analysis: Any) -> Tuple[str, str]:
+    compacted = compact_json(analysis)
+    prompt = f"{RESPONSES_PREFIX}\nAnalysis:\n{compacted}\n"
+    _report("generate_responses", analysis, compacted, prompt)
+    return prompt, RESPONSES_SYSTEM_PROMPT
+
+def fused_prompt(job_description: str, resume_data: Any) -> Tuple[str, str]:
+    resume = compact_json(project_resume(resume_data, FUSED_FIELDS))
+    prompt = f"{FUSED_PREFIX}\nJob Description:\n{job_description.strip()}\n\nResume:\n{resume}\n"
+    _report("analyze_application", resume_data, resume, prompt)
+    return prompt, FUSED_SYSTEM_PROMPT
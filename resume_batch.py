@@ -0,0 +1,97 @@
+"""Bulk resume ingestion: parse thousands of resumes into one JSONL file.
+
+Text is extracted in a process pool while up to `concurrency` model calls run on one event
+loop, in the batch priority lane. Each finished resume is appended to the output as
+{"id": <sha256 of the file>, "path", "data", "error", "seconds"}. Files whose content hash
+already has a successful record are skipped, so rerunning after an interruption resumes the
+backfill and duplicate files are parsed once.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional
+from ai_scheduler import BATCH, priority
+from checkpoint import Checkpoint
+import models
+from resume_parser import RESUME_EXTENSIONS, ResumeParser, extract_resume_text, get_resume_parser, hash_source
+
+def iter_resume_paths(paths: Iterable[str] = (), manifest: Optional[str] = None) -> Iterator[str]:
+    """Yield resume files from files/directories (walked recursively) and a manifest of one path per line."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+    if manifest:
+        with open(manifest) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+async def ingest_resumes(paths: Iterable[str], output_path: str, workers: int = os.cpu_count() or 1,
+                         concurrency: int = 8, parser: Optional[ResumeParser] = None,
+                         progress_every: int = 50) -> Dict[str, Any]:
+    """Parse every resume in paths into output_path, returning counts and throughput."""
+    checkpoint = Checkpoint(output_path)
+    parser = parser or get_resume_parser()
+    loop = asyncio.get_running_loop()
+    stats = {"processed": 0, "skipped": 0, "failed": 0}
+    seen = set()
+    model_calls = asyncio.Semaphore(concurrency)
+    # Bounds the tasks alive at once so a huge manifest is not materialized up front
+    in_flight = asyncio.Semaphore(concurrency + workers)
+    start = time.perf_counter()
+
+    def report():
+        elapsed = time.perf_counter() - start
+        finished = stats["processed"] + stats["failed"]
+        print(f"{finished} done ({stats['failed']} failed), {stats['skipped']} skipped, "
+              f"{finished / elapsed if elapsed else 0.0:.2f} files/sec")
+
+    async def ingest(path: str, pool: ProcessPoolExecutor):
+        record = {"id": None, "path": path, "data": None, "error": None}
+        began = time.perf_counter()
+        try:
+            record["id"] = await loop.run_in_executor(None, hash_source, path)
+            if record["id"] in checkpoint or record["id"] in seen:
+                stats["skipped"] += 1
+                return
+            seen.add(record["id"])
+
+            text = await loop.run_in_executor(pool, extract_resume_text, path)
+            if not text.strip():
+                raise ValueError("No text could be extracted")
+            async with model_calls:
+                with priority(BATCH):
+                    response = await parser.aanalyze_resume(text)
+            record["data"] = models.Resume.from_json(response).to_dict()
+            stats["processed"] += 1
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            stats["failed"] += 1
+        record["seconds"] = round(time.perf_counter() - began, 3)
+        await loop.run_in_executor(None, checkpoint.record, record)
+        if (stats["processed"] + stats["failed"]) % progress_every == 0:
+            report()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = set()
+        for path in paths:
+            await in_flight.acquire()
+            task = asyncio.ensure_future(ingest(path, pool))
+            task.add_done_callback(lambda _: in_flight.release())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = elapsed
+    stats["files_per_second"] = (stats["processed"] + stats["failed"]) / elapsed if elapsed else 0.0
+    return stats
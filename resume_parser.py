@@ -1,82 +1,256 @@
-import pdfplumber
-from docx import Document
-from typing import Dict, Any
-import os
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Any, Optional, Union
+import asyncio
+import contextvars
+import hashlib
+import json
+import threading
+from settings import settings
 from ai_provider import get_ai_provider
+from cache import TieredCache, make_cache_key
+from docx_extractor import extract_docx_text
+from pdf_extractor import extract_pdf_text
+from resume_preextract import preextract
+import json_repair
+import models
+import telemetry
 
-load_dotenv()
+# Static instructions and schema first so the prefix is identical across resumes; the text goes last
+RESUME_PROMPT_TEMPLATE = (
+    "Analyze the following resume and extract information in this JSON format:\n"
+    '{{"personal_information":{{"name":"Full Name","email":"email@example.com","phone":"phone number",'
+    '"location":"city, state"}},'
+    '"work_experience":[{{"company":"Company Name","title":"Job Title","dates":"Start Date - End Date",'
+    '"responsibilities":["Responsibility 1"]}}],'
+    '"education":[{{"institution":"School Name","degree":"Degree Name","dates":"Start Date - End Date"}}],'
+    '"skills":["Skill 1"],"projects":[{{"name":"Project Name","description":"Project Description"}}],'
+    '"certifications":["Certification 1"]}}\n'
+    "Return ONLY the JSON object, with no additional text or explanation.\n\n"
+    "Resume text:\n{text}\n"
+)
+
+RESUME_SYSTEM_PROMPT = "You are a resume parser that extracts structured information from resumes. Return ONLY a valid JSON object matching the exact format specified, with no additional text or explanation."
+
+# Per-section prompts used once preextract has filled in contact details, skills and certifications
+SECTION_SCHEMAS = {
+    "work_experience": '[{{"company":"Company Name","title":"Job Title","dates":"Start Date - End Date",'
+                       '"responsibilities":["Responsibility 1"]}}]',
+    "education": '[{{"institution":"School Name","degree":"Degree Name","dates":"Start Date - End Date"}}]',
+    "projects": '[{{"name":"Project Name","description":"Project Description"}}]',
+}
+SECTION_SYSTEM_PROMPT = "You extract resume sections into JSON. Return ONLY a valid JSON object in the given format."
+SECTION_PROMPT_TEMPLATES = {
+    section: (
+        f"Extract this {section.replace('_', ' ')} section, copying dates as written:\n"
+        f'{{{{"{section}":{schema}}}}}\n\n'
+        "{text}\n"
+    )
+    for section, schema in SECTION_SCHEMAS.items()
+}
+SECTION_RECORDS = {"work_experience": models.Experience, "education": models.Education, "projects": models.Project}
+
+# Bump when text extraction output changes, so cached text and resume data are rebuilt
+EXTRACTION_VERSION = "2"
+
+# Any edit to the parsing prompts changes this and so invalidates cached resume data
+PROMPT_FINGERPRINT = make_cache_key(RESUME_PROMPT_TEMPLATE, RESUME_SYSTEM_PROMPT, SECTION_SYSTEM_PROMPT,
+                                    *(SECTION_PROMPT_TEMPLATES[section] for section in sorted(SECTION_PROMPT_TEMPLATES)))
+
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx')
+
+# A path, the raw bytes of an upload, or a binary file-like object such as a SpooledTemporaryFile
+ResumeSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+# PDF readers accept the %PDF- header anywhere in the first KB
+PDF_HEADER_WINDOW = 1024
+
+def _read_header(source: ResumeSource, size: int = PDF_HEADER_WINDOW) -> bytes:
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read(size)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:size])
+    position = source.tell()
+    try:
+        return source.read(size)
+    finally:
+        source.seek(position)
+
+def detect_format(source: ResumeSource) -> str:
+    """Identify a resume as "pdf", "docx" or legacy "doc" from its magic bytes, whatever its name."""
+    header = _read_header(source)
+    if header.startswith(ZIP_MAGIC):
+        return "docx"
+    if header.startswith(OLE_MAGIC):
+        return "doc"
+    if b"%PDF-" in header:
+        return "pdf"
+    raise ValueError("Unsupported file format. Please use PDF or DOCX.")
+
+def resume_format(source: ResumeSource) -> str:
+    """detect_format, rejecting formats there is no extractor for."""
+    file_format = detect_format(source)
+    if file_format == "doc":
+        raise ValueError("Legacy Word .doc files are not supported. Please save the resume as DOCX or PDF.")
+    return file_format
+
+def hash_source(source: ResumeSource) -> str:
+    """SHA-256 of the resume content, read in blocks; file-like sources are left where they were."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, str):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        position = source.tell()
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+def extract_resume_text(source: ResumeSource, pdf_workers: int = 1) -> str:
+    """Extract plain text from a PDF or DOCX resume; a plain function so process pools can run it."""
+    if resume_format(source) == "pdf":
+        return extract_pdf_text(source, workers=pdf_workers)
+    return extract_docx_text(source)
+
+_caches: Dict[str, TieredCache] = {}
+_caches_lock = threading.Lock()
+
+def _get_cache(table: str) -> TieredCache:
+    """Return the shared parsed-resume cache for the given layer."""
+    with _caches_lock:
+        if table not in _caches:
+            _caches[table] = TieredCache(
+                max_entries=settings.get_int("RESUME_CACHE_SIZE", 128),
+                ttl=settings.get_float("RESUME_CACHE_TTL"),
+                db_path=settings.get("RESUME_CACHE_PATH") or None,
+                table=table,
+            )
+        return _caches[table]
+
+_parsers: Dict[Optional[str], "ResumeParser"] = {}
+_parsers_lock = threading.Lock()
+
+def get_resume_parser(ai_provider_name: Optional[str] = None) -> "ResumeParser":
+    """Return the process-wide ResumeParser for ai_provider_name, creating it on first use."""
+    with _parsers_lock:
+        if ai_provider_name not in _parsers:
+            _parsers[ai_provider_name] = ResumeParser(ai_provider_name)
+        return _parsers[ai_provider_name]
 
 class ResumeParser:
-    def __init__(self, ai_provider_name: str = "google"):
-        self.ai_provider = get_ai_provider()
+    def __init__(self, ai_provider_name: Optional[str] = None, text_cache: Optional[TieredCache] = None,
+                 data_cache: Optional[TieredCache] = None):
+        self.ai_provider = get_ai_provider(ai_provider_name)
+        self.text_cache = text_cache if text_cache is not None else _get_cache("resume_text")
+        self.data_cache = data_cache if data_cache is not None else _get_cache("resume_data")
+        self.preextract = settings.get_bool("RESUME_PREEXTRACT", True)
+
+    def parse_resume(self, source: ResumeSource) -> Dict[str, Any]:
+        """Parse a PDF or DOCX resume and extract structured information.
+
+        source may be a path, the bytes of an upload or a binary file-like object; the format is
+        detected from the content, not the file name.
+        """
+        file_format = resume_format(source)
+        extract = self._extract_from_pdf if file_format == "pdf" else self._extract_from_docx
+        file_hash = hash_source(source)
+        text_key = make_cache_key(file_hash, EXTRACTION_VERSION)
+
+        data_key = make_cache_key(text_key, PROMPT_FINGERPRINT, str(self.preextract), self.ai_provider.api_url)
+        resume_data = self.data_cache.get(data_key)
+        telemetry.inc("cache_requests_total", cache="resume_data", result="miss" if resume_data is None else "hit")
+        if resume_data is not None:
+            return resume_data
 
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
-        """Parse resume from PDF or DOCX file and extract structured information."""
-        if file_path.endswith('.pdf'):
-            text = self._extract_from_pdf(file_path)
-        elif file_path.endswith(('.doc', '.docx')):
-            text = self._extract_from_docx(file_path)
-        else:
-            raise ValueError("Unsupported file format. Please use PDF or DOC/DOCX.")
+        text = self.text_cache.get(text_key)
+        telemetry.inc("cache_requests_total", cache="resume_text", result="miss" if text is None else "hit")
+        if text is None:
+            with telemetry.span("resume.extract", format=file_format) as current:
+                text = extract(source)
+                current.set("characters", len(text))
+            self.text_cache.set(text_key, text)
 
-        return self._analyze_resume(text)
+        with telemetry.span("resume.analyze"):
+            resume_data = self._analyze_resume(text)
+        self.data_cache.set(data_key, resume_data)
+        return resume_data
 
-    def _extract_from_pdf(self, file_path: str) -> str:
+    def _extract_from_pdf(self, source: ResumeSource) -> str:
         """Extract text from PDF file."""
-        text = ""
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
+        return extract_resume_text(source, pdf_workers=settings.get_int("PDF_EXTRACT_WORKERS", 1))
 
-    def _extract_from_docx(self, file_path: str) -> str:
+    def _extract_from_docx(self, source: ResumeSource) -> str:
         """Extract text from DOCX file."""
-        doc = Document(file_path)
-        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        return extract_resume_text(source)
+
+    def _preextract(self, text: str) -> Optional[Dict[str, Any]]:
+        if not self.preextract:
+            return None
+        with telemetry.span("resume.preextract") as current:
+            extracted = preextract(text)
+            current.set("sections", ",".join(extracted["sections"]) if extracted else "")
+        return extracted
+
+    @staticmethod
+    def _merge_sections(extracted: Dict[str, Any], responses: Dict[str, str]) -> Optional[str]:
+        """Fold the per-section model responses into the pre-extracted data, or None if any is unusable."""
+        resume_data = extracted["resume"]
+        for section, response in responses.items():
+            try:
+                items = json_repair.loads(response).get(section)
+                if not isinstance(items, list):
+                    raise ValueError(f"{section}: expected a list")
+                resume_data[section] = [item.to_dict() for item in models.parse_list(SECTION_RECORDS[section], items, section)]
+            except (ValueError, AttributeError):
+                print(f"Section {section} returned an invalid response, parsing the whole resume instead")
+                return None
+        return json.dumps(resume_data)
 
     def _analyze_resume(self, text: str) -> Dict[str, Any]:
-        """Analyze resume text using AI to extract structured information."""
-        prompt = f"""
-        Analyze the following resume and extract information in the following JSON format:
-        {{
-            "personal_information": {{
-                "name": "Full Name",
-                "email": "email@example.com",
-                "phone": "phone number",
-                "location": "city, state"
-            }},
-            "work_experience": [
-                {{
-                    "company": "Company Name",
-                    "title": "Job Title",
-                    "dates": "Start Date - End Date",
-                    "responsibilities": ["Responsibility 1", "Responsibility 2"]
-                }}
-            ],
-            "education": [
-                {{
-                    "institution": "School Name",
-                    "degree": "Degree Name",
-                    "dates": "Start Date - End Date"
-                }}
-            ],
-            "skills": ["Skill 1", "Skill 2"],
-            "projects": [
-                {{
-                    "name": "Project Name",
-                    "description": "Project Description"
-                }}
-            ],
-            "certifications": ["Certification 1", "Certification 2"]
-        }}
-
-        Resume text:
-        {text}
-
-        Return ONLY the JSON object, with no additional text or explanation.
+        """Analyze resume text using AI to extract structured information.
+
+        Fields the text states literally are extracted locally; the remaining sections are sent as
+        smaller parallel calls. Resumes without recognizable sections go to the model whole.
         """
+        extracted = self._preextract(text)
+        if extracted is not None:
+            sections = extracted["sections"]
+            with ThreadPoolExecutor(max_workers=max(1, len(sections))) as pool:
+                futures = {
+                    section: pool.submit(contextvars.copy_context().run, self.ai_provider.generate_response,
+                                         SECTION_PROMPT_TEMPLATES[section].format(text=section_text),
+                                         SECTION_SYSTEM_PROMPT)
+                    for section, section_text in sections.items()
+                }
+                responses = {section: future.result() for section, future in futures.items()}
+            resume_data = self._merge_sections(extracted, responses)
+            if resume_data is not None:
+                return resume_data
+
+        prompt = RESUME_PROMPT_TEMPLATE.format(text=text)
+
+        return self.ai_provider.generate_response(prompt, RESUME_SYSTEM_PROMPT)
+
+    async def aanalyze_resume(self, text: str) -> str:
+        """Async variant of _analyze_resume, for callers running many analyses on one event loop."""
+        extracted = self._preextract(text)
+        if extracted is not None:
+            sections = extracted["sections"]
+            responses = await asyncio.gather(*(
+                self.ai_provider.agenerate_response(SECTION_PROMPT_TEMPLATES[section].format(text=section_text),
+                                                    SECTION_SYSTEM_PROMPT)
+                for section, section_text in sections.items()
+            ))
+            resume_data = self._merge_sections(extracted, dict(zip(sections, responses)))
+            if resume_data is not None:
+                return resume_data
 
-        system_prompt = "You are a resume parser that extracts structured information from resumes. Return ONLY a valid JSON object matching the exact format specified, with no additional text or explanation."
+        prompt = RESUME_PROMPT_TEMPLATE.format(text=text)
 
-        return self.ai_provider.generate_response(prompt, system_prompt) 
\ No newline at end of file
+        return await self.ai_provider.agenerate_response(prompt, RESUME_SYSTEM_PROMPT)
@@ -0,0 +1,181 @@
+"""Deterministic local extraction from resume text, run before any model call.
+
+Compiled regexes pull contact details out of the header, a heading matcher splits the text into
+sections, bullets are rejoined across PDF line wraps and date ranges are normalized. Skills and
+certifications are plain lists, so they are parsed here too; only the sections that need
+interpretation (experience, education, projects) are left for the model.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+URL = re.compile(r"(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+(?:com|org|net|io|dev|edu|me|ai|co)(?:/[^\s|,;]*)?",
+                 re.IGNORECASE)
+LOCATION = re.compile(r"\b[A-Z][A-Za-z.]*(?: [A-Z][A-Za-z.]*)*, (?:[A-Z]{2}|[A-Z][a-z]+)\b")
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?(?:19|20)\d{{2}}|{MONTH}"
+DATE_RANGE = re.compile(rf"({DATE})\s*(?:[-–—]|to)\s*({DATE}|Present|Current|Now)", re.IGNORECASE)
+BULLET = re.compile(r"^\s*[•▪●◦‣∙*]\s*|^\s*[-–]\s+")
+# "Languages: Java, Python" style labels inside skills sections
+LABEL = re.compile(r"^[A-Za-z/& ]{2,30}:\s*")
+
+SECTION_HEADINGS = {
+    "work_experience": ("experience", "work experience", "professional experience", "employment",
+                        "employment history", "work history", "relevant experience"),
+    "education": ("education", "academic background", "education and training"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies", "skills and technologies"),
+    "projects": ("projects", "personal projects", "selected projects", "academic projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications",
+                       "licenses & certifications", "certifications and awards"),
+    "summary": ("summary", "profile", "objective", "professional summary", "about me"),
+}
+_HEADINGS = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Headings of sections the resume schema has no place for; their text is set aside as "other"
+# instead of running on into the section above them
+OTHER_SECTION = "other"
+OTHER_HEADING_WORDS = frozenset((
+    "awards", "honors", "honours", "achievements", "accomplishments", "publications", "patents",
+    "presentations", "volunteer", "volunteering", "leadership", "languages", "interests", "hobbies",
+    "activities", "involvement", "extracurriculars", "references", "affiliations", "memberships",
+    "coursework", "courses", "research", "service", "information",
+))
+HEADING_SHAPE = re.compile(r"[A-Za-z][A-Za-z&/ ]{0,40}")
+
+# Sections the model still has to structure
+MODEL_SECTIONS = ("work_experience", "education", "projects")
+
+def section_heading(line: str) -> Optional[str]:
+    """Return the section a heading line starts, or None if the line is not a heading.
+
+    Headings outside SECTION_HEADINGS ("Awards", "VOLUNTEER EXPERIENCE") start OTHER_SECTION.
+    """
+    normalized = " ".join(line.strip().rstrip(":").lower().split())
+    if normalized in _HEADINGS:
+        return _HEADINGS[normalized]
+    words = normalized.split()
+    if not HEADING_SHAPE.fullmatch(normalized) or len(words) > 4:
+        return None
+    # Judged by the last word so a job title such as "Research Assistant" stays body text
+    if words[-1] in OTHER_HEADING_WORDS or (words[-1] == "experience" and words[0] in OTHER_HEADING_WORDS):
+        return OTHER_SECTION
+    return None
+
+def segment_sections(text: str) -> Dict[str, str]:
+    """Split resume text into {"header": ..., section: text} on headings; repeated headings are merged.
+
+    Text under headings the schema has no section for is collected under OTHER_SECTION, which is
+    neither parsed locally nor sent to the model.
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        section = section_heading(line)
+        if section is not None:
+            current = section
+            sections.setdefault(current, [])
+        elif line.strip():
+            sections[current].append(line.rstrip())
+    return {section: "\n".join(lines) for section, lines in sections.items()}
+
+def split_bullets(text: str) -> List[str]:
+    """Return one line per bullet, joining the wrapped continuation lines PDF extraction leaves behind."""
+    items: List[str] = []
+    in_bullet = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            in_bullet = False
+            continue
+        if BULLET.match(line):
+            items.append(BULLET.sub("", line).strip())
+            in_bullet = True
+        elif in_bullet and items and (stripped[0].islower() or not items[-1].endswith((".", "%"))):
+            items[-1] = f"{items[-1]} {stripped}"
+        else:
+            items.append(stripped)
+            in_bullet = False
+    return items
+
+def normalize_dates(line: str) -> str:
+    """Rewrite every date range as "Start - End" so the model can copy it verbatim."""
+    return DATE_RANGE.sub(lambda match: f"{match.group(1)} - {match.group(2)}", line)
+
+def normalize_section(text: str) -> str:
+    """Section text with wrapped bullets rejoined and date ranges normalized, as sent to the model."""
+    lines = []
+    for line in map(normalize_dates, text.splitlines()):
+        if BULLET.match(line):
+            lines.append("- " + BULLET.sub("", line).strip())
+        elif lines and lines[-1].startswith("- ") and line.strip()[:1].islower():
+            lines[-1] = f"{lines[-1]} {line.strip()}"
+        else:
+            lines.append(line.strip())
+    return "\n".join(line for line in lines if line)
+
+def personal_information(header: str) -> Dict[str, Any]:
+    """Name, email, phone, location and links from the text above the first section heading."""
+    emails = EMAIL.findall(header)
+    without_emails = EMAIL.sub(" ", header)
+    phones = PHONE.findall(without_emails)
+    links = [match.rstrip(".") for match in URL.findall(without_emails)]
+    info: Dict[str, Any] = {
+        "name": "",
+        "email": emails[0] if emails else "",
+        "phone": phones[0].strip() if phones else "",
+        "location": "",
+    }
+    for line in header.splitlines():
+        remainder = URL.sub(" ", PHONE.sub(" ", EMAIL.sub(" ", line)))
+        if not info["name"] and line == remainder and line.strip() and len(line.split()) <= 5 \
+                and not LOCATION.fullmatch(line.strip()):
+            info["name"] = line.strip()
+            continue
+        location = LOCATION.search(remainder)
+        if not info["location"] and location:
+            info["location"] = location.group(0)
+    if links:
+        info["links"] = links
+    return info
+
+def parse_list_section(text: str) -> List[str]:
+    """Skills-style section to a flat list: labels dropped, split on commas and bullets outside parentheses."""
+    items: List[str] = []
+    for line in split_bullets(text):
+        line = LABEL.sub("", line)
+        depth, start = 0, 0
+        for index, char in enumerate(line + ","):
+            if char in "([":
+                depth += 1
+            elif char in ")]":
+                depth = max(0, depth - 1)
+            elif char in ",;|" and depth == 0:
+                item = line[start:index].strip(" .")
+                if item:
+                    items.append(item)
+                start = index + 1
+    return list(dict.fromkeys(items))
+
+def preextract(text: str) -> Optional[Dict[str, Any]]:
+    """Extract what the resume states literally and collect the sections left for the model.
+
+    Returns {"resume": partial resume data, "sections": {section: normalized text}}, or None when
+    no experience or education heading is recognized and the whole text should go to the model.
+    """
+    sections = segment_sections(text)
+    if not any(section in sections for section in ("work_experience", "education")):
+        return None
+    resume = {
+        "personal_information": personal_information(sections["header"]),
+        "work_experience": [],
+        "education": [],
+        "skills": parse_list_section(sections.get("skills", "")),
+        "projects": [],
+        "certifications": split_bullets(sections.get("certifications", "")),
+    }
+    return {
+        "resume": resume,
+        "sections": {section: normalize_section(sections[section])
+                     for section in MODEL_SECTIONS if sections.get(section)},
+    }
@@ -0,0 +1,31 @@
+"""Process-wide configuration.
+
+.env is loaded once, on first import of this module, and every module reads its settings
+through the shared `settings` object instead of calling load_dotenv itself. Values are looked
+up when read, so scripts that set os.environ before first use still take effect.
+"""
+import os
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class Settings:
+    """Accessors over the environment; the typed ones treat unset and empty values as the default."""
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return os.getenv(name, default)
+
+    def get_int(self, name: str, default: int) -> int:
+        value = os.getenv(name)
+        return int(value) if value else default
+
+    def get_float(self, name: str, default: Optional[float] = None) -> Optional[float]:
+        value = os.getenv(name)
+        return float(value) if value else default
+
+    def get_bool(self, name: str, default: bool) -> bool:
+        value = os.getenv(name)
+        return value == "1" if value else default
+
+settings = Settings()
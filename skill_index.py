@@ -0,0 +1,291 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Canonical skill -> aliases that should be treated as the same skill
+SKILL_SYNONYMS: Dict[str, List[str]] = {
+    "python": ["python3"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "java": [],
+    "go": ["golang"],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "sql": ["structured query language"],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "mongodb": ["mongo"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "docker": ["containers", "containerization"],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ci/cd": ["continuous integration", "continuous delivery", "continuous deployment", "cicd"],
+    "react": ["react.js", "reactjs"],
+    "node.js": ["nodejs"],
+    "fastapi": [],
+    "django": [],
+    "flask": [],
+    "rest api": ["restful", "rest apis", "restful apis", "api development"],
+    "graphql": [],
+    "machine learning": [],
+    "deep learning": ["neural networks"],
+    "natural language processing": ["nlp"],
+    "artificial intelligence": [],
+    "tensorflow": [],
+    "pytorch": [],
+    "pandas": [],
+    "numpy": [],
+    "spark": ["apache spark", "pyspark"],
+    "kafka": ["apache kafka"],
+    "airflow": ["apache airflow"],
+    "data pipelines": ["data pipeline", "etl", "elt"],
+    "linux": ["unix"],
+    "git": ["version control"],
+    "agile": ["scrum", "kanban"],
+    "microservices": ["microservice", "service oriented architecture", "soa"],
+}
+
+# Aliases that are also ordinary words ("go the extra mile", "at rest") or too short to be unambiguous
+# in any case; they only count when written exactly like this
+CASE_SENSITIVE_ALIASES: Dict[str, List[str]] = {
+    "go": ["Go"],
+    "typescript": ["TS"],
+    "node.js": ["Node"],
+    "rest api": ["REST"],
+    "machine learning": ["ML"],
+    "artificial intelligence": ["AI"],
+}
+
+YEARS_OF_EXPERIENCE = re.compile(r"\b\d+\+?\s*(?:-\s*\d+\s*)?years?\b", re.IGNORECASE)
+REQUIREMENT_CUES = re.compile(
+    r"\b(experience|experienced|proficien\w*|familiar\w*|knowledge|understanding|expertise|ability|"
+    r"required|requires?|preferred|must|should)\b", re.IGNORECASE
+)
+EDUCATION_TERMS = re.compile(r"\b(bachelor'?s?|master'?s?|ph\.?d|b\.?s\.?|m\.?s\.?|degree|diploma|mba)\b", re.IGNORECASE)
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./_-]*")
+_REQUIREMENT_SPLIT = re.compile(r"(?:\n|[•·▪●*]\s|(?<=[.;!?])\s+)")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we with you your will "
+    "who this that should must can able ability experience strong knowledge skills working work years "
+    "plus ideal candidate including".split()
+)
+
+class SkillVocabulary:
+    """Normalizes free text so every alias of a skill collapses to one canonical token.
+
+    With fold_case, the case-sensitive aliases match in any case too. Matching against a resume
+    needs the exact spelling to tell "Go" from "go", but text that is only compared with other
+    text normalized the same way (such as a posting's fingerprint) must not depend on case.
+    """
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None,
+                 case_sensitive: Optional[Dict[str, List[str]]] = None, fold_case: bool = False):
+        synonyms = synonyms or SKILL_SYNONYMS
+        case_sensitive = CASE_SENSITIVE_ALIASES if case_sensitive is None else case_sensitive
+        self.canonical: Dict[str, str] = {}
+        exact: Dict[str, str] = {}
+        for skill, aliases in case_sensitive.items():
+            for alias in aliases:
+                exact[alias] = skill
+                self.canonical[alias.lower()] = skill
+        if fold_case:
+            exact = {}
+        folded_exact = {alias.lower() for alias in exact}
+        for skill, aliases in synonyms.items():
+            for alias in [skill] + aliases:
+                if alias.lower() not in folded_exact:
+                    self.canonical[alias.lower()] = skill
+        # Longest aliases first so "google cloud platform" wins over "google cloud"
+        aliases = [alias for alias in self.canonical if alias not in folded_exact] + list(exact)
+        alternatives = [
+            f"(?-i:{re.escape(alias)})" if alias in exact else re.escape(alias)
+            for alias in sorted(aliases, key=len, reverse=True)
+        ]
+        self._pattern = re.compile(
+            r"(?<![\w+#/.])(" + "|".join(alternatives) + r")(?![\w+#/])",
+            re.IGNORECASE
+        )
+
+    @staticmethod
+    def token(skill: str) -> str:
+        """The single index token used for a canonical skill."""
+        return "skill_" + skill.replace(" ", "_")
+
+    def skills(self, text: str) -> List[str]:
+        """Return the canonical skills mentioned in text, in order of first mention."""
+        found = dict.fromkeys(self.canonical[match.group(1).lower()] for match in self._pattern.finditer(text))
+        return list(found)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase, fold skill aliases into canonical tokens and drop stopwords."""
+        folded = self._pattern.sub(lambda match: " " + self.token(self.canonical[match.group(1).lower()]) + " ", text)
+        return [
+            token.rstrip(".")
+            for token in _TOKEN.findall(folded.lower())
+            if token.rstrip(".") not in _STOPWORDS and len(token.rstrip(".")) > 1
+        ]
+
+def split_requirements(job_description: str) -> List[str]:
+    """Split a job description into requirement-sized lines."""
+    parts = (part.strip(" -–\t") for part in _REQUIREMENT_SPLIT.split(job_description))
+    return [part for part in parts if len(part.split()) >= 3]
+
+def key_requirements(job_description: str, vocabulary: Optional[SkillVocabulary] = None) -> List[str]:
+    """Requirement lines that name a skill, a degree, years of experience or a requirement cue, in order and deduplicated.
+
+    Boilerplate such as company blurbs, locations and benefits is dropped, so reposts of the same
+    role yield the same list. Falls back to every requirement line when none qualify.
+    """
+    vocabulary = vocabulary or SkillVocabulary()
+    lines = list(dict.fromkeys(split_requirements(job_description)))
+    key_lines = [
+        line for line in lines
+        if vocabulary.skills(line) or EDUCATION_TERMS.search(line) or YEARS_OF_EXPERIENCE.search(line)
+        or REQUIREMENT_CUES.search(line)
+    ]
+    return key_lines or lines
+
+class ResumeIndex:
+    """Inverted index and BM25 weight matrix over the bullets of one parsed resume."""
+
+    def __init__(self, resume_data: Dict[str, Any], vocabulary: Optional[SkillVocabulary] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        self.resume_data = resume_data
+        self.vocabulary = vocabulary or SkillVocabulary()
+
+        # One document per bullet, remembering which role it came from
+        self.documents: List[Tuple[Dict[str, Any], str]] = []
+        for experience in resume_data.get("work_experience", []):
+            for bullet in experience.get("responsibilities", []):
+                self.documents.append((experience, bullet))
+        for project in resume_data.get("projects", []):
+            if project.get("description"):
+                self.documents.append(({"company": project.get("name", "Project"), "title": "Project"},
+                                       project["description"]))
+
+        tokenized = [self.vocabulary.tokenize(bullet) for _, bullet in self.documents]
+        self.terms: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        for doc_id, tokens in enumerate(tokenized):
+            for token in tokens:
+                self.terms.setdefault(token, len(self.terms))
+                doc_ids = self.postings.setdefault(token, [])
+                if not doc_ids or doc_ids[-1] != doc_id:
+                    doc_ids.append(doc_id)
+
+        # numpy is imported on first use so importing the API does not pay for it
+        import numpy as np
+        counts = np.zeros((len(self.documents), max(len(self.terms), 1)), dtype=np.float32)
+        for doc_id, tokens in enumerate(tokenized):
+            for token in tokens:
+                counts[doc_id, self.terms[token]] += 1
+
+        doc_count = max(len(self.documents), 1)
+        doc_freq = (counts > 0).sum(axis=0)
+        idf = np.log1p((doc_count - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        lengths = counts.sum(axis=1, keepdims=True)
+        norm = k1 * (1 - b + b * lengths / max(float(lengths.mean()) if lengths.size else 1.0, 1e-9))
+        # Precomputed per-term BM25 contribution, so scoring a query is a single matrix product
+        self.weights = (idf * counts * (k1 + 1) / (counts + norm)).astype(np.float32)
+
+        self.resume_skills = dict.fromkeys(
+            skill
+            for text in list(resume_data.get("skills", [])) + [bullet for _, bullet in self.documents]
+            for skill in self.vocabulary.skills(text)
+        )
+
+    def query_matrix(self, queries: List[List[str]]) -> "np.ndarray":
+        """Binary query-by-term matrix; terms the resume never uses are dropped."""
+        import numpy as np
+        matrix = np.zeros((len(queries), self.weights.shape[1]), dtype=np.float32)
+        for row, tokens in enumerate(queries):
+            for token in tokens:
+                column = self.terms.get(token)
+                if column is not None:
+                    matrix[row, column] = 1.0
+        return matrix
+
+    def score(self, queries: List[List[str]]) -> "np.ndarray":
+        """BM25 scores of every query against every bullet, shape (queries, bullets)."""
+        if not self.documents or not queries:
+            import numpy as np
+            return np.zeros((len(queries), len(self.documents)), dtype=np.float32)
+        return self.query_matrix(queries) @ self.weights.T
+
+    def _evidence(self, skill: str) -> str:
+        for doc_id in self.postings.get(self.vocabulary.token(skill), []):
+            return self.documents[doc_id][1]
+        return ""
+
+    def _education_matches(self, requirements: List[str]) -> List[Dict[str, str]]:
+        education_requirements = [line for line in requirements if EDUCATION_TERMS.search(line)]
+        matches = []
+        for requirement in education_requirements:
+            for education in self.resume_data.get("education", []):
+                matches.append({
+                    "requirement": requirement,
+                    "qualification": f"{education.get('degree', '')}, {education.get('institution', '')}".strip(", "),
+                    "relevance": "Degree listed on resume matches the stated education requirement",
+                })
+        return matches
+
+    def _analysis(self, job_description: str, requirements: List[str], scores: "np.ndarray",
+                  min_score: float) -> Dict[str, Any]:
+        experience_matches = []
+        for row, requirement in enumerate(requirements):
+            if not self.documents:
+                break
+            best = int(scores[row].argmax())
+            if scores[row, best] < min_score:
+                continue
+            experience, bullet = self.documents[best]
+            experience_matches.append({
+                "job_requirement": requirement,
+                "matching_experience": f"{experience.get('title', '')} at {experience.get('company', '')}: {bullet}",
+                "tailored_response": bullet,
+            })
+
+        required_skills = self.vocabulary.skills(job_description)
+        skill_matches = [
+            {"required_skill": skill, "matching_skill": skill, "evidence": self._evidence(skill)}
+            for skill in required_skills if skill in self.resume_skills
+        ]
+
+        additional = [skill for skill in self.resume_skills if skill not in required_skills]
+        additional += list(self.resume_data.get("certifications", []))
+
+        return {
+            "experience_matches": experience_matches,
+            "skill_matches": skill_matches,
+            "education_matches": self._education_matches(requirements),
+            "additional_qualifications": additional,
+        }
+
+    def match_job(self, job_description: str, min_score: float = 1.0) -> Dict[str, Any]:
+        """Match one job description; same shape as JobAnalyzer.analyze_job_description."""
+        return self.match_many([job_description], min_score)[0]
+
+    def match_many(self, job_descriptions: Iterable[str], min_score: float = 1.0) -> List[Dict[str, Any]]:
+        """Match many job descriptions, scoring every requirement line of all of them in one product."""
+        job_descriptions = list(job_descriptions)
+        requirements = [split_requirements(description) for description in job_descriptions]
+        flat = [self.vocabulary.tokenize(line) for lines in requirements for line in lines]
+        scores = self.score(flat)
+
+        results = []
+        offset = 0
+        for description, lines in zip(job_descriptions, requirements):
+            results.append(self._analysis(description, lines, scores[offset:offset + len(lines)], min_score))
+            offset += len(lines)
+        return results
+
+    def skill_overlap(self, job_description: str) -> float:
+        """Fraction of the job's required skills the resume covers (0 when it names none)."""
+        required = self.vocabulary.skills(job_description)
+        if not required:
+            return 0.0
+        return sum(1 for skill in required if skill in self.resume_skills) / len(required)
@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import copy
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from concurrency import get_stage
+import telemetry
+
+# Called as on_complete(stage_name, output, duration_seconds) each time a stage finishes
+CompletionCallback = Callable[[str, Any, float], None]
+
+# Set once the run a stage belongs to has failed; read through check_cancelled()
+_cancelled: contextvars.ContextVar = contextvars.ContextVar("stage_cancelled", default=None)
+
+class StageCancelled(Exception):
+    """Raised inside a stage whose run has already failed."""
+
+def check_cancelled():
+    """Raise StageCancelled if the current stage's run has failed.
+
+    A thread cannot be interrupted mid-call, so stages with several blocking steps (browser
+    login, fill, submit) call this between them to stop after a sibling stage failed.
+    """
+    event = _cancelled.get()
+    if event is not None and event.is_set():
+        raise StageCancelled("Pipeline run was cancelled")
+
+class Stage:
+    __slots__ = ("name", "func", "deps", "executor")
+
+    def __init__(self, name: str, func: Callable, deps: Tuple[str, ...], executor: str):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.executor = executor
+
+class StageGraph:
+    """Dependency graph of pipeline stages that runs independent stages concurrently.
+
+    Each stage is called with its dependencies' outputs as keyword arguments. Every consumer gets
+    its own deep copy of a stage output, so one stage mutating its input can never leak into
+    another stage. Raw inputs are passed through as-is; they may be open files such as uploads.
+
+    When a stage fails, cancellation is best effort: stages that have not started never run, and
+    running ones stop at their next check_cancelled(), but a blocking call already in progress
+    finishes first. run() returns only once those threads are done; arun() does not wait for them.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, func: Callable, deps: Iterable[str] = (), executor: str = "llm") -> "StageGraph":
+        self.stages[name] = Stage(name, func, tuple(deps), executor)
+        return self
+
+    def plan(self, available: Iterable[str], targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Return the stages that must run to produce targets, skipping outputs already available."""
+        available = set(available)
+        wanted = list(targets) if targets is not None else list(self.stages)
+        needed: Set[str] = set()
+
+        def visit(name: str):
+            if name in needed or name in available:
+                return
+            if name not in self.stages:
+                raise ValueError(f"No stage or input provides '{name}'")
+            needed.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+
+        for name in wanted:
+            visit(name)
+        # Keep declaration order so runs are deterministic
+        return [name for name in self.stages if name in needed]
+
+    def _ready(self, pending: Set[str], results: Dict[str, Any]) -> List[Stage]:
+        return [self.stages[name] for name in pending if all(dep in results for dep in self.stages[name].deps)]
+
+    def _kwargs(self, stage: Stage, results: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            dep: copy.deepcopy(results[dep]) if dep in self.stages else results[dep]
+            for dep in stage.deps
+        }
+
+    def run(self, results: Dict[str, Any], targets: Optional[Iterable[str]] = None,
+            on_complete: Optional[CompletionCallback] = None, max_workers: int = 4) -> Dict[str, Any]:
+        """Run the planned stages on a thread pool, adding each output to results."""
+        pending = set(self.plan(results, targets))
+        running = {}
+        cancelled = threading.Event()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                while pending or running:
+                    for stage in self._ready(pending, results):
+                        pending.discard(stage.name)
+                        running[pool.submit(contextvars.copy_context().run, self._timed, stage.name, stage.func,
+                                            self._kwargs(stage, results), cancelled)] = stage.name
+                    if not running:
+                        raise ValueError(f"Stages {sorted(pending)} have unsatisfiable dependencies")
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        output, duration = future.result()
+                        results[name] = output
+                        if on_complete:
+                            on_complete(name, output, duration)
+            finally:
+                # After a failure, stages that have not started yet never will; the pool waits for the rest
+                cancelled.set()
+                for future in running:
+                    future.cancel()
+        return results
+
+    async def arun(self, results: Dict[str, Any], targets: Optional[Iterable[str]] = None,
+                   on_complete: Optional[CompletionCallback] = None) -> Dict[str, Any]:
+        """Run the planned stages on their bounded stage executors without blocking the event loop."""
+        pending = set(self.plan(results, targets))
+        running = {}
+        cancelled = threading.Event()
+        try:
+            while pending or running:
+                for stage in self._ready(pending, results):
+                    pending.discard(stage.name)
+                    task = asyncio.ensure_future(get_stage(stage.executor).run(
+                        self._timed, stage.name, stage.func, self._kwargs(stage, results), cancelled
+                    ))
+                    running[task] = stage.name
+                if not running:
+                    raise ValueError(f"Stages {sorted(pending)} have unsatisfiable dependencies")
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    output, duration = task.result()
+                    results[name] = output
+                    if on_complete:
+                        on_complete(name, output, duration)
+        finally:
+            # After a failure (or cancellation), stop the sibling stages and retrieve their outcomes
+            cancelled.set()
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return results
+
+    @staticmethod
+    def _timed(name: str, func: Callable, kwargs: Dict[str, Any], cancelled: threading.Event) -> Tuple[Any, float]:
+        # Runs in a copied context, so this only scopes the event to this stage
+        _cancelled.set(cancelled)
+        check_cancelled()
+        start = time.perf_counter()
+        with telemetry.span(f"stage.{name}"):
+            output = func(**kwargs)
+        duration = time.perf_counter() - start
+        telemetry.observe("pipeline_stage_seconds", duration, stage=name)
+        return output, duration
@@ -0,0 +1,252 @@
+"""Local stand-in for the model APIs, used by load tests and benchmarks.
+
+Answers Gemini generateContent/streamGenerateContent, OpenAI /chat/completions and Anthropic
+/messages requests (streamed when the body sets "stream"), each in its own response shape.
+"""
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+MOCK_FORM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_workday_form.html")
+
+# One body that satisfies every prompt the pipeline sends
+CANNED_RESPONSE = {
+    "personal_information": {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "(555) 010-0000",
+        "location": "Austin, TX"
+    },
+    "work_experience": [
+        {
+            "company": "Acme Corp",
+            "title": "Software Engineer",
+            "dates": "Jan 2020 - Dec 2022",
+            "responsibilities": ["Built a data pipeline using Python", "Scaled an internal API on AWS"]
+        }
+    ],
+    "education": [
+        {"institution": "University of Texas at Austin", "degree": "B.S. Computer Science", "dates": "2016 - 2020"}
+    ],
+    "skills": ["Python", "AWS", "SQL"],
+    "projects": [],
+    "certifications": [],
+    "tailored_bullets": ["Built a Python data pipeline", "Scaled a Python API on AWS"],
+    "tailored_experience": [
+        {
+            "company": "Acme Corp",
+            "title": "Software Engineer",
+            "dates": "Jan 2020 - Dec 2022",
+            "original_bullets": ["Built a data pipeline using Python", "Scaled an internal API on AWS"],
+            "tailored_bullets": ["Built a Python data pipeline", "Scaled a Python API on AWS"]
+        }
+    ],
+    "experience_matches": [],
+    "skill_matches": [],
+    "education_matches": [],
+    "additional_qualifications": [],
+    "analysis": {
+        "experience_matches": [],
+        "skill_matches": [],
+        "education_matches": [],
+        "additional_qualifications": []
+    },
+    "application_responses": {
+        "Summary of Qualifications": "Python engineer with data pipeline experience.",
+        "Work Experience": "Software Engineer at Acme Corp.",
+        "Education": "B.S. Computer Science.",
+        "Skills": "Python, AWS, SQL",
+        "Additional Information": ""
+    }
+}
+
+class StubGeminiServer:
+    """Threaded HTTP server answering model API requests with configurable latency and failures.
+
+    Each request sleeps latency +/- jitter seconds, plus latency_per_kb per KB of request body and,
+    for a tail_rate fraction of requests, tail_latency more; a failure_rate fraction of requests is
+    answered with failure_status instead of a result. GET
+    /workday/... serves mock_workday_form.html so a real browser can run the Workday flow against
+    the same server.
+    """
+
+    def __init__(self, latency: float = 0.2, host: str = "127.0.0.1", port: int = 0,
+                 jitter: float = 0.0, failure_rate: float = 0.0, failure_status: int = 503, seed: int = 0,
+                 retry_delay: float = 0.0, response: Optional[Dict[str, Any]] = None, stream_chunks: int = 20,
+                 latency_per_kb: float = 0.0, tail_rate: float = 0.0, tail_latency: float = 0.0):
+        self.latency = latency
+        # Extra seconds per KB of request body, for prompts whose output grows with their input
+        self.latency_per_kb = latency_per_kb
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        # Returned as a google.rpc.RetryInfo hint on failures when set
+        self.retry_delay = retry_delay
+        self.response = response if response is not None else CANNED_RESPONSE
+        # Streamed responses spread the latency evenly over this many SSE events
+        self.stream_chunks = max(1, stream_chunks)
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json",
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if not self.path.startswith("/workday/"):
+                    self._send(404, b"{}")
+                    return
+                with open(MOCK_FORM_PATH, "rb") as f:
+                    self._send(200, f.read(), "text/html; charset=utf-8")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                api = "openai" if self.path.endswith("/chat/completions") else \
+                    "anthropic" if self.path.endswith("/messages") else "gemini"
+                text = json.dumps(server.response)
+                # Rough 4-bytes-per-token estimate, enough to exercise usage accounting
+                prompt_tokens, completion_tokens = length // 4, len(text) // 4
+                delay, fail = server._next_outcome()
+                delay += server.latency_per_kb * length / 1024
+                streaming = ":streamGenerateContent" in self.path or bool(request.get("stream"))
+                time.sleep(delay / server.stream_chunks if streaming else delay)
+                if fail:
+                    self._fail(api)
+                    return
+                slices = server._slices(text) if streaming else [text]
+                if api == "openai":
+                    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                             "total_tokens": prompt_tokens + completion_tokens}
+                    if not streaming:
+                        self._send(200, json.dumps({"choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+                                                    "usage": usage}).encode("utf-8"))
+                        return
+                    events = [{"choices": [{"index": 0, "delta": {"content": part}}]} for part in slices]
+                    events.append({"choices": [], "usage": usage})
+                    self._stream([f"data: {json.dumps(event)}" for event in events] + ["data: [DONE]"], delay)
+                elif api == "anthropic":
+                    if not streaming:
+                        self._send(200, json.dumps({
+                            "type": "message", "role": "assistant", "content": [{"type": "text", "text": text}],
+                            "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+                        }).encode("utf-8"))
+                        return
+                    events = [("message_start", {"type": "message_start",
+                                                 "message": {"usage": {"input_tokens": prompt_tokens, "output_tokens": 1}}})]
+                    events += [("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                        "delta": {"type": "text_delta", "text": part}}) for part in slices]
+                    events += [("message_delta", {"type": "message_delta", "usage": {"output_tokens": completion_tokens}}),
+                               ("message_stop", {"type": "message_stop"})]
+                    self._stream([f"event: {name}\ndata: {json.dumps(event)}" for name, event in events], delay)
+                else:
+                    usage = {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens,
+                             "totalTokenCount": prompt_tokens + completion_tokens}
+                    if not streaming:
+                        self._send(200, json.dumps({
+                            "candidates": [{"content": {"parts": [{"text": text}]}}],
+                            "usageMetadata": usage,
+                        }).encode("utf-8"))
+                        return
+                    events = [{"candidates": [{"content": {"parts": [{"text": part}]}}]} for part in slices]
+                    events[-1]["usageMetadata"] = usage
+                    self._stream([f"data: {json.dumps(event)}" for event in events], delay)
+
+            def _fail(self, api):
+                status = server.failure_status
+                headers = {"Retry-After": str(server.retry_delay)} if server.retry_delay else None
+                if api == "openai":
+                    body = {"error": {"message": "Stubbed failure", "type": "server_error", "code": None}}
+                elif api == "anthropic":
+                    body = {"type": "error", "error": {"type": "overloaded_error" if status == 529 else "api_error",
+                                                       "message": "Stubbed failure"}}
+                else:
+                    body = {"error": {"code": status, "message": "Stubbed failure", "status": "UNAVAILABLE"}}
+                    if server.retry_delay:
+                        body["error"]["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                                     "retryDelay": f"{server.retry_delay}s"}]
+                        headers = None
+                self._send(status, json.dumps(body).encode("utf-8"), headers=headers)
+
+            def _stream(self, events, delay):
+                """Send server-sent events, spreading the latency evenly between them."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for index, event in enumerate(events):
+                    self.wfile.write(f"{event}\r\n\r\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if index < server.stream_chunks - 1:
+                        time.sleep(delay / server.stream_chunks)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def _slices(self, text: str):
+        size = -(-len(text) // self.stream_chunks)
+        return [text[index * size:(index + 1) * size] for index in range(self.stream_chunks)]
+
+    def _next_outcome(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            if self._random.random() < self.tail_rate:
+                delay += self.tail_latency
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        return delay, fail
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1beta/models/stub:generateContent"
+
+    @property
+    def api_base_url(self) -> str:
+        """OPENAI_BASE_URL / ANTHROPIC_BASE_URL for this server."""
+        return f"{self.base_url}/v1"
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.base_url}/v1beta/models/stub:streamGenerateContent"
+
+    @property
+    def form_url(self) -> str:
+        return f"{self.base_url}/workday/job/1"
+
+    def start(self) -> "StubGeminiServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,223 @@
+"""Generators for synthetic resume documents used by the benchmark scripts."""
+import io
+import random
+import zipfile
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Enterprises"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "Backend Developer", "ML Engineer"]
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "Kubernetes", "React", "FastAPI", "TensorFlow", "Go"]
+VERBS = ["Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Shipped", "Scaled"]
+OBJECTS = ["a data pipeline", "the billing service", "an internal API", "CI/CD workflows", "a search index",
+           "the recommendation model", "monitoring dashboards", "a customer onboarding flow"]
+
+def resume_lines(seed: int = 0, experiences: int = 4) -> List[str]:
+    """Return the lines of a plausible plain-text resume."""
+    rng = random.Random(seed)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | (555) 010-{seed % 10000:04d} | Austin, TX",
+        f"linkedin.com/in/candidate{seed} | github.com/candidate{seed}",
+        "",
+        "EXPERIENCE",
+    ]
+    for index in range(experiences):
+        start = 2010 + index * 2
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)}")
+        lines.append(f"Jan {start} - Dec {start + 2}")
+        for _ in range(4):
+            lines.append(f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, "
+                         f"improving throughput by {rng.randint(5, 90)}%")
+    lines += [
+        "",
+        "EDUCATION",
+        "University of Texas at Austin",
+        "B.S. Computer Science, Aug 2006 - May 2010",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 6)),
+    ]
+    return lines
+
+def _escape_pdf_text(line: str) -> str:
+    line = line.encode("cp1252", "replace").decode("cp1252")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """Build a minimal text-layer PDF with one list of lines per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        content = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(
+            f"({_escape_pdf_text(line)}) '" for line in lines
+        ) + " ET"
+        stream = content.encode("cp1252")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append((
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+def synthetic_resume_pdf(page_count: int = 1, seed: int = 0) -> bytes:
+    """Build a PDF resume of the given length, one resume's worth of text per page."""
+    return build_pdf([resume_lines(seed + page, experiences=3) for page in range(page_count)])
+
+DOCX_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/header1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+    '</Types>'
+)
+DOCX_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+DOCX_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="header1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/header"/>'
+    '</Relationships>'
+)
+
+def docx_paragraph(text: str) -> str:
+    """One w:p with a single run, tabs kept as w:tab."""
+    runs = "<w:tab/>".join(f'<w:t xml:space="preserve">{escape(part)}</w:t>' for part in text.split("\t"))
+    return f"<w:p><w:pPr><w:tabs><w:tab w:val=\"left\" w:pos=\"7200\"/></w:tabs></w:pPr><w:r>{runs}</w:r></w:p>"
+
+def docx_table(rows: List[List[str]]) -> str:
+    cells = "".join(
+        "<w:tr>" + "".join(f"<w:tc>{docx_paragraph(cell)}</w:tc>" for cell in row) + "</w:tr>" for row in rows
+    )
+    return f"<w:tbl>{cells}</w:tbl>"
+
+def docx_text_box(lines: List[str]) -> str:
+    """A paragraph anchoring a text box, in DrawingML with the VML fallback Word also writes."""
+    content = "<w:txbxContent>" + "".join(docx_paragraph(line) for line in lines) + "</w:txbxContent>"
+    return (
+        "<w:p><w:r><mc:AlternateContent><mc:Choice Requires=\"wps\"><w:drawing><wp:anchor><a:graphic>"
+        f"<a:graphicData><wps:wsp><wps:txbx>{content}</wps:txbx></wps:wsp></a:graphicData></a:graphic>"
+        f"</wp:anchor></w:drawing></mc:Choice><mc:Fallback><w:pict><v:shape><v:textbox>{content}</v:textbox>"
+        "</v:shape></w:pict></mc:Fallback></mc:AlternateContent></w:r></w:p>"
+    )
+
+def build_docx(body: List[str], header_lines: List[str]) -> bytes:
+    """Build a minimal DOCX from body blocks (docx_paragraph, docx_table, docx_text_box) and a header."""
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {DOCX_NAMESPACES}><w:body>'
+        + "".join(body)
+        + '<w:sectPr><w:headerReference w:type="default" r:id="rId1"/></w:sectPr></w:body></w:document>'
+    )
+    header = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:hdr {DOCX_NAMESPACES}>'
+        + "".join(docx_paragraph(line) for line in header_lines) + "</w:hdr>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_PACKAGE_RELS)
+        archive.writestr("word/_rels/document.xml.rels", DOCX_DOCUMENT_RELS)
+        archive.writestr("word/document.xml", document)
+        archive.writestr("word/header1.xml", header)
+    return out.getvalue()
+
+def synthetic_resume_docx(seed: int = 0, experiences: int = 4) -> bytes:
+    """Build a DOCX resume laid out like common templates.
+
+    Contact details sit in the page header, the name in a text box, and education and skills in
+    tables; only the experience section is plain paragraphs.
+    """
+    lines = resume_lines(seed, experiences)
+    education = lines.index("EDUCATION")
+    body = [docx_text_box([lines[0]]), docx_paragraph("")]
+    body += [docx_paragraph(line) for line in lines[4:education]]
+    body += [
+        docx_paragraph("EDUCATION"),
+        docx_table([[lines[education + 1], lines[education + 2]]]),
+        docx_paragraph(""),
+        docx_paragraph("SKILLS"),
+        docx_table([["Languages & tools", lines[-1]]]),
+    ]
+    return build_docx(body, lines[1:3])
+
+def synthetic_resume_data(seed: int = 0, experiences: int = 4) -> Dict[str, Any]:
+    """Return a parsed-resume dict in the shape ResumeParser produces."""
+    rng = random.Random(seed)
+    work_experience = []
+    for index in range(experiences):
+        start = 2010 + index * 2
+        work_experience.append({
+            "company": rng.choice(COMPANIES),
+            "title": rng.choice(TITLES),
+            "dates": f"Jan {start} - Dec {start + 2}",
+            "responsibilities": [
+                f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, "
+                f"improving throughput by {rng.randint(5, 90)}%"
+                for _ in range(4)
+            ],
+        })
+    return {
+        "personal_information": {
+            "name": f"Candidate {seed}",
+            "email": f"candidate{seed}@example.com",
+            "phone": f"(555) 010-{seed % 10000:04d}",
+            "location": "Austin, TX",
+        },
+        "work_experience": work_experience,
+        "education": [{
+            "institution": "University of Texas at Austin",
+            "degree": "B.S. Computer Science",
+            "dates": "Aug 2006 - May 2010",
+        }],
+        "skills": rng.sample(SKILLS, 6),
+        "projects": [],
+        "certifications": [],
+    }
+
+def synthetic_job_description(seed: int = 0) -> str:
+    """Return a job posting with a handful of requirement bullets."""
+    rng = random.Random(seed)
+    lines = [f"We are hiring a {rng.choice(TITLES)} to join {rng.choice(COMPANIES)}.", "Requirements:"]
+    for skill in rng.sample(SKILLS, 4):
+        lines.append(f"- {rng.randint(2, 8)}+ years building production systems with {skill}")
+    lines.append(f"- Experience with {rng.choice(OBJECTS)} at scale")
+    lines.append("- Bachelor's degree in Computer Science or related field")
+    return "\n".join(lines)
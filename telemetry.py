@@ -0,0 +1,222 @@
+"""Process-wide spans, counters and histograms for the apply pipeline.
+
+Metrics are exposed in Prometheus text format through /metrics, and finished spans can be
+appended to a JSONL trace file (TRACE_FILE). With TELEMETRY_ENABLED=0 every call returns
+immediately and span() hands back a shared no-op object.
+"""
+import contextvars
+import json
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from settings import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_enabled = settings.get_bool("TELEMETRY_ENABLED", True)
+_lock = threading.Lock()
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_histograms: Dict[str, Tuple[Tuple[float, ...], Dict[LabelKey, List[float]]]] = {}
+_help: Dict[str, str] = {}
+_trace_path = settings.get("TRACE_FILE") or None
+_trace_file = None
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+def enabled() -> bool:
+    return _enabled
+
+def configure(enabled: Optional[bool] = None, trace_file: Optional[str] = None):
+    """Override the environment settings, e.g. from a benchmark or test."""
+    global _enabled, _trace_path, _trace_file
+    with _lock:
+        if enabled is not None:
+            _enabled = enabled
+        if trace_file is not None:
+            if _trace_file is not None:
+                _trace_file.close()
+                _trace_file = None
+            _trace_path = trace_file or None
+
+def describe(name: str, text: str):
+    _help[name] = text
+
+def _key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def inc(name: str, value: float = 1, **labels):
+    """Add value to a counter."""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+def observe(name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels):
+    """Record one observation in a histogram."""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        bounds, series = _histograms.setdefault(name, (buckets, {}))
+        # Per-bucket counts followed by sum and count
+        values = series.get(key)
+        if values is None:
+            values = series[key] = [0.0] * (len(bounds) + 2)
+        index = bisect_left(bounds, value)
+        if index < len(bounds):
+            values[index] += 1
+        values[-2] += value
+        values[-1] += 1
+
+class Span:
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "start", "duration", "error")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration = 0.0
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        self.attributes[key] = value
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class _NoopContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return NOOP_SPAN
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NOOP_CONTEXT = _NoopContext()
+
+def span(name: str, **attributes):
+    """Time a block as a span; also records span_duration_seconds{span=name}."""
+    if not _enabled:
+        return _NOOP_CONTEXT
+    return _span(name, attributes)
+
+@contextmanager
+def _span(name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    current = Span(name, attributes, _current_span.get())
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        observe("span_duration_seconds", current.duration, span=name)
+        if current.error:
+            inc("span_errors_total", span=name)
+        _write_trace(current)
+
+def _write_trace(finished: Span):
+    global _trace_file
+    if not _trace_path:
+        return
+    record = json.dumps({
+        "name": finished.name,
+        "trace_id": finished.trace_id,
+        "span_id": finished.span_id,
+        "parent_id": finished.parent_id,
+        "start": finished.start,
+        "duration": finished.duration,
+        "error": finished.error,
+        "attributes": finished.attributes,
+    }, default=str, separators=(",", ":"))
+    with _lock:
+        if _trace_file is None:
+            _trace_file = open(_trace_path, "a", buffering=1)
+        _trace_file.write(record + "\n")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    with _lock:
+        for name, series in sorted(_counters.items()):
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        for name, (bounds, series) in sorted(_histograms.items()):
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, values in series.items():
+                cumulative = 0.0
+                for bound, count in zip(bounds, values):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {values[-1]:g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {values[-2]:g}")
+                lines.append(f"{name}_count{_format_labels(key)} {values[-1]:g}")
+    return "\n".join(lines) + "\n"
+
+def snapshot() -> Dict[str, Any]:
+    """Return counters and histogram sums/counts as plain dicts, for benchmarks and debugging."""
+    with _lock:
+        return {
+            "counters": {name: {str(dict(key)): value for key, value in series.items()}
+                         for name, series in _counters.items()},
+            "histograms": {name: {str(dict(key)): {"sum": values[-2], "count": values[-1]}
+                                  for key, values in series.items()}
+                           for name, (_, series) in _histograms.items()},
+        }
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+describe("span_duration_seconds", "Duration of traced pipeline spans")
+describe("ai_requests_total", "Model API calls by outcome")
+describe("ai_tokens_total", "Tokens reported by the model API")
+describe("cache_requests_total", "Cache lookups by cache and result")
+describe("browser_wait_seconds", "Time spent in WebDriverWait conditions")
+describe("fused_fallbacks_total", "Fused analysis sections re-run as separate calls")
+describe("pipeline_stage_seconds", "Wall time of each pipeline stage")
+describe("browser_lease_wait_seconds", "Time spent waiting for a pooled browser session")
+describe("application_jobs_total", "Queued application attempts by outcome")
+describe("ai_retries_total", "Model calls retried after a retryable failure")
+describe("ai_coalesced_total", "Model calls served by an identical in-flight request")
+describe("ai_rate_limit_wait_seconds", "Time model calls waited for client-side quota")
+describe("ai_first_chunk_seconds", "Time from request to the first streamed text chunk")
+describe("prompt_tokens_total", "Estimated prompt tokens sent, by stage")
+describe("prompt_tokens_saved_total", "Estimated prompt tokens saved by compact serialization, by stage")
+describe("json_repairs_total", "Malformed model JSON repaired locally, by result")
+describe("ai_router_requests_total", "Routed model calls by backend and outcome")
+describe("ai_hedges_total", "Hedged model calls by which call answered first")
@@ -0,0 +1,21 @@
+import asyncio
+import ai_provider
+from ai_provider import GeminiProvider, get_async_http_client
+from cache import TieredCache
+
+def test_aclose_closes_the_loop_client_and_the_next_call_opens_a_new_one():
+    provider = GeminiProvider(cache=TieredCache(max_entries=0))
+
+    async def run():
+        client = get_async_http_client()
+        await provider.aclose()
+        assert client.is_closed
+        assert asyncio.get_running_loop() not in ai_provider._async_clients
+        reopened = get_async_http_client()
+        assert reopened is not client and not reopened.is_closed
+        await provider.aclose()
+
+    asyncio.run(run())
+
+def test_aclose_without_a_client_is_a_no_op():
+    asyncio.run(GeminiProvider(cache=TieredCache(max_entries=0)).aclose())
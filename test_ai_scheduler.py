@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+import pytest
+from ai_scheduler import BATCH, INTERACTIVE, RateLimiter, SingleFlight, backoff_delay, current_priority, priority
+
+def test_backoff_delay_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr("ai_scheduler.random.uniform", lambda low, high: high)
+    assert backoff_delay(0, base=0.5) == 0.5
+    assert backoff_delay(3, base=0.5) == 4.0
+    assert backoff_delay(10, base=0.5, cap=30) == 30
+
+def test_backoff_delay_honours_retry_hint():
+    for _ in range(100):
+        delay = backoff_delay(0, retry_after=2.0, base=0.5)
+        assert 2.0 <= delay <= 2.25
+
+def test_priority_lane_is_scoped():
+    assert current_priority() == INTERACTIVE
+    with priority(BATCH):
+        assert current_priority() == BATCH
+    assert current_priority() == INTERACTIVE
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    started = time.perf_counter()
+    for _ in range(1000):
+        limiter.acquire(10_000)
+    assert time.perf_counter() - started < 0.5
+
+def test_requests_per_minute_limit_holds_back_the_excess():
+    limiter = RateLimiter(requests_per_minute=600)  # a full bucket of 600, then 10 per second
+    for _ in range(600):
+        limiter.acquire(1)
+    started = time.perf_counter()
+    limiter.acquire(1)
+    assert 0.05 <= time.perf_counter() - started < 1
+
+def test_tokens_are_refunded_when_a_call_used_fewer():
+    limiter = RateLimiter(tokens_per_minute=1000)
+    limiter.acquire(1000)
+    limiter.settle(estimated=1000, actual=100)
+    started = time.perf_counter()
+    limiter.acquire(800)
+    assert time.perf_counter() - started < 0.5
+
+def test_interactive_lane_is_admitted_before_batch():
+    limiter = RateLimiter(requests_per_minute=60)  # one admission per second once the bucket is empty
+    limiter.requests.level = 0
+    order = []
+
+    def call(lane, name):
+        with priority(lane):
+            limiter.acquire(1)
+        order.append(name)
+
+    batch = threading.Thread(target=call, args=(BATCH, "batch"))
+    batch.start()
+    time.sleep(0.1)
+    interactive = threading.Thread(target=call, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    batch.join(5)
+    interactive.join(5)
+    assert order == ["interactive", "batch"]
+
+def test_async_acquire_waits_without_blocking_the_loop():
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter.requests.level = 0  # the next admission is 0.1s away
+    ticks = []
+
+    async def acquire():
+        await limiter.aacquire(1)
+        return time.perf_counter()
+
+    async def ticker():
+        for _ in range(20):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        admitted, _ = await asyncio.gather(acquire(), ticker())
+        return admitted
+
+    admitted = asyncio.run(main())
+    assert sum(tick < admitted for tick in ticks) >= 3
+
+def test_pause_holds_every_lane():
+    limiter = RateLimiter(requests_per_minute=6000)
+    limiter.pause(0.2)
+    started = time.perf_counter()
+    limiter.acquire(1)
+    assert time.perf_counter() - started >= 0.15
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "response"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == ["response"] * 5
+    # Once finished, the next call with the same key runs again
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+def test_single_flight_shares_failures():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("key", lambda: (_ for _ in ()).throw(RuntimeError("upstream down")))
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+def test_async_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["response"] * 5
+    assert calls == [1]
@@ -0,0 +1,92 @@
+import json
+import pytest
+from application_pipeline import ApplicationPipeline, FUSED_STAGES, STAGES
+from cache import TieredCache
+from job_analyzer import JobAnalyzer
+from stub_gemini import CANNED_RESPONSE
+
+FUSED_OUTPUT = {
+    "tailored_bullets": {"tailored_experience": []},
+    "tailored_resume": {"work_experience": []},
+    "analysis": {"experience_matches": [], "skill_matches": []},
+    "application_responses": {"cover_letter": "Hi"},
+}
+
+@pytest.fixture
+def stages(monkeypatch):
+    ran = []
+
+    def stage(name, output):
+        def run(self, *args, **kwargs):
+            ran.append(name)
+            return output
+        return run
+
+    monkeypatch.setattr(ApplicationPipeline, "analyze_application", stage("analyze_application", FUSED_OUTPUT))
+    monkeypatch.setattr(ApplicationPipeline, "submit_fused", stage("submit", True))
+    monkeypatch.setattr(ApplicationPipeline, "tailor_bullets", stage("tailor_bullets", {"tailored_experience": []}))
+    monkeypatch.setattr(ApplicationPipeline, "analyze_job", stage("analyze_job", {}))
+    monkeypatch.setattr(ApplicationPipeline, "generate_responses", stage("generate_responses", {}))
+    monkeypatch.setattr(ApplicationPipeline, "submit", stage("submit", True))
+    return ran
+
+def resumed_state(stage_names):
+    return {
+        "job_url": "https://example.com/job",
+        "job_description": "Python developer",
+        "parse_resume": {"work_experience": []},
+        "stage_names": list(stage_names),
+        "timings": {"parse_resume": 0.1},
+    }
+
+@pytest.mark.parametrize("started_fused, now_fused", [(True, False), (False, True)])
+def test_resumed_run_keeps_its_layout(stages, started_fused, now_fused):
+    stage_names = FUSED_STAGES if started_fused else STAGES
+    state = ApplicationPipeline(fused=now_fused).run(resumed_state(stage_names))
+    expected = ["analyze_application", "submit"] if started_fused else [
+        name for name in STAGES if name != "parse_resume"
+    ]
+    assert sorted(stages) == sorted(expected)
+    assert list(state["stage_names"]) == list(stage_names)
+    assert set(state["timings"]) == set(stage_names)
+
+def test_new_run_uses_the_configured_layout(stages):
+    state = resumed_state([])
+    del state["stage_names"]
+    ApplicationPipeline(fused=True).run(state)
+    assert stages == ["analyze_application", "submit"]
+    assert state["stage_names"] == ["analyze_application", "submit"]
+
+class MalformedFirstProvider:
+    """Answers the fused prompt with text that is not JSON, then every per-step prompt properly."""
+    api_url = "malformed-first"
+
+    def __init__(self):
+        self.system_prompts = []
+
+    def generate_response(self, prompt, system_prompt=None, max_output_tokens=2048):
+        self.system_prompts.append(system_prompt)
+        if len(self.system_prompts) == 1:
+            return "Sorry, I could not produce the analysis {"
+        return json.dumps(CANNED_RESPONSE)
+
+def test_unusable_fused_output_falls_back_to_per_step_calls(monkeypatch):
+    monkeypatch.setattr(ApplicationPipeline, "submit_fused", lambda self, *args, **kwargs: True)
+    provider = MalformedFirstProvider()
+    pipeline = ApplicationPipeline(fused=True)
+    analyzer = JobAnalyzer(tailor_cache=TieredCache(max_entries=0))
+    analyzer.ai_provider = provider
+    pipeline.analyzer = analyzer
+    state = resumed_state([])
+    del state["stage_names"]
+    state["parse_resume"] = {"work_experience": CANNED_RESPONSE["work_experience"]}
+    pipeline.run(state)
+
+    # One fused call, then tailoring (one call per role), job analysis and form responses
+    assert len(provider.system_prompts) == 4
+    assert len(set(provider.system_prompts)) == 4
+    assert state["tailor_bullets"]["tailored_experience"][0]["tailored_bullets"] == CANNED_RESPONSE["tailored_bullets"]
+    assert state["tailored_resume"]["work_experience"][0]["responsibilities"] == CANNED_RESPONSE["tailored_bullets"]
+    assert set(state["analyze_job"]) >= {"experience_matches", "skill_matches"}
+    assert state["generate_responses"]["application_responses"] == CANNED_RESPONSE["application_responses"]
+    assert state["submit"] is True
@@ -0,0 +1,59 @@
+import ai_provider
+from cache import TieredCache
+from stub_gemini import StubGeminiServer
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.time", lambda: now[0])
+    cache = TieredCache(ttl=10)
+    cache.set("key", "value")
+    now[0] += 9
+    assert cache.get("key") == "value"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TieredCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.stats()["evictions"] == 1
+
+def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(db_path=path, table="responses").set("key", "value")
+    reopened = TieredCache(db_path=path, table="responses")
+    assert reopened.get("key") == "value"
+    assert reopened.stats()["disk_hits"] == 1
+    # Promoted to memory on the first read
+    assert reopened.get("key") == "value"
+    assert reopened.stats()["memory_hits"] == 1
+    assert TieredCache(db_path=path, table="other").get("key") is None
+
+def test_expired_sqlite_entries_are_dropped(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.time", lambda: now[0])
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(db_path=path, ttl=10).set("key", "value")
+    now[0] += 11
+    assert TieredCache(db_path=path, ttl=10).get("key") is None
+    now[0] = 1000.0
+    assert TieredCache(db_path=path, ttl=10).get("key") is None
+
+def test_zero_ai_cache_size_sends_every_call_upstream(monkeypatch):
+    stub = StubGeminiServer(latency=0.0, response={"ok": True}).start()
+    try:
+        monkeypatch.setenv("GOOGLE_AI_API_URL", stub.url)
+        monkeypatch.setenv("AI_CACHE_SIZE", "0")
+        monkeypatch.setattr(ai_provider, "_response_cache", None)
+        provider = ai_provider.GeminiProvider()
+        for _ in range(2):
+            provider.generate_response("same prompt")
+        assert stub.requests == 2
+        assert provider.cache_stats()["size"] == 0
+    finally:
+        stub.stop()
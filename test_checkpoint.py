@@ -0,0 +1,27 @@
+import subprocess
+import sys
+from checkpoint import Checkpoint
+
+def test_finished_records_are_replayed_from_the_file(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    checkpoint = Checkpoint(path)
+    checkpoint.record({"id": "a", "data": {"name": "Jane"}, "error": None})
+    checkpoint.record({"id": "b", "data": None, "error": "ValueError: no text"})
+    checkpoint.record({"id": "c", "data": {"name": "Ana"}, "error": None})
+    with open(path, "a") as f:
+        f.write('{"id": "d", "da')
+
+    reopened = Checkpoint(path)
+    assert reopened.done() == {"a", "c"}
+    assert "b" not in reopened and "d" not in reopened
+    assert reopened.load("c") == {"id": "c", "data": {"name": "Ana"}, "error": None}
+
+def test_without_a_path_nothing_is_written():
+    checkpoint = Checkpoint(None)
+    checkpoint.record({"id": "a", "error": None})
+    assert checkpoint.done() == set()
+
+def test_resume_batch_does_not_load_the_job_matcher():
+    code = "import sys, resume_batch; print('batch_matcher' in sys.modules, 'job_analyzer' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["False", "False"]
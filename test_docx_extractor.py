@@ -0,0 +1,55 @@
+import tracemalloc
+from collections import deque
+import pytest
+from docx_extractor import extract_docx_text, iter_docx_lines
+from resume_preextract import preextract
+from synthetic_documents import build_docx, docx_paragraph, docx_table, docx_text_box, synthetic_resume_docx
+
+def test_reads_header_text_box_paragraphs_and_tables_in_order():
+    data = build_docx([
+        docx_text_box(["Jane Doe"]),
+        docx_paragraph("EXPERIENCE"),
+        docx_paragraph("Engineer\tAcme"),
+        docx_table([["Austin", "2019"], ["Dallas", "2020"]]),
+    ], ["jane@example.com"])
+    assert extract_docx_text(data).splitlines() == [
+        "jane@example.com",
+        "Jane Doe",
+        # The paragraph anchoring the text box, read after its content
+        "",
+        "EXPERIENCE",
+        "Engineer\tAcme",
+        "Austin | 2019",
+        "Dallas | 2020",
+    ]
+
+def test_label_rows_read_as_labelled_lists():
+    data = build_docx([docx_table([["Languages & tools", "Python, Go"], ["Frameworks:", "Django; React"]])], [])
+    assert extract_docx_text(data).splitlines() == ["Languages & tools: Python, Go", "Frameworks: Django; React"]
+
+def test_synthetic_resume_skills_drop_the_table_label():
+    skills = preextract(extract_docx_text(synthetic_resume_docx()))["resume"]["skills"]
+    assert skills
+    assert "Languages & tools" not in skills
+
+def test_layout_table_cells_read_cell_by_cell():
+    cell = docx_paragraph("Acme") + docx_paragraph("Engineer")
+    data = build_docx([f"<w:tbl><w:tr><w:tc>{cell}</w:tc><w:tc>{docx_paragraph('2019')}</w:tc></w:tr></w:tbl>"], [])
+    assert extract_docx_text(data).splitlines() == ["Acme", "Engineer", "2019"]
+
+def test_rejects_non_docx():
+    with pytest.raises(ValueError):
+        extract_docx_text(b"not a zip")
+
+def _peak_memory(rows: int) -> int:
+    data = build_docx([docx_table([[f"Skill group {index}", "Python, Go, SQL"] for index in range(rows)])], [])
+    tracemalloc.start()
+    try:
+        deque(iter_docx_lines(data), maxlen=0)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_memory_stays_bounded_inside_one_large_table():
+    # Ten times the rows must not cost anywhere near ten times the memory
+    assert _peak_memory(4000) < 3 * _peak_memory(400)
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+import time
+from cache import TieredCache
+from job_analyzer import JobAnalyzer
+
+class FakeProvider:
+    api_url = "fake"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = self.peak = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def _response(self, prompt):
+        return json.dumps({"tailored_bullets": [f"Tailored {len(prompt)}"]})
+
+    def generate_response(self, prompt, system_prompt=None, max_output_tokens=2048):
+        # The first call answers at once; the rest block until released
+        with self._lock:
+            self.in_flight += 1
+            first = self.in_flight == 1 and self.peak == 0
+            self.peak = max(self.peak, self.in_flight)
+        if not first:
+            self.release.wait(5)
+        with self._lock:
+            self.in_flight -= 1
+        return self._response(prompt)
+
+    async def agenerate_response(self, prompt, system_prompt=None, max_output_tokens=2048):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self._response(prompt)
+
+def make_analyzer(provider, concurrency):
+    analyzer = JobAnalyzer(tailor_cache=TieredCache(max_entries=0))
+    analyzer.ai_provider = provider
+    analyzer.tailor_concurrency = concurrency
+    return analyzer
+
+def resume(roles):
+    return {"work_experience": [
+        {"company": f"Company {index}", "title": "Engineer", "dates": "2020", "responsibilities": [f"Built thing {index}"]}
+        for index in range(roles)
+    ]}
+
+JOB = "- 3+ years of Python experience required\n- Experience with Kubernetes"
+
+def test_async_stream_honours_tailor_concurrency():
+    provider = FakeProvider(delay=0.02)
+    analyzer = make_analyzer(provider, concurrency=2)
+
+    async def collect():
+        return [entry async for entry in analyzer.astream_tailored_experience(JOB, resume(6))]
+
+    entries = asyncio.run(collect())
+    assert len(entries) == 6
+    assert provider.peak == 2
+
+def test_closing_the_sync_stream_early_does_not_wait_for_pending_calls():
+    provider = FakeProvider()
+    analyzer = make_analyzer(provider, concurrency=2)
+    stream = analyzer.stream_tailored_experience(JOB, resume(4))
+    try:
+        assert next(stream)["tailored_bullets"]
+        started = time.perf_counter()
+        stream.close()
+        assert time.perf_counter() - started < 1
+    finally:
+        provider.release.set()
+
+REQUIREMENTS = ["5+ years building production systems with Go", "Experience running services on Kubernetes"]
+
+def test_fingerprint_ignores_order_case_and_aliases():
+    from job_analyzer import requirements_fingerprint
+    fingerprint = requirements_fingerprint(REQUIREMENTS)
+    assert requirements_fingerprint(list(reversed(REQUIREMENTS))) == fingerprint
+    assert requirements_fingerprint([line.upper() for line in REQUIREMENTS]) == fingerprint
+    assert requirements_fingerprint(["5+ years building production systems with Golang",
+                                     "Experience running services on k8s"]) == fingerprint
+    assert requirements_fingerprint(REQUIREMENTS + ["Experience with Terraform"]) != fingerprint
+
+class CountingProvider(FakeProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.release.set()
+
+    def generate_response(self, prompt, system_prompt=None, max_output_tokens=2048):
+        self.calls += 1
+        return super().generate_response(prompt, system_prompt, max_output_tokens)
+
+def test_memoized_roles_make_no_provider_call():
+    provider = CountingProvider()
+    analyzer = JobAnalyzer(tailor_cache=TieredCache(max_entries=64))
+    analyzer.ai_provider = provider
+    first = json.loads(analyzer.tailor_bullet_points(JOB, resume(3)))
+    assert provider.calls == 3
+
+    # A repost with reordered, recased requirements reuses every memoized role
+    repost = "Great team!\n- EXPERIENCE WITH KUBERNETES\n- 3+ years of Python experience required"
+    assert json.loads(analyzer.tailor_bullet_points(repost, resume(3))) == first
+    assert provider.calls == 3
+
+    edited = resume(3)
+    edited["work_experience"][1]["responsibilities"].append("Led the migration")
+    analyzer.tailor_bullet_points(JOB, edited)
+    assert provider.calls == 4
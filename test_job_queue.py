@@ -0,0 +1,98 @@
+import threading
+import time
+from job_queue import ApplicationWorkerPool, JobQueue
+
+def make_queue(tmp_path, **kwargs) -> JobQueue:
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), **kwargs)
+
+def enqueue(queue: JobQueue) -> str:
+    return queue.enqueue(b"%PDF", "resume.pdf", "https://example.com/job", "Python developer")
+
+def test_claim_leases_oldest_job(tmp_path):
+    queue = make_queue(tmp_path)
+    first = enqueue(queue)
+    enqueue(queue)
+
+    job = queue.claim()
+    assert job["id"] == first
+    assert job["attempts"] == 1
+    assert job["request"]["job_url"] == "https://example.com/job"
+    assert job["resume"] == b"%PDF"
+    assert queue.get(first)["status"] == "running"
+
+def test_claim_returns_none_when_empty(tmp_path):
+    assert make_queue(tmp_path).claim() is None
+
+def test_fail_requeues_until_attempts_run_out(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = enqueue(queue)
+
+    queue.claim()
+    queue.fail(job_id, "boom")
+    assert queue.get(job_id)["status"] == "queued"
+
+    queue.claim()
+    queue.fail(job_id, "boom again")
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "boom again"
+    assert queue.claim() is None
+
+def test_recover_requeues_expired_leases_only(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=60)
+    job_id = enqueue(queue)
+    queue.claim()
+
+    assert queue.recover() == 0
+    assert queue.get(job_id)["status"] == "running"
+    assert queue.recover(all_running=True) == 1
+    assert queue.get(job_id)["status"] == "queued"
+
+def test_recover_fails_jobs_out_of_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=1, lease_seconds=0)
+    job_id = enqueue(queue)
+    queue.claim()
+    time.sleep(0.01)
+
+    assert queue.recover() == 1
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"]
+    assert queue.claim() is None
+
+def test_renew_extends_a_running_lease(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0)
+    job_id = enqueue(queue)
+    queue.claim()
+
+    queue.lease_seconds = 60
+    queue.renew(job_id)
+    assert queue.recover() == 0
+    assert queue.get(job_id)["status"] == "running"
+
+def test_worker_heartbeat_keeps_a_long_job_leased(tmp_path, monkeypatch):
+    queue = make_queue(tmp_path, lease_seconds=0.3)
+    job_id = enqueue(queue)
+    job = queue.claim()
+    release = threading.Event()
+
+    class SlowPipeline:
+        def __init__(self, ai_provider_name=None):
+            pass
+
+        def run(self, state, on_stage=None):
+            release.wait(5)
+            return state
+
+    monkeypatch.setattr("job_queue.ApplicationPipeline", SlowPipeline)
+    runner = threading.Thread(target=ApplicationWorkerPool(queue)._run, args=(job,))
+    runner.start()
+    try:
+        # Several lease lengths pass, but the heartbeat keeps the job from being re-queued
+        for _ in range(5):
+            time.sleep(0.2)
+            assert queue.recover() == 0
+    finally:
+        release.set()
+        runner.join()
+    assert queue.get(job_id)["status"] == "succeeded"
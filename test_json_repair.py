@@ -0,0 +1,49 @@
+import json
+import pytest
+import json_repair
+from models import TailoredExperience, parse_list
+
+COMPLETE_ROLE = '{"company": "A", "title": "Engineer", "tailored_bullets": ["Built X"]}'
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here you go: {"a": [1, 2,],} Hope this helps', {"a": [1, 2]}),
+    ('{"a": "line one\nline two"}', {"a": "line one\nline two"}),
+    ('{"a": [1, 2}', {"a": [1, 2]}),
+])
+def test_repairs_common_faults(text, expected):
+    assert json_repair.loads(text) == expected
+
+def test_drops_unfinished_object_in_a_list():
+    text = '{"tailored_experience": [' + COMPLETE_ROLE + ', {"company": "C", "tit'
+    data = json_repair.loads(text)
+    assert data == {"tailored_experience": [json.loads(COMPLETE_ROLE)]}
+    # What is left validates, so the section is kept instead of re-requested
+    assert len(parse_list(TailoredExperience, data["tailored_experience"])) == 1
+
+def test_drops_object_cut_between_keys():
+    text = '[' + COMPLETE_ROLE + ', {"company": "C", "title": "Lead"'
+    assert json_repair.loads(text) == [json.loads(COMPLETE_ROLE)]
+
+def test_drops_unfinished_list_in_a_list():
+    assert json_repair.loads('{"a": [[1, 2], [3') == {"a": [[1, 2]]}
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"years": 1', {}),
+    ('{"name": "A", "years": 12', {"name": "A"}),
+    ('{"name": "A", "remote": tru', {"name": "A"}),
+    ('[1, 2, 3', [1, 2]),
+    ('{"years": 1,', {"years": 1}),
+])
+def test_never_keeps_a_trailing_number_or_literal(text, expected):
+    assert json_repair.loads(text) == expected
+
+def test_drops_half_a_string():
+    assert json_repair.loads('{"skills": ["Python", "Go') == {"skills": ["Python"]}
+
+def test_valid_json_is_returned_unchanged():
+    assert json_repair.repair_json('{"a": [1, {"b": null}]}') == '{"a": [1, {"b": null}]}'
+
+def test_unrepairable_input_raises():
+    with pytest.raises(ValueError):
+        json_repair.loads("no json here")
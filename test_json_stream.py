@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from json_stream import JsonItemParser, aiter_json_items, iter_json_items
+
+DOCUMENT = (
+    '```json\n{"analysis": {"experience_matches": [{"job_requirement": "Python", "matching_experience": "A"},'
+    ' {"job_requirement": "Go \\"fast\\" [x]", "matching_experience": "B"}], "skill_matches": ["x"]},'
+    ' "tailored_experience": [{"company": "C", "tailored_bullets": ["one", "two"]}]}\n```'
+)
+KEYS = ["experience_matches", "tailored_experience"]
+
+def chunks(text, size):
+    return [text[index:index + size] for index in range(0, len(text), size)]
+
+@pytest.mark.parametrize("size", [1, 7, len(DOCUMENT)])
+def test_items_arrive_whatever_the_chunking(size):
+    items = list(iter_json_items(chunks(DOCUMENT, size), KEYS))
+    assert items == [
+        ("experience_matches", {"job_requirement": "Python", "matching_experience": "A"}),
+        ("experience_matches", {"job_requirement": 'Go "fast" [x]', "matching_experience": "B"}),
+        ("tailored_experience", {"company": "C", "tailored_bullets": ["one", "two"]}),
+    ]
+
+def test_item_is_reported_as_soon_as_it_closes():
+    parser = JsonItemParser(["tailored_experience"])
+    assert parser.feed('{"tailored_experience": [{"company": "A"}') == [("tailored_experience", {"company": "A"})]
+    assert parser.feed(', {"company": "B"') == []
+    assert parser.feed('}]}') == [("tailored_experience", {"company": "B"})]
+
+def test_scalar_elements_and_unwatched_keys_are_ignored():
+    parser = JsonItemParser(["skills"])
+    assert parser.feed('{"skills": ["Python", "Go"], "other": [{"a": 1}]}') == []
+
+def test_result_parses_the_whole_document_without_surrounding_text():
+    parser = JsonItemParser(KEYS)
+    for chunk in chunks(DOCUMENT, 5):
+        parser.feed(chunk)
+    assert parser.complete
+    assert parser.result()["analysis"]["skill_matches"] == ["x"]
+
+def test_result_of_an_unfinished_document_raises():
+    parser = JsonItemParser(KEYS)
+    parser.feed('{"tailored_experience": [')
+    assert not parser.complete
+    with pytest.raises(ValueError):
+        parser.result()
+
+def test_async_items():
+    async def stream():
+        for chunk in chunks(DOCUMENT, 11):
+            yield chunk
+
+    async def collect():
+        return [key async for key, _ in aiter_json_items(stream(), KEYS)]
+
+    assert asyncio.run(collect()) == ["experience_matches", "experience_matches", "tailored_experience"]
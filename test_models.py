@@ -0,0 +1,51 @@
+import pytest
+import models
+
+def test_resume_round_trips_and_fills_defaults():
+    resume = models.Resume.from_dict({
+        "personal_information": {"name": "Jane", "email": "jane@example.com"},
+        "work_experience": [{"company": "Acme", "title": "Engineer", "responsibilities": ["Built X"]}],
+        "skills": ["Python"],
+    })
+    assert resume.personal_information.name == "Jane"
+    assert resume.work_experience[0].dates == ""
+    assert resume.education == []
+    assert models.Resume.from_dict(resume.to_dict()) == resume
+    assert not hasattr(resume, "__dict__")
+
+def test_harmless_faults_are_coerced():
+    resume = models.Resume.from_dict({
+        "personal_information": {"name": "Jane", "phone": 5550100, "links": "github.com/jane"},
+        "work_experience": [None, {"company": "Acme", "title": None, "responsibilities": "Built X"}],
+        "skills": None,
+    })
+    assert resume.personal_information.phone == "5550100"
+    assert resume.personal_information.links == ["github.com/jane"]
+    assert len(resume.work_experience) == 1
+    assert resume.work_experience[0].title == ""
+    assert resume.work_experience[0].responsibilities == ["Built X"]
+    assert resume.skills == []
+
+@pytest.mark.parametrize("data, path", [
+    ({"work_experience": {"company": "Acme"}}, "Resume.work_experience"),
+    ({"skills": [{"name": "Python"}]}, "Resume.skills[0]"),
+    ({"personal_information": "Jane"}, "Resume.personal_information"),
+])
+def test_schema_errors_name_the_offending_path(data, path):
+    with pytest.raises(models.SchemaError, match=path.replace("[", r"\[").replace("]", r"\]")):
+        models.Resume.from_dict(data)
+
+def test_required_fields():
+    with pytest.raises(models.SchemaError, match="missing tailored_bullets"):
+        models.TailoredExperience.from_dict({"company": "Acme", "title": "Engineer"})
+    entries = models.parse_list(models.TailoredExperience, [
+        {"company": "Acme", "title": "Engineer", "tailored_bullets": ["Built X"]},
+    ])
+    assert entries[0].original_bullets == []
+
+def test_from_json_repairs_before_validating():
+    analysis = models.Analysis.from_json(
+        '```json\n{"experience_matches": [], "skill_matches": [{"required_skill": "Go", "matching_skill": "Go"},'
+    )
+    assert analysis.skill_matches[0].required_skill == "Go"
+    assert analysis.additional_qualifications == []
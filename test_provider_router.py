@@ -0,0 +1,70 @@
+import asyncio
+import json
+import time
+import pytest
+from ai_provider import GeminiProvider, OpenAIProvider, ProviderRouter
+from cache import TieredCache
+from stub_gemini import StubGeminiServer
+
+@pytest.fixture
+def stubs():
+    started = []
+
+    def start(**options):
+        stub = StubGeminiServer(response={"ok": True}, **options).start()
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.stop()
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch):
+    monkeypatch.setenv("AI_MAX_RETRIES", "0")
+
+def gemini(monkeypatch, stub):
+    monkeypatch.setenv("GOOGLE_AI_API_URL", stub.url)
+    return GeminiProvider(cache=TieredCache(max_entries=0))
+
+def openai(monkeypatch, stub):
+    monkeypatch.setenv("OPENAI_BASE_URL", stub.api_base_url)
+    return OpenAIProvider(cache=TieredCache(max_entries=0))
+
+def test_faster_backend_is_ranked_first(monkeypatch, stubs):
+    slow, fast = gemini(monkeypatch, stubs(latency=0.3)), openai(monkeypatch, stubs(latency=0.02))
+    router = ProviderRouter([slow, fast])
+    # Untried backends go first, so two calls sample both
+    for index in range(2):
+        assert json.loads(router.generate_response(f"prompt {index}")) == {"ok": True}
+    assert router.ranked() == [fast, slow]
+    stats = router.backend_stats()
+    assert stats["openai"]["latency_p95"] < stats["google"]["latency_p95"]
+
+def test_failing_primary_fails_over_to_the_next_backend(monkeypatch, stubs):
+    broken, healthy = stubs(latency=0.01, failure_rate=1.0, failure_status=503), stubs(latency=0.01)
+    router = ProviderRouter([gemini(monkeypatch, broken), openai(monkeypatch, healthy)])
+    assert json.loads(router.generate_response("prompt")) == {"ok": True}
+    assert (broken.requests, healthy.requests) == (1, 1)
+    assert router.backend_stats()["google"]["error_rate"] == 1.0
+
+def test_hedged_call_wins_and_the_slow_primary_is_cancelled(monkeypatch, stubs):
+    slow_stub = stubs(latency=2.0)
+    router = ProviderRouter([gemini(monkeypatch, slow_stub), openai(monkeypatch, stubs(latency=0.02))],
+                            hedge_after=0.1)
+
+    async def call():
+        started = time.perf_counter()
+        result = await router.agenerate_response("prompt")
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return result, time.perf_counter() - started, pending
+
+    result, seconds, pending = asyncio.run(call())
+    assert json.loads(result) == {"ok": True}
+    assert seconds < 1.0
+    assert pending == []
+    assert slow_stub.requests == 1
+    # The cancelled primary records the time it had taken, not the full response time
+    stats = router.backend_stats()
+    assert stats["google"]["samples"] == 1 and stats["google"]["latency_p95"] < 1.0
+    assert stats["google"]["error_rate"] == 0.0
@@ -0,0 +1,68 @@
+import json
+import pytest
+import resume_parser
+from cache import TieredCache
+from stub_gemini import CANNED_RESPONSE
+from synthetic_documents import synthetic_resume_docx
+
+class StubProvider:
+    api_url = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_response(self, prompt, system_prompt=None, max_output_tokens=2048):
+        self.calls += 1
+        return json.dumps(CANNED_RESPONSE)
+
+@pytest.fixture
+def provider(monkeypatch):
+    stub = StubProvider()
+    monkeypatch.setattr(resume_parser, "get_ai_provider", lambda name=None: stub)
+    return stub
+
+def make_parser(text_cache, data_cache):
+    return resume_parser.ResumeParser(text_cache=text_cache, data_cache=data_cache)
+
+def test_preextract_mode_is_part_of_the_data_key(monkeypatch, provider):
+    text_cache, data_cache = TieredCache(), TieredCache()
+    source = synthetic_resume_docx()
+    make_parser(text_cache, data_cache).parse_resume(source)
+    calls = provider.calls
+    monkeypatch.setenv("RESUME_PREEXTRACT", "false")
+    make_parser(text_cache, data_cache).parse_resume(source)
+    # The whole-resume prompt is a different prompt path, so the data is not reused
+    assert provider.calls == calls + 1
+
+def test_data_cache_hit_skips_extraction_and_the_model(monkeypatch, provider):
+    text_cache, data_cache = TieredCache(), TieredCache()
+    source = synthetic_resume_docx()
+    first = make_parser(text_cache, data_cache).parse_resume(source)
+    calls = provider.calls
+
+    def no_extraction(*args, **kwargs):
+        raise AssertionError("text was extracted again")
+
+    monkeypatch.setattr(resume_parser, "extract_resume_text", no_extraction)
+    assert make_parser(text_cache, data_cache).parse_resume(source) == first
+    assert provider.calls == calls
+
+def test_extraction_version_change_rebuilds_text_and_data(monkeypatch, provider):
+    text_cache, data_cache = TieredCache(), TieredCache()
+    source = synthetic_resume_docx()
+    make_parser(text_cache, data_cache).parse_resume(source)
+    calls, extractions = provider.calls, text_cache.stats()["misses"]
+    monkeypatch.setattr(resume_parser, "EXTRACTION_VERSION", resume_parser.EXTRACTION_VERSION + ".1")
+    make_parser(text_cache, data_cache).parse_resume(source)
+    assert text_cache.stats()["misses"] == extractions + 1
+    assert provider.calls > calls
+
+def test_prompt_change_reuses_text_but_not_data(monkeypatch, provider):
+    text_cache, data_cache = TieredCache(), TieredCache()
+    source = synthetic_resume_docx()
+    make_parser(text_cache, data_cache).parse_resume(source)
+    calls = provider.calls
+    monkeypatch.setattr(resume_parser, "PROMPT_FINGERPRINT", "edited prompts")
+    make_parser(text_cache, data_cache).parse_resume(source)
+    assert text_cache.stats()["memory_hits"] == 1
+    assert provider.calls > calls
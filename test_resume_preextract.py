@@ -0,0 +1,86 @@
+import pytest
+from resume_preextract import (OTHER_SECTION, normalize_dates, parse_list_section, personal_information, preextract,
+                               section_heading, segment_sections, split_bullets)
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | Austin, TX
+github.com/janedoe
+
+Experience
+Acme Corp
+Research Assistant, Jan 2020 – Present
+• Built a data pipeline handling
+  millions of events per day
+• Cut query latency by 40%
+
+Volunteer Experience
+• Taught coding at a food bank
+
+Education
+State University, B.S. Computer Science, 2015 to 2019
+
+Skills
+Languages: Python, Go (Golang), SQL
+Frameworks: Django, React
+
+Awards
+Best Paper 2019
+"""
+
+@pytest.mark.parametrize("line, section", [
+    ("Experience", "work_experience"),
+    ("PROFESSIONAL EXPERIENCE:", "work_experience"),
+    ("Technical Skills", "skills"),
+    ("Awards", OTHER_SECTION),
+    ("HONORS AND AWARDS", OTHER_SECTION),
+    ("Publications", OTHER_SECTION),
+    ("Volunteer Experience", OTHER_SECTION),
+    ("Leadership & Activities", OTHER_SECTION),
+    ("Languages", OTHER_SECTION),
+    ("Interests", OTHER_SECTION),
+    ("Research Assistant", None),
+    ("Acme Corp", None),
+    ("Languages: Python, Go", None),
+    ("Best Paper Awards 2019", None),
+])
+def test_section_heading(line, section):
+    assert section_heading(line) == section
+
+def test_unknown_headings_do_not_run_into_the_section_above():
+    sections = segment_sections(RESUME)
+    assert "Taught coding" not in sections["work_experience"]
+    assert "Best Paper" not in sections["skills"]
+    assert "Best Paper 2019" in sections[OTHER_SECTION]
+
+def test_preextract_fills_literal_fields_and_keeps_model_sections():
+    extracted = preextract(RESUME)
+    resume = extracted["resume"]
+    assert resume["personal_information"]["name"] == "Jane Doe"
+    assert resume["personal_information"]["email"] == "jane.doe@example.com"
+    assert resume["personal_information"]["phone"] == "(555) 123-4567"
+    assert resume["personal_information"]["location"] == "Austin, TX"
+    assert resume["personal_information"]["links"] == ["github.com/janedoe"]
+    assert resume["skills"] == ["Python", "Go (Golang)", "SQL", "Django", "React"]
+    assert set(extracted["sections"]) == {"work_experience", "education"}
+    assert "- Built a data pipeline handling millions of events per day" in extracted["sections"]["work_experience"]
+    assert "Jan 2020 - Present" in extracted["sections"]["work_experience"]
+    assert "2015 - 2019" in extracted["sections"]["education"]
+
+def test_preextract_gives_up_without_experience_or_education():
+    assert preextract("Jane Doe\nSkills\nPython") is None
+
+def test_split_bullets_joins_wrapped_lines():
+    assert split_bullets("• Built a pipeline\n  for events\n• Shipped it.\nNext") == [
+        "Built a pipeline for events", "Shipped it.", "Next",
+    ]
+
+def test_parse_list_section_splits_outside_parentheses():
+    assert parse_list_section("Tools: Docker, Cloud (AWS, GCP); Git | Linux") == [
+        "Docker", "Cloud (AWS, GCP)", "Git", "Linux",
+    ]
+
+def test_normalize_dates():
+    assert normalize_dates("Mar 2019 to Dec. 2021") == "Mar 2019 - Dec. 2021"
+
+def test_personal_information_without_contact_details():
+    assert personal_information("Jane Doe") == {"name": "Jane Doe", "email": "", "phone": "", "location": ""}
@@ -0,0 +1,70 @@
+import pytest
+import models
+from skill_index import ResumeIndex, SkillVocabulary, key_requirements
+
+@pytest.fixture(scope="module")
+def vocabulary():
+    return SkillVocabulary()
+
+@pytest.mark.parametrize("text, skills", [
+    ("Python3, Golang and TypeScript", ["python", "go", "typescript"]),
+    ("Experience with Go and Kubernetes (k8s)", ["go", "kubernetes"]),
+    ("Built REST APIs on Node and Node.js", ["rest api", "node.js"]),
+    ("Applied ML and AI to search", ["machine learning", "artificial intelligence"]),
+    ("Deployed on Google Cloud Platform", ["gcp"]),
+    ("CI/CD with Jenkins", ["ci/cd"]),
+])
+def test_aliases_fold_to_canonical_skills(vocabulary, text, skills):
+    assert vocabulary.skills(text) == skills
+
+@pytest.mark.parametrize("text", [
+    "go the extra mile with the rest of the team",
+    "You will own the node in our org chart and ts reports",
+    "Said Ai and ml in passing",
+    "Automate releases with GitHub Actions",
+    "carry the torch, tf",
+    "a few py scripts",
+])
+def test_ordinary_words_are_not_skills(vocabulary, text):
+    assert vocabulary.skills(text) == []
+
+def test_tokenize_keeps_ordinary_words_as_words(vocabulary):
+    assert vocabulary.tokenize("Go the extra mile") == [vocabulary.token("go"), "extra", "mile"]
+    assert vocabulary.tokenize("go the extra mile") == ["go", "extra", "mile"]
+
+def test_key_requirements_drop_boilerplate(vocabulary):
+    description = "We go the extra mile for our customers.\n- 3+ years building services in Python\n- Free snacks every day"
+    assert key_requirements(description, vocabulary) == ["3+ years building services in Python"]
+
+def test_skill_overlap_ignores_false_matches(vocabulary):
+    index = ResumeIndex({
+        "skills": ["Go", "Git"],
+        "work_experience": [{"company": "Acme", "title": "Engineer", "responsibilities": ["Built services in Go"]}],
+    }, vocabulary)
+    # Used to count go, rest api and git as required skills
+    assert index.skill_overlap("We go the extra mile with the rest of the team using GitHub Actions") == 0.0
+    assert index.match_job("- Strong Go experience required\n- Ship services with git")["skill_matches"][0]["evidence"] \
+        == "Built services in Go"
+
+def test_fold_case_vocabulary_ignores_case_of_case_sensitive_aliases():
+    folded = SkillVocabulary(fold_case=True)
+    assert folded.tokenize("5+ years building production systems with GO") == \
+        folded.tokenize("5+ years building production systems with Go")
+    assert folded.skills("NODE and ml") == ["node.js", "machine learning"]
+
+def test_recased_requirements_fingerprint_the_same():
+    from job_analyzer import requirements_fingerprint
+    requirements = ["5+ years building production systems with Go", "Experience with REST APIs and Node"]
+    assert requirements_fingerprint([line.upper() for line in requirements]) == requirements_fingerprint(requirements)
+
+def test_local_match_has_the_model_analysis_shape(vocabulary):
+    index = ResumeIndex({
+        "skills": ["Python"],
+        "certifications": ["AWS Certified Developer"],
+        "work_experience": [{"company": "Acme", "title": "Engineer", "responsibilities": [
+            "Built Python services", "Led a team of four", "Cut cloud costs by a third", "Mentored new hires",
+        ]}],
+    }, vocabulary)
+    analysis = index.match_job("- 3+ years building Python services\n- Python required")
+    assert analysis["experience_matches"]
+    assert models.Analysis.from_dict(analysis).to_dict() == analysis
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+import pytest
+from stage_graph import StageGraph
+
+def test_plan_skips_available_outputs_and_unneeded_stages():
+    graph = (StageGraph()
+             .add("parse", lambda resume: resume, ["resume"])
+             .add("tailor", lambda parse: parse, ["parse"])
+             .add("analyze", lambda parse: parse, ["parse"])
+             .add("submit", lambda analyze: analyze, ["analyze"]))
+    assert graph.plan(["resume"]) == ["parse", "tailor", "analyze", "submit"]
+    assert graph.plan(["resume", "parse"], ["submit"]) == ["analyze", "submit"]
+    with pytest.raises(ValueError):
+        graph.plan([], ["submit"])
+
+def test_run_passes_outputs_and_reports_each_stage():
+    completed = []
+    graph = (StageGraph()
+             .add("double", lambda number: number * 2, ["number"])
+             .add("add", lambda number, double: number + double, ["number", "double"]))
+    results = graph.run({"number": 3}, on_complete=lambda name, output, duration: completed.append((name, output)))
+    assert results["add"] == 9
+    assert completed == [("double", 6), ("add", 9)]
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(source):
+        barrier.wait()
+        return source
+
+    graph = StageGraph().add("left", meet, ["source"]).add("right", meet, ["source"])
+    assert graph.run({"source": 1}) == {"source": 1, "left": 1, "right": 1}
+
+def test_stage_outputs_are_copied_but_inputs_are_not():
+    shared = {"items": []}
+    graph = (StageGraph()
+             .add("build", lambda source: {"items": [1]}, ["source"])
+             .add("mutate", lambda build, source: build["items"].append(2) or source, ["build", "source"]))
+    results = graph.run({"source": shared})
+    assert results["build"] == {"items": [1]}
+    assert results["mutate"] is shared
+
+def test_arun_cancels_siblings_when_a_stage_fails():
+    release = threading.Event()
+    ran = []
+
+    def slow(source):
+        release.wait(5)
+        return source
+
+    def fail(source):
+        raise RuntimeError("analysis failed")
+
+    graph = (StageGraph()
+             .add("slow", slow, ["source"], executor="test")
+             .add("fail", fail, ["source"], executor="test")
+             .add("after_slow", lambda slow: ran.append(slow), ["slow"], executor="test"))
+
+    async def run():
+        started = time.perf_counter()
+        with pytest.raises(RuntimeError):
+            await graph.arun({"source": 1})
+        return time.perf_counter() - started
+
+    try:
+        # Returns without waiting for the blocked sibling, which is cancelled rather than left running unobserved
+        assert asyncio.run(run()) < 2
+    finally:
+        release.set()
+    time.sleep(0.1)
+    assert ran == []
+
+@pytest.mark.parametrize("mode", ["run", "arun"])
+def test_running_siblings_stop_at_their_next_cancellation_check(mode):
+    from stage_graph import StageCancelled, check_cancelled
+    failed = threading.Event()
+    steps = []
+    outcome = []
+
+    def browser(source):
+        steps.append("login")
+        failed.wait(5)
+        time.sleep(0.1)
+        try:
+            check_cancelled()
+        except StageCancelled:
+            outcome.append("stopped")
+            raise
+        steps.append("submit")
+
+    def analysis(source):
+        failed.set()
+        raise RuntimeError("analysis failed")
+
+    graph = (StageGraph()
+             .add("browser", browser, ["source"], executor="test")
+             .add("analysis", analysis, ["source"], executor="test"))
+    with pytest.raises(RuntimeError):
+        if mode == "run":
+            graph.run({"source": 1})
+        else:
+            asyncio.run(graph.arun({"source": 1}))
+    for _ in range(50):
+        if outcome:
+            break
+        time.sleep(0.02)
+    assert steps == ["login"]
+    assert outcome == ["stopped"]
@@ -0,0 +1,37 @@
+import json
+from fastapi.testclient import TestClient
+from application_pipeline import ApplicationPipeline
+import main
+
+class FakeAnalyzer:
+    async def astream_tailored_experience(self, job_description, resume_data):
+        yield {"size": resume_data["size"]}
+
+def post_resume(monkeypatch, payload):
+    seen = []
+
+    def parse_resume(self, resume):
+        # A spooled file only has a name (its descriptor) once it has rolled over to disk
+        seen.append(resume.name)
+        return {"size": len(resume.read())}
+
+    monkeypatch.setattr(ApplicationPipeline, "parse_resume", parse_resume)
+    monkeypatch.setattr(main, "get_job_analyzer", lambda name: FakeAnalyzer())
+    response = TestClient(main.app).post(
+        "/tailor/stream",
+        files={"resume": ("resume.pdf", payload, "application/pdf")},
+        data={"job_description": "Python developer"},
+    )
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[0]) == {"size": len(payload)}
+    return seen[0]
+
+def test_upload_larger_than_spool_threshold(monkeypatch):
+    # Past the threshold the upload rolls over to a disk-backed file, which must not be copied
+    monkeypatch.setenv("UPLOAD_SPOOL_MAX_BYTES", "1024")
+    name = post_resume(monkeypatch, b"%PDF-1.4\n" + b"x" * 4096)
+    assert isinstance(name, int)
+
+def test_upload_under_spool_threshold_stays_in_memory(monkeypatch):
+    monkeypatch.setenv("UPLOAD_SPOOL_MAX_BYTES", "1024")
+    assert post_resume(monkeypatch, b"%PDF-1.4\n" + b"x" * 512) is None
@@ -3,36 +3,97 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-import os
-from dotenv import load_dotenv
 import time
+from settings import settings
 from typing import Dict, Any
-
-load_dotenv()
+import telemetry
+
+# Sets every field of a section in one round trip. Uses the native value setter so
+# framework-controlled inputs (React) see the change, then fires input/change events.
+# Returns the names it could not find and the names whose value did not stick.
+FILL_FIELDS_SCRIPT = """
+const values = arguments[0];
+const missing = [];
+const rejected = [];
+for (const [name, value] of Object.entries(values)) {
+    const element = document.getElementsByName(name)[0];
+    if (!element) {
+        missing.push(name);
+        continue;
+    }
+    const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    const descriptor = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (!descriptor || element.readOnly || element.disabled) {
+        rejected.push(name);
+        continue;
+    }
+    descriptor.set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    if (element.value !== value) {
+        rejected.push(name);
+    }
+}
+return {missing: missing, rejected: rejected};
+"""
+
+def _field_value(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+def create_driver(headless: bool = False):
+    """Create a Chrome WebDriver with the options the automator expects."""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    else:
+        options.add_argument('--start-maximized')
+    options.add_argument('--disable-notifications')
+    return webdriver.Chrome(options=options)
 
 class WorkdayAutomator:
-    def __init__(self):
-        self.driver = None
-        self.wait = None
+    def __init__(self, driver=None):
+        # A driver leased from a BrowserPool can be passed in instead of launching a new one
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 10) if driver else None
+        # Fill each section with one script call; set FAST_FORM_FILL=0 to type field by field
+        self.fast_fill = settings.get_bool("FAST_FORM_FILL", True)
 
     def initialize_driver(self):
         """Initialize the Chrome WebDriver with appropriate options."""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--start-maximized')
-        options.add_argument('--disable-notifications')
-        self.driver = webdriver.Chrome(options=options)
+        self.driver = create_driver()
         self.wait = WebDriverWait(self.driver, 10)
 
+    def _wait_until(self, condition, step: str):
+        """self.wait.until, recording how long the page kept us waiting."""
+        start = time.perf_counter()
+        try:
+            return self.wait.until(condition)
+        finally:
+            telemetry.observe("browser_wait_seconds", time.perf_counter() - start, step=step)
+
     def login(self, url: str):
         """Login to Workday using credentials from environment variables."""
         self.driver.get(url)
-        
-        # Wait for login form and input credentials
-        username = self.wait.until(EC.presence_of_element_located((By.ID, "username")))
+
+        # A reused session may already be logged in and land straight on the form
+        self._wait_until(EC.any_of(
+            EC.presence_of_element_located((By.ID, "username")),
+            EC.presence_of_element_located((By.CLASS_NAME, "application-form"))
+        ), "login")
+        if not self.driver.find_elements(By.ID, "username"):
+            return
+
+        # Input credentials
+        username = self.driver.find_element(By.ID, "username")
         password = self.driver.find_element(By.ID, "password")
         
-        username.send_keys(os.getenv("WORKDAY_USERNAME"))
-        password.send_keys(os.getenv("WORKDAY_PASSWORD"))
+        username.send_keys(settings.get("WORKDAY_USERNAME"))
+        password.send_keys(settings.get("WORKDAY_PASSWORD"))
         
         # Click login button
         login_button = self.driver.find_element(By.ID, "submit")
@@ -42,7 +103,7 @@ class WorkdayAutomator:
         """Fill out the Workday application form with the provided data."""
         try:
             # Wait for the application form to load
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "application-form")))
+            self._wait_until(EC.presence_of_element_located((By.CLASS_NAME, "application-form")), "form")
 
             # Fill personal information
             self._fill_personal_info(application_data.get("personal_info", {}))
@@ -63,35 +124,56 @@ class WorkdayAutomator:
             print("Timeout waiting for form elements")
             raise
 
+    def _type_field(self, field: str, value: Any) -> bool:
+        """Fill one field with keystrokes; returns False if the field never appeared."""
+        try:
+            element = self._wait_until(EC.presence_of_element_located((By.NAME, field)), "field")
+            element.clear()
+            element.send_keys(_field_value(value))
+            return True
+        except TimeoutException:
+            print(f"Could not find field: {field}")
+            return False
+
+    def _fill_fields(self, fields: Dict[str, Any]):
+        """Fill a section's fields, batched into one script call with keystroke fallback."""
+        if not fields:
+            return
+        if not self.fast_fill:
+            for field, value in fields.items():
+                self._type_field(field, value)
+            return
+
+        values = {field: _field_value(value) for field, value in fields.items()}
+        result = self.driver.execute_script(FILL_FIELDS_SCRIPT, values)
+        # Fields that were not rendered yet or that reject programmatic input get typed instead
+        for field in result["missing"] + result["rejected"]:
+            self._type_field(field, fields[field])
+
+    def _add_entry(self, add_class: str, save_class: str, fields: Dict[str, Any]):
+        """Open a repeatable entry, fill it and wait for the save to be confirmed."""
+        add_button = self._wait_until(EC.element_to_be_clickable((By.CLASS_NAME, add_class)), "add_entry")
+        add_button.click()
+
+        if fields:
+            # The entry's fields render after the click; wait for the first one only
+            self._wait_until(EC.presence_of_element_located((By.NAME, next(iter(fields)))), "entry_fields")
+        self._fill_fields(fields)
+
+        save_button = self.driver.find_element(By.CLASS_NAME, save_class)
+        save_button.click()
+        # Saved once the entry editor closes, rather than after a fixed sleep
+        self._wait_until(EC.invisibility_of_element(save_button), "save_entry")
+
     def _fill_personal_info(self, personal_info: Dict[str, str]):
         """Fill personal information section."""
-        for field, value in personal_info.items():
-            try:
-                element = self.wait.until(EC.presence_of_element_located((By.NAME, field)))
-                element.clear()
-                element.send_keys(value)
-            except TimeoutException:
-                print(f"Could not find field: {field}")
+        self._fill_fields(personal_info)
 
     def _fill_work_experience(self, experiences: list):
         """Fill work experience section."""
         for exp in experiences:
             try:
-                # Click add experience button
-                add_button = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "add-experience")))
-                add_button.click()
-
-                # Fill experience fields
-                for field, value in exp.items():
-                    element = self.wait.until(EC.presence_of_element_located((By.NAME, field)))
-                    element.clear()
-                    element.send_keys(value)
-
-                # Save experience
-                save_button = self.driver.find_element(By.CLASS_NAME, "save-experience")
-                save_button.click()
-                time.sleep(1)  # Wait for save to complete
-
+                self._add_entry("add-experience", "save-experience", exp)
             except TimeoutException:
                 print(f"Could not add experience: {exp.get('company', 'Unknown')}")
 
@@ -99,51 +181,27 @@ class WorkdayAutomator:
         """Fill education section."""
         for edu in education:
             try:
-                # Click add education button
-                add_button = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "add-education")))
-                add_button.click()
-
-                # Fill education fields
-                for field, value in edu.items():
-                    element = self.wait.until(EC.presence_of_element_located((By.NAME, field)))
-                    element.clear()
-                    element.send_keys(value)
-
-                # Save education
-                save_button = self.driver.find_element(By.CLASS_NAME, "save-education")
-                save_button.click()
-                time.sleep(1)  # Wait for save to complete
-
+                self._add_entry("add-education", "save-education", edu)
             except TimeoutException:
                 print(f"Could not add education: {edu.get('institution', 'Unknown')}")
 
     def _fill_skills(self, skills: list):
         """Fill skills section."""
-        try:
-            skills_field = self.wait.until(EC.presence_of_element_located((By.NAME, "skills")))
-            skills_field.clear()
-            skills_field.send_keys(", ".join(skills))
-        except TimeoutException:
-            print("Could not find skills field")
+        if skills:
+            self._fill_fields({"skills": ", ".join(skills)})
 
     def _fill_additional_info(self, additional_info: Dict[str, str]):
         """Fill additional information section."""
-        for field, value in additional_info.items():
-            try:
-                element = self.wait.until(EC.presence_of_element_located((By.NAME, field)))
-                element.clear()
-                element.send_keys(value)
-            except TimeoutException:
-                print(f"Could not find field: {field}")
+        self._fill_fields(additional_info)
 
     def submit_application(self):
         """Submit the completed application."""
         try:
-            submit_button = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "submit-application")))
+            submit_button = self._wait_until(EC.element_to_be_clickable((By.CLASS_NAME, "submit-application")), "submit")
             submit_button.click()
             
             # Wait for confirmation
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "application-submitted")))
+            self._wait_until(EC.presence_of_element_located((By.CLASS_NAME, "application-submitted")), "confirmation")
             print("Application submitted successfully!")
         except TimeoutException:
             print("Could not submit application")